@@ -0,0 +1,256 @@
+"""
+📐 BATALLA DE HÉROES - ANALÍTICA EXACTA DE DAÑO
+Distribuciones exactas de daño y probabilidad de muerte sin simular batallas
+
+Las reglas de AccionAtacar, HeroStats.recibir_dano y AccionHabilidadEspecial
+son distribuciones discretas pequeñas:
+    ataque:    (ataque + randint(-5, 15)) × 1.5 si crítico, 0 si esquiva,
+               reducido por defensa (2% por punto, máximo 70%)
+    habilidad: int(ataque × 2.5) + randint(20, 40), 0 si esquiva, sin defensa
+Este módulo las enumera y combina. Los resultados se memorizan por tupla de
+estadísticas (lru_cache y una tabla de supervivencia por PV), así que
+consultar muchos emparejamientos con las mismas estadísticas es
+prácticamente gratis.
+
+Uso:
+    python -m game_analitica Thor Shadow
+    python -m game_analitica Shadow Thor --golpes 4 --habilidad --verificar
+"""
+
+import argparse
+import math
+import random
+from collections import OrderedDict
+from dataclasses import replace
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from game_core import AccionAtacar, AccionHabilidadEspecial, HeroFactory, HeroStats, NodoHeroe
+
+
+Distribucion = Tuple[Tuple[int, float], ...]  # ((daño, probabilidad), ...) ordenada por daño
+
+
+# ============================================================================
+# DISTRIBUCIONES (memorizadas por tupla de estadísticas)
+# ============================================================================
+
+@lru_cache(maxsize=4096)
+def _distribucion_ataque(ataque: int, critico: float, defensa: int, esquiva: float) -> Distribucion:
+    """Daño que resta un ataque normal, antes de limitarlo a los PV del objetivo"""
+    masa: Dict[int, float] = {0: esquiva}
+    reduccion = min(0.7, defensa * 0.02)  # mismas operaciones que recibir_dano
+    p_base = (1 - esquiva) / 21
+    for aleatorio in range(-5, 16):
+        dano_total = ataque + aleatorio
+        for total, p in ((int(dano_total * 1.5), critico), (dano_total, 1 - critico)):
+            dano = int(total * (1 - reduccion))
+            masa[dano] = masa.get(dano, 0.0) + p_base * p
+    return tuple(sorted((dano, p) for dano, p in masa.items() if p > 0))
+
+
+@lru_cache(maxsize=4096)
+def _distribucion_habilidad(ataque: int, esquiva: float) -> Distribucion:
+    """Daño de la habilidad especial (ignora la defensa, no hace críticos)"""
+    masa: Dict[int, float] = {0: esquiva}
+    p_base = (1 - esquiva) / 21
+    for aleatorio in range(20, 41):
+        dano = int(ataque * 2.5) + aleatorio
+        masa[dano] = masa.get(dano, 0.0) + p_base
+    return tuple(sorted((dano, p) for dano, p in masa.items() if p > 0))
+
+
+def distribucion_dano(atacante: HeroStats, defensor: HeroStats,
+                      habilidad: bool = False) -> Distribucion:
+    """Distribución exacta del daño de un golpe (sin limitar a los PV del defensor)"""
+    if habilidad:
+        return _distribucion_habilidad(atacante.ataque, defensor.esquiva)
+    return _distribucion_ataque(atacante.ataque, atacante.critico,
+                                defensor.defensa, defensor.esquiva)
+
+
+def dano_esperado(atacante: HeroStats, defensor: HeroStats, habilidad: bool = False,
+                  limitar_pv: bool = True) -> float:
+    """Daño esperado de un golpe (limitado a los PV actuales, como reporta el motor)"""
+    distribucion = distribucion_dano(atacante, defensor, habilidad)
+    if limitar_pv:
+        return sum(min(dano, defensor.pv) * p for dano, p in distribucion)
+    return sum(dano * p for dano, p in distribucion)
+
+
+# Tablas de supervivencia por (distribución, PV): una tupla inmutable de
+# estados, uno por número de golpes, ampliada de abajo arriba. Deja de crecer
+# cuando el estado ya no cambia (muerte segura o daño nulo) y las menos usadas
+# se descartan pasado MAX_TABLAS
+MAX_TABLAS = 4096
+_MUERTE_SEGURA = 1 - 1e-12
+_TABLAS: 'OrderedDict[Tuple[Distribucion, int], Tuple[Tuple[float, ...], ...]]' = OrderedDict()
+
+
+def _siguiente_estado(distribucion: Distribucion, anterior: Tuple[float, ...]) -> Tuple[float, ...]:
+    """Estado tras un golpe más"""
+    estado = [0.0] * len(anterior)
+    estado[0] = anterior[0]  # muerto sigue muerto
+    for restante in range(1, len(anterior)):
+        p_restante = anterior[restante]
+        if not p_restante:
+            continue
+        for dano, p in distribucion:
+            estado[max(0, restante - dano)] += p_restante * p
+    return tuple(estado)
+
+
+def _estable(filas: List[Tuple[float, ...]]) -> bool:
+    return filas[-1][0] >= _MUERTE_SEGURA or (len(filas) > 1 and filas[-1] == filas[-2])
+
+
+def _supervivencia(distribucion: Distribucion, pv: int, golpes: int) -> Tuple[float, ...]:
+    """Probabilidad de tener exactamente k PV (k = 0..pv) tras `golpes` golpes"""
+    clave = (distribucion, pv)
+    tabla = _TABLAS.pop(clave, None)
+    if tabla is None:
+        estado = [0.0] * (pv + 1)
+        estado[pv] = 1.0
+        tabla = (tuple(estado),)
+
+    if len(tabla) <= golpes:
+        filas = list(tabla)
+        while len(filas) <= golpes and not _estable(filas):
+            filas.append(_siguiente_estado(distribucion, filas[-1]))
+        tabla = tuple(filas)
+
+    _TABLAS[clave] = tabla  # la más reciente al final
+    if len(_TABLAS) > MAX_TABLAS:
+        _TABLAS.popitem(last=False)
+    return tabla[min(golpes, len(tabla) - 1)]
+
+
+def probabilidad_muerte(atacante: HeroStats, defensor: HeroStats, golpes: int,
+                        habilidad: bool = False) -> float:
+    """Probabilidad de que el defensor muera en a lo sumo `golpes` golpes seguidos"""
+    if defensor.pv <= 0:
+        return 1.0
+    distribucion = distribucion_dano(atacante, defensor, habilidad)
+    return _supervivencia(distribucion, defensor.pv, golpes)[0]
+
+
+def golpes_esperados(atacante: HeroStats, defensor: HeroStats, habilidad: bool = False,
+                     max_golpes: int = 200) -> float:
+    """Número esperado de golpes para matar (truncado en max_golpes)"""
+    esperado = 0.0
+    for golpes in range(max_golpes):
+        esperado += 1 - probabilidad_muerte(atacante, defensor, golpes, habilidad)
+    return esperado
+
+
+def info_cache() -> dict:
+    """Aciertos y fallos de las cachés de distribuciones"""
+    return {
+        "ataque": _distribucion_ataque.cache_info(),
+        "habilidad": _distribucion_habilidad.cache_info(),
+        "supervivencia": {"tablas": len(_TABLAS),
+                          "filas": sum(len(tabla) for tabla in _TABLAS.values())},
+    }
+
+
+# ============================================================================
+# VERIFICACIÓN CONTRA SIMULACIÓN
+# ============================================================================
+
+def verificar_con_simulacion(atacante: HeroStats, defensor: HeroStats, golpes: int = 3,
+                             habilidad: bool = False, muestras: int = 100000,
+                             semilla: int = 0, umbral_z: float = 4.0) -> dict:
+    """Compara los valores exactos con golpes reales de las clases Accion*.
+
+    Aplica una prueba z al daño medio (con PV ilimitados) y a la
+    probabilidad de muerte en `golpes` golpes. Retorna un informe con la
+    clave "equivalente".
+    """
+    rng = random.Random(semilla)
+    accion = AccionHabilidadEspecial(rng=rng) if habilidad else AccionAtacar(rng)
+    costo = accion.costo_energia if habilidad else 0
+
+    # Daño medio por golpe contra un defensor que no puede morir
+    golpeador = NodoHeroe(replace(atacante))
+    blanco = NodoHeroe(replace(defensor, pv=10 ** 9, pv_max=10 ** 9))
+    suma = suma_cuadrados = 0
+    for _ in range(muestras):
+        golpeador.stats.energia = costo
+        dano = accion.ejecutar(golpeador, blanco).dano
+        suma += dano
+        suma_cuadrados += dano * dano
+    media = suma / muestras
+    varianza = suma_cuadrados / muestras - media * media
+    exacta = dano_esperado(atacante, defensor, habilidad, limitar_pv=False)
+    z_media = (media - exacta) / (math.sqrt(varianza / muestras) or 1e-12)
+
+    # Probabilidad de muerte en `golpes` golpes
+    muertes = 0
+    for _ in range(muestras):
+        blanco = NodoHeroe(replace(defensor))
+        for _ in range(golpes):
+            golpeador.stats.energia = costo
+            if accion.ejecutar(golpeador, blanco).get("objetivo_murio"):
+                muertes += 1
+                break
+    p_simulada = muertes / muestras
+    p_exacta = probabilidad_muerte(atacante, defensor, golpes, habilidad)
+    error = math.sqrt(max(p_exacta * (1 - p_exacta), 1e-12) / muestras)
+    z_muerte = (p_simulada - p_exacta) / error
+
+    return {
+        "dano": (exacta, media, z_media),
+        "muerte": (p_exacta, p_simulada, z_muerte),
+        "equivalente": abs(z_media) < umbral_z and abs(z_muerte) < umbral_z,
+    }
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def _heroe(nombre: str) -> HeroStats:
+    stats = HeroFactory.crear_heroe(nombre)
+    if stats is None:
+        raise SystemExit(f"Héroe predefinido desconocido: {nombre}")
+    return stats
+
+
+def main(argv: Optional[List[str]] = None):
+    """Muestra la analítica exacta de un emparejamiento atacante → defensor"""
+    parser = argparse.ArgumentParser(description="Analítica exacta de daño")
+    parser.add_argument("atacante", help="héroe predefinido que ataca")
+    parser.add_argument("defensor", help="héroe predefinido que defiende")
+    parser.add_argument("--golpes", type=int, default=3, help="golpes para la probabilidad de muerte")
+    parser.add_argument("--habilidad", action="store_true", help="usar la habilidad especial")
+    parser.add_argument("--verificar", action="store_true", help="contrastar con simulación")
+    parser.add_argument("--muestras", type=int, default=100000, help="muestras de la verificación")
+    args = parser.parse_args(argv)
+
+    atacante, defensor = _heroe(args.atacante), _heroe(args.defensor)
+    golpe = "habilidad" if args.habilidad else "ataque"
+    distribucion = distribucion_dano(atacante, defensor, args.habilidad)
+
+    print(f"📐 {atacante.nombre} → {defensor.nombre} ({golpe}, {defensor.pv} PV)")
+    print(f"  • Daño: {distribucion[0][0]}-{distribucion[-1][0]} | esperado "
+          f"{dano_esperado(atacante, defensor, args.habilidad):.2f} | "
+          f"P(esquiva) {dict(distribucion).get(0, 0.0):.1%}")
+    for golpes in range(1, args.golpes + 1):
+        print(f"  • P(muerte en {golpes} golpe{'s' if golpes > 1 else ''}): "
+              f"{probabilidad_muerte(atacante, defensor, golpes, args.habilidad):.4%}")
+    print(f"  • Golpes esperados para matar: "
+          f"{golpes_esperados(atacante, defensor, args.habilidad):.2f}")
+
+    if args.verificar:
+        informe = verificar_con_simulacion(atacante, defensor, args.golpes, args.habilidad,
+                                           args.muestras)
+        exacta, simulada, z = informe["dano"]
+        print(f"🔬 Daño medio: exacto {exacta:.3f} | simulado {simulada:.3f} | z={z:+.2f}")
+        exacta, simulada, z = informe["muerte"]
+        print(f"🔬 P(muerte en {args.golpes}): exacta {exacta:.4f} | simulada {simulada:.4f} | "
+              f"z={z:+.2f}")
+        print("✅ Equivalentes" if informe["equivalente"] else "❌ Diferencia significativa")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+🗺️ BATALLA DE HÉROES - ARENA MASIVA
+Todos contra todos en una cuadrícula con objetivos limitados a los vecinos
+
+Los héroes ocupan posiciones en una cuadrícula de ancho × alto y solo atacan
+a enemigos a distancia menor o igual que `radio`. Los vecinos se buscan en un
+hash espacial de celdas de lado `radio`, así que cada consulta revisa 3×3
+celdas y cuesta O(densidad), no O(héroes). Los muertos se retiran del hash
+de forma perezosa la próxima vez que aparecen en una consulta.
+
+Si un héroe no tiene a nadie cerca, usa el objetivo aleatorio global del
+motor (O(1)) y se desplaza a la celda de ese objetivo, de modo que los
+supervivientes se van reagrupando a medida que la arena se vacía.
+
+Uso:
+    python -m game_arena --heroes 10000
+    python -m game_arena --heroes 2000 --ancho 100 --alto 100 --radio 2 --comparar
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from game_core import (AccionCombate, HeroFactory, HeroStats, ListaHeroes, MotorCombate,
+                       NodoHeroe, PoliticaCombate, PoliticaUmbrales)
+
+
+Posicion = Tuple[int, int]
+
+
+# ============================================================================
+# HASH ESPACIAL
+# ============================================================================
+
+class HashEspacial:
+    """Cuadrícula dispersa de celdas de lado `celda` → héroes que contiene"""
+
+    def __init__(self, celda: int):
+        self.celda = max(1, celda)
+        self._celdas: Dict[Posicion, List[NodoHeroe]] = {}
+        self.posiciones: Dict[NodoHeroe, Posicion] = {}
+
+    def __len__(self) -> int:
+        return len(self.posiciones)
+
+    def _clave(self, x: int, y: int) -> Posicion:
+        return x // self.celda, y // self.celda
+
+    def insertar(self, heroe: NodoHeroe, x: int, y: int):
+        """Coloca (o mueve) un héroe en la posición dada"""
+        if heroe in self.posiciones:
+            self.quitar(heroe)
+        self.posiciones[heroe] = (x, y)
+        self._celdas.setdefault(self._clave(x, y), []).append(heroe)
+
+    def quitar(self, heroe: NodoHeroe):
+        """Retira un héroe en O(ocupantes de su celda)"""
+        x, y = self.posiciones.pop(heroe)
+        clave = self._clave(x, y)
+        ocupantes = self._celdas[clave]
+        ocupantes.remove(heroe)
+        if not ocupantes:
+            del self._celdas[clave]
+
+    def vecinos(self, x: int, y: int, radio: int) -> Iterator[NodoHeroe]:
+        """Héroes vivos a distancia euclídea <= radio de (x, y).
+
+        Los muertos encontrados en el camino se retiran del hash.
+        """
+        cx, cy = self._clave(x, y)
+        alcance = -(-radio // self.celda)  # celdas a cada lado (1 si celda == radio)
+        radio2 = radio * radio
+        for i in range(cx - alcance, cx + alcance + 1):
+            for j in range(cy - alcance, cy + alcance + 1):
+                ocupantes = self._celdas.get((i, j))
+                if not ocupantes:
+                    continue
+                muertos = []
+                for heroe in ocupantes:
+                    if not heroe.stats.esta_vivo():
+                        muertos.append(heroe)
+                        continue
+                    hx, hy = self.posiciones[heroe]
+                    if (hx - x) ** 2 + (hy - y) ** 2 <= radio2:
+                        yield heroe
+                for heroe in muertos:
+                    self.quitar(heroe)
+
+
+# ============================================================================
+# ARENA Y POLÍTICA
+# ============================================================================
+
+class Arena:
+    """Posiciones de los héroes de un motor en una cuadrícula ancho × alto"""
+
+    def __init__(self, motor: MotorCombate, ancho: int, alto: int, radio: int = 3,
+                 rng: Optional[random.Random] = None):
+        self.motor = motor
+        self.ancho = ancho
+        self.alto = alto
+        self.radio = radio
+        self.hash = HashEspacial(radio)
+        self.desplazamientos = 0  # veces que se recurrió al objetivo global
+
+        rng = rng or motor.rng
+        for heroe in motor.heroes_vivos():
+            self.hash.insertar(heroe, rng.randrange(ancho), rng.randrange(alto))
+
+    def posicion(self, heroe: NodoHeroe) -> Optional[Posicion]:
+        return self.hash.posiciones.get(heroe)
+
+    def vecinos(self, heroe: NodoHeroe) -> List[NodoHeroe]:
+        """Enemigos vivos al alcance del héroe"""
+        x, y = self.hash.posiciones[heroe]
+        return [otro for otro in self.hash.vecinos(x, y, self.radio) if otro is not heroe]
+
+    def objetivo(self, heroe: NodoHeroe) -> Optional[NodoHeroe]:
+        """Un vecino al azar o, si no hay, el objetivo global (y el héroe se acerca)"""
+        if heroe in self.hash.posiciones:
+            cercanos = self.vecinos(heroe)
+            if cercanos:
+                return cercanos[self.motor.rng.randrange(len(cercanos))]
+
+        objetivo = self.motor.objetivo_aleatorio(heroe)
+        destino = self.hash.posiciones.get(objetivo) if objetivo else None
+        if destino is not None:
+            self.hash.insertar(heroe, *destino)
+            self.desplazamientos += 1
+        return objetivo
+
+
+class PoliticaArena(PoliticaCombate):
+    """Decide la acción con la política base y el objetivo entre los vecinos"""
+
+    def __init__(self, arena: Arena, base: Optional[PoliticaCombate] = None):
+        self.arena = arena
+        self.base = base or PoliticaUmbrales()
+
+    def seleccionar_accion(self, motor: MotorCombate, heroe: NodoHeroe) -> AccionCombate:
+        return self.base.seleccionar_accion(motor, heroe)
+
+    def seleccionar_objetivo(self, motor: MotorCombate,
+                             heroe: NodoHeroe) -> Optional[NodoHeroe]:
+        return self.arena.objetivo(heroe)
+
+
+def crear_arena(cantidad: int, ancho: int, alto: int, radio: int = 3,
+                num_rondas: Optional[int] = None,
+                rng: Optional[random.Random] = None) -> Tuple[MotorCombate, Arena]:
+    """Motor con `cantidad` copias numeradas de los héroes predefinidos y su arena"""
+    rng = rng or random.Random()
+    predefinidos = list(HeroFactory.HEROES_PREDEF)
+    lista = ListaHeroes()
+    for i in range(cantidad):
+        stats: HeroStats = HeroFactory.crear_heroe(predefinidos[i % len(predefinidos)])
+        stats.nombre = f"{stats.nombre} #{i + 1}"
+        lista.agregar_stats(stats)
+
+    motor = MotorCombate(lista, num_rondas, rng)
+    arena = Arena(motor, ancho, alto, radio)
+    motor.asignar_politica(PoliticaArena(arena))
+    return motor, arena
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def _jugar(motor: MotorCombate, max_turnos: int) -> Tuple[int, float]:
+    """Juega hasta el final o max_turnos. Retorna (turnos, segundos)"""
+    inicio = time.perf_counter()
+    motor.simular_hasta_fin(max_turnos=max_turnos)
+    return motor.turnos_jugados, time.perf_counter() - inicio
+
+
+def main(argv: Optional[List[str]] = None):
+    """Juega una arena masiva y muestra el rendimiento por turno"""
+    parser = argparse.ArgumentParser(description="Arena masiva de Batalla de Héroes")
+    parser.add_argument("--heroes", type=int, default=10000, help="cantidad de héroes")
+    parser.add_argument("--ancho", type=int, help="ancho de la cuadrícula (por defecto ~2 celdas por héroe)")
+    parser.add_argument("--alto", type=int, help="alto de la cuadrícula")
+    parser.add_argument("--radio", type=int, default=3, help="alcance de los ataques")
+    parser.add_argument("--turnos", type=int, default=200000, help="límite de turnos")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de la arena")
+    parser.add_argument("--comparar", action="store_true",
+                        help="escalado frente a 1/4 y 1/16 de los héroes")
+    args = parser.parse_args(argv)
+
+    def ejecutar(cantidad: int):
+        lado = int((cantidad * 2) ** 0.5) + 1
+        ancho = args.ancho or lado
+        alto = args.alto or lado
+        motor, arena = crear_arena(cantidad, ancho, alto, args.radio, rng=random.Random(args.semilla))
+        turnos, segundos = _jugar(motor, args.turnos)
+        ganador = motor.obtener_ganador()
+        print(f"🗺️ {cantidad:,} héroes en {ancho}×{alto} (radio {args.radio}): "
+              f"{turnos:,} turnos en {segundos:.2f} s | {turnos / segundos:,.0f} turnos/s | "
+              f"{motor.num_vivos:,} vivos | {arena.desplazamientos:,} desplazamientos")
+        if motor.num_vivos <= 1 and ganador:
+            print(f"🏆 Ganador: {ganador.nombre}")
+
+    tamanos = [args.heroes // 16, args.heroes // 4, args.heroes] if args.comparar else [args.heroes]
+    for cantidad in tamanos:
+        if cantidad >= 2:
+            ejecutar(cantidad)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+"""
+⚖️ BATALLA DE HÉROES - AUTO-BALANCEO DE ESTADÍSTICAS
+Busca valores de ataque, defensa, crítico y esquiva que acerquen la tasa de
+victorias de cada héroe al objetivo (por defecto 1/H)
+
+Cada candidato es un vector de parámetros que se evalúa con batallas
+headless en paralelo, siempre con la misma semilla (números aleatorios
+comunes) para que las diferencias entre candidatos no sean ruido. Las
+evaluaciones se guardan por vector en un punto de control JSON, así que una
+búsqueda interrumpida continúa donde quedó al relanzar el mismo comando.
+
+Métodos:
+    rejilla    producto cartesiano de --puntos valores por parámetro
+    aleatoria  --evaluaciones candidatos uniformes
+    es         estrategia evolutiva con covarianza diagonal (estilo CMA-ES)
+
+Uso:
+    python -m game_balance --metodo es --generaciones 20 --batallas 2000
+    python -m game_balance --metodo aleatoria --evaluaciones 200 --parametros ataque,defensa
+    python -m game_balance --metodo rejilla --puntos 3 --heroes Thor,Shadow --salida roster.json
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+from typing import Dict, List, Optional, Tuple
+
+from game_core import HeroFactory, HeroStats
+from game_sim import crear_lista, ejecutar_lote
+
+
+# Límites de cada parámetro: (mínimo, máximo, entero)
+LIMITES = {
+    "ataque": (5, 50, True),
+    "defensa": (0, 35, True),
+    "critico": (0.0, 0.5, False),
+    "esquiva": (0.0, 0.5, False),
+}
+
+METODOS = ("rejilla", "aleatoria", "es")
+
+# Candidatos por lote en rejilla y aleatoria. Fijo (no depende de los
+# trabajadores): la semilla de cada lote sale de su posición, así que la misma
+# --semilla da la misma búsqueda en cualquier máquina
+TAMANO_LOTE = 16
+
+
+# ============================================================================
+# ESPACIO DE PARÁMETROS
+# ============================================================================
+
+class EspacioBalance:
+    """Traduce entre vectores normalizados en [0, 1] y rosters concretos"""
+
+    def __init__(self, roster: List[HeroStats], heroes: List[str], parametros: List[str]):
+        self.roster = roster
+        self.dimensiones: List[Tuple[int, str]] = [
+            (i, parametro) for i, stats in enumerate(roster) if stats.nombre in heroes
+            for parametro in parametros]
+
+    def __len__(self) -> int:
+        return len(self.dimensiones)
+
+    def valores(self, vector: List[float]) -> Tuple:
+        """Valores concretos (redondeados) de un vector normalizado"""
+        valores = []
+        for u, (_, parametro) in zip(vector, self.dimensiones):
+            minimo, maximo, entero = LIMITES[parametro]
+            valor = minimo + min(1.0, max(0.0, u)) * (maximo - minimo)
+            valores.append(int(round(valor)) if entero else round(valor, 3))
+        return tuple(valores)
+
+    def normalizar(self, valores: Tuple) -> List[float]:
+        vector = []
+        for valor, (_, parametro) in zip(valores, self.dimensiones):
+            minimo, maximo, _ = LIMITES[parametro]
+            vector.append((valor - minimo) / (maximo - minimo))
+        return vector
+
+    def aplicar(self, valores: Tuple) -> List[HeroStats]:
+        """Roster con los valores aplicados (copias)"""
+        roster = [replace(stats) for stats in self.roster]
+        for valor, (i, parametro) in zip(valores, self.dimensiones):
+            setattr(roster[i], parametro, valor)
+        return roster
+
+    def iniciales(self) -> Tuple:
+        """Valores actuales del roster"""
+        return tuple(getattr(self.roster[i], parametro) for i, parametro in self.dimensiones)
+
+
+def _evaluar(roster: List[HeroStats], num_batallas: int, semilla: int,
+             num_rondas: Optional[int]) -> Dict[str, float]:
+    """Tasa de victorias de cada héroe en num_batallas batallas (proceso hijo)"""
+    resultado = ejecutar_lote(num_batallas, lambda: crear_lista(roster),
+                              rng=random.Random(semilla), num_rondas=num_rondas)
+    return {stats.nombre: resultado.victorias[stats.nombre] / num_batallas for stats in roster}
+
+
+def perdida(tasas: Dict[str, float], objetivo: float) -> float:
+    """Error cuadrático de las tasas de victoria respecto al objetivo"""
+    return sum((tasa - objetivo) ** 2 for tasa in tasas.values())
+
+
+# ============================================================================
+# OPTIMIZADOR
+# ============================================================================
+
+class Balanceador:
+    """Búsqueda de parámetros con evaluación paralela y punto de control"""
+
+    def __init__(self, espacio: EspacioBalance, num_batallas: int = 2000, semilla: int = 0,
+                 num_rondas: Optional[int] = None, objetivo: Optional[float] = None,
+                 trabajadores: Optional[int] = None, checkpoint: Optional[str] = None):
+        self.espacio = espacio
+        self.num_batallas = num_batallas
+        self.semilla = semilla
+        self.num_rondas = num_rondas
+        self.objetivo = objetivo if objetivo is not None else 1 / len(espacio.roster)
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.checkpoint = checkpoint
+
+        self.cache: Dict[str, dict] = {}  # valores (JSON) -> {"perdida", "tasas"}
+        self.estado: dict = {}            # progreso del método en curso
+        self.evaluadas = 0                # evaluaciones nuevas en esta ejecución
+        self._cargar()
+
+    # --- Punto de control ---
+
+    def _configuracion(self) -> dict:
+        return {
+            "roster": [asdict(stats) for stats in self.espacio.roster],
+            "dimensiones": self.espacio.dimensiones,
+            "batallas": self.num_batallas,
+            "semilla": self.semilla,
+            "rondas": self.num_rondas,
+        }
+
+    def _cargar(self):
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        # Solo se reutilizan evaluaciones hechas con la misma configuración
+        if datos["configuracion"] != json.loads(json.dumps(self._configuracion())):
+            print(f"⚠️ {self.checkpoint} corresponde a otra configuración; se ignora")
+            return
+        self.cache = datos["cache"]
+        self.estado = datos["estado"]
+
+    def guardar(self):
+        if not self.checkpoint:
+            return
+        temporal = self.checkpoint + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump({"configuracion": self._configuracion(), "cache": self.cache,
+                       "estado": self.estado}, archivo)
+        os.replace(temporal, self.checkpoint)
+
+    # --- Evaluación ---
+
+    def evaluar(self, candidatos: List[Tuple]) -> List[float]:
+        """Pérdida de cada candidato (valores concretos), en paralelo y con caché"""
+        claves = [json.dumps(valores) for valores in candidatos]
+        nuevos = {clave: valores for clave, valores in zip(claves, candidatos)
+                  if clave not in self.cache}
+        if nuevos:
+            rosters = [self.espacio.aplicar(valores) for valores in nuevos.values()]
+            cantidad = len(rosters)
+            if self.trabajadores > 1 and cantidad > 1:
+                with ProcessPoolExecutor(max_workers=min(self.trabajadores, cantidad)) as pool:
+                    tasas = list(pool.map(_evaluar, rosters, [self.num_batallas] * cantidad,
+                                          [self.semilla] * cantidad, [self.num_rondas] * cantidad))
+            else:
+                tasas = [_evaluar(roster, self.num_batallas, self.semilla, self.num_rondas)
+                         for roster in rosters]
+            for clave, tasas_candidato in zip(nuevos, tasas):
+                self.cache[clave] = {"perdida": perdida(tasas_candidato, self.objetivo),
+                                     "tasas": tasas_candidato}
+            self.evaluadas += cantidad
+        return [self.cache[clave]["perdida"] for clave in claves]
+
+    def mejor(self) -> Tuple[Tuple, dict]:
+        """Mejor candidato evaluado hasta ahora: (valores, evaluación)"""
+        clave = min(self.cache, key=lambda c: self.cache[c]["perdida"])
+        return tuple(json.loads(clave)), self.cache[clave]
+
+    # --- Métodos de búsqueda ---
+
+    def rejilla(self, puntos: int = 3):
+        """Recorre la rejilla completa por lotes, retomando desde el punto de control"""
+        ejes = [[k / (puntos - 1) if puntos > 1 else 0.5 for k in range(puntos)]] * len(self.espacio)
+        total = puntos ** len(self.espacio)
+        if self.estado.get("metodo") != "rejilla":
+            self.estado = {"metodo": "rejilla", "indice": 0}
+        self.evaluar([self.espacio.iniciales()])
+
+        producto = itertools.islice(itertools.product(*ejes), self.estado["indice"], None)
+        while self.estado["indice"] < total:
+            lote = list(itertools.islice(producto, TAMANO_LOTE))
+            self.evaluar([self.espacio.valores(vector) for vector in lote])
+            self.estado["indice"] += len(lote)
+            self.guardar()
+            self._progreso(f"{self.estado['indice']}/{total}")
+
+    def aleatoria(self, evaluaciones: int = 100):
+        """Candidatos uniformes en el espacio normalizado"""
+        if self.estado.get("metodo") != "aleatoria":
+            self.estado = {"metodo": "aleatoria", "hechas": 0}
+        self.evaluar([self.espacio.iniciales()])
+
+        while self.estado["hechas"] < evaluaciones:
+            cantidad = min(TAMANO_LOTE, evaluaciones - self.estado["hechas"])
+            # Generador propio por lote para que retomar reproduzca la secuencia
+            rng = random.Random(f"{self.semilla}:aleatoria:{self.estado['hechas']}")
+            lote = [[rng.random() for _ in range(len(self.espacio))] for _ in range(cantidad)]
+            self.evaluar([self.espacio.valores(vector) for vector in lote])
+            self.estado["hechas"] += cantidad
+            self.guardar()
+            self._progreso(f"{self.estado['hechas']}/{evaluaciones}")
+
+    def es(self, generaciones: int = 20, poblacion: Optional[int] = None, sigma: float = 0.3):
+        """Estrategia evolutiva (μ/μ_w, λ) con adaptación diagonal de la covarianza.
+
+        Versión simplificada de sep-CMA-ES: adapta el paso global con un
+        camino de evolución acumulado y la varianza de cada coordenada con
+        la actualización de rango μ. λ no depende de los trabajadores (solo
+        dimensionan el pool) y se guarda en el punto de control: retomar con
+        otra --poblacion es un error.
+        """
+        n = len(self.espacio)
+        if self.estado.get("metodo") == "es" and "poblacion" in self.estado:
+            if poblacion and poblacion != self.estado["poblacion"]:
+                raise ValueError(f"el punto de control usa una población de {self.estado['poblacion']}, "
+                                 f"no {poblacion}")
+            lam = self.estado["poblacion"]
+        else:
+            lam = poblacion or 4 + int(3 * math.log(n))
+        mu = lam // 2
+        pesos = [math.log(mu + 0.5) - math.log(i + 1) for i in range(mu)]
+        suma = sum(pesos)
+        pesos = [w / suma for w in pesos]
+        mu_eff = 1 / sum(w * w for w in pesos)
+        c_sigma = (mu_eff + 2) / (n + mu_eff + 5)
+        d_sigma = 1 + 2 * max(0.0, math.sqrt((mu_eff - 1) / (n + 1)) - 1) + c_sigma
+        c_mu = min(1.0, mu_eff / (n * n + mu_eff)) * (n + 2) / 3  # aprendizaje diagonal
+        c_mu = min(c_mu, 0.5)
+        esperanza_norma = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+        if self.estado.get("metodo") != "es" or "poblacion" not in self.estado:
+            self.estado = {"metodo": "es", "generacion": 0, "poblacion": lam,
+                           "media": self.espacio.normalizar(self.espacio.iniciales()),
+                           "sigma": sigma, "varianzas": [1.0] * n, "camino": [0.0] * n}
+        self.evaluar([self.espacio.iniciales()])
+
+        estado = self.estado
+        while estado["generacion"] < generaciones:
+            rng = random.Random(f"{self.semilla}:es:{estado['generacion']}")
+            media, s, varianzas = estado["media"], estado["sigma"], estado["varianzas"]
+
+            muestras = []
+            for _ in range(lam):
+                z = [rng.gauss(0, 1) for _ in range(n)]
+                y = [zi * math.sqrt(ci) for zi, ci in zip(z, varianzas)]
+                x = [min(1.0, max(0.0, mi + s * yi)) for mi, yi in zip(media, y)]
+                muestras.append((x, y, z))
+            perdidas = self.evaluar([self.espacio.valores(x) for x, _, _ in muestras])
+            orden = sorted(range(lam), key=perdidas.__getitem__)[:mu]
+
+            # Nueva media y caminos con las μ mejores muestras
+            y_w = [sum(pesos[k] * muestras[i][1][d] for k, i in enumerate(orden)) for d in range(n)]
+            z_w = [sum(pesos[k] * muestras[i][2][d] for k, i in enumerate(orden)) for d in range(n)]
+            estado["media"] = [min(1.0, max(0.0, mi + s * yi)) for mi, yi in zip(media, y_w)]
+            factor = math.sqrt(c_sigma * (2 - c_sigma) * mu_eff)
+            estado["camino"] = [(1 - c_sigma) * p + factor * zi
+                                for p, zi in zip(estado["camino"], z_w)]
+            norma = math.sqrt(sum(p * p for p in estado["camino"]))
+            estado["sigma"] = s * math.exp((c_sigma / d_sigma) * (norma / esperanza_norma - 1))
+            estado["varianzas"] = [
+                (1 - c_mu) * ci + c_mu * sum(pesos[k] * muestras[i][1][d] ** 2
+                                             for k, i in enumerate(orden))
+                for d, ci in enumerate(varianzas)]
+            estado["generacion"] += 1
+            self.guardar()
+            self._progreso(f"generación {estado['generacion']}/{generaciones} "
+                           f"(σ={estado['sigma']:.3f})")
+
+    def _progreso(self, texto: str):
+        _, evaluacion = self.mejor()
+        print(f"  • {texto} | mejor pérdida {evaluacion['perdida']:.5f} | "
+              f"{len(self.cache)} candidatos evaluados")
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    """Función principal del balanceador"""
+    parser = argparse.ArgumentParser(description="Auto-balanceo de estadísticas de héroes")
+    parser.add_argument("--metodo", default="es", help=f"método de búsqueda ({', '.join(METODOS)})")
+    parser.add_argument("--parametros", default="ataque,defensa,critico,esquiva",
+                        help="parámetros a ajustar, separados por comas")
+    parser.add_argument("--heroes", help="héroes a ajustar (por defecto todos)")
+    parser.add_argument("--batallas", type=int, default=2000, help="batallas por candidato")
+    parser.add_argument("--objetivo", type=float, help="tasa de victorias objetivo (por defecto 1/H)")
+    parser.add_argument("--puntos", type=int, default=3, help="valores por parámetro (rejilla)")
+    parser.add_argument("--evaluaciones", type=int, default=100, help="candidatos (aleatoria)")
+    parser.add_argument("--generaciones", type=int, default=20, help="generaciones (es)")
+    parser.add_argument("--poblacion", type=int, help="candidatos por generación (es)")
+    parser.add_argument("--rondas", type=int, help="límite de rondas por batalla")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de batallas y búsqueda")
+    parser.add_argument("--trabajadores", type=int, default=0, help="procesos (0 = todos los núcleos)")
+    parser.add_argument("--checkpoint", default="balance_checkpoint.json",
+                        help="punto de control para retomar la búsqueda")
+    parser.add_argument("--salida", help="guarda el mejor roster en JSON (formato de --roster)")
+    args = parser.parse_args(argv)
+
+    if args.metodo not in METODOS:
+        parser.error(f"método desconocido: {args.metodo} (opciones: {', '.join(METODOS)})")
+    parametros = args.parametros.split(",")
+    desconocidos = [parametro for parametro in parametros if parametro not in LIMITES]
+    if desconocidos:
+        parser.error(f"parámetros desconocidos: {', '.join(desconocidos)}")
+
+    roster = [HeroFactory.crear_heroe(nombre) for nombre in HeroFactory.HEROES_PREDEF]
+    heroes = args.heroes.split(",") if args.heroes else [stats.nombre for stats in roster]
+    espacio = EspacioBalance(roster, heroes, parametros)
+    if not len(espacio):
+        parser.error("no hay parámetros que ajustar")
+
+    balanceador = Balanceador(espacio, args.batallas, args.semilla, args.rondas, args.objetivo,
+                              args.trabajadores or None, args.checkpoint)
+    print(f"⚖️ {args.metodo}: {len(espacio)} parámetros | objetivo {balanceador.objetivo:.1%} "
+          f"| {args.batallas} batallas por candidato")
+    if args.metodo == "rejilla":
+        balanceador.rejilla(args.puntos)
+    elif args.metodo == "aleatoria":
+        balanceador.aleatoria(args.evaluaciones)
+    else:
+        try:
+            balanceador.es(args.generaciones, args.poblacion)
+        except ValueError as error:
+            parser.error(f"{args.checkpoint}: {error}")
+
+    valores, evaluacion = balanceador.mejor()
+    inicial = balanceador.cache[json.dumps(espacio.iniciales())]
+    print(f"🏆 Pérdida {inicial['perdida']:.5f} → {evaluacion['perdida']:.5f} "
+          f"({balanceador.evaluadas} evaluaciones nuevas)")
+    mejor_roster = espacio.aplicar(valores)
+    for stats in mejor_roster:
+        print(f"  • {stats.nombre}: ataque {stats.ataque} | defensa {stats.defensa} | "
+              f"crítico {stats.critico:.3f} | esquiva {stats.esquiva:.3f} | "
+              f"victorias {inicial['tasas'][stats.nombre]:.1%} → "
+              f"{evaluacion['tasas'][stats.nombre]:.1%}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump([{"nombre": s.nombre, "nivel": s.nivel, "pv": s.pv_max, "ataque": s.ataque,
+                        "defensa": s.defensa, "critico": s.critico, "esquiva": s.esquiva}
+                       for s in mejor_roster], archivo, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
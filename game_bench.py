@@ -0,0 +1,569 @@
+"""
+⏱️ BATALLA DE HÉROES - BENCHMARKS
+Micro-benchmarks de las estructuras de datos y del motor (sin pygame)
+
+Uso:
+    python -m game_bench lista_heroes
+    python -m game_bench turnos
+    python -m game_bench iniciativa
+    python -m game_bench memoria
+    python -m game_bench eventos
+    python -m game_bench observadores
+    python -m game_bench instantaneas
+    python -m game_bench arena
+"""
+
+import argparse
+import copy
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from game_arena import crear_arena
+from game_core import (AlmacenHeroes, HeroFactory, HeroStats, ListaCircularTurnos, ListaHeroes,
+                       MotorCombate, NodoHeroe, NodoTurno, PlanificadorIniciativa)
+from game_observadores import DespachadorEventos
+
+
+# ============================================================================
+# UTILIDADES
+# ============================================================================
+
+def cronometrar(funcion: Callable[[], None], repeticiones: int = 3) -> float:
+    """Retorna el mejor tiempo (segundos) de varias repeticiones"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def imprimir_tabla(titulo: str, columnas: List[str], filas: List[list]):
+    """Imprime una tabla de resultados alineada"""
+    print(f"\n📊 {titulo}")
+    anchos = [max(len(str(c)), *(len(str(f[i])) for f in filas)) for i, c in enumerate(columnas)]
+    print("  " + " | ".join(str(c).rjust(a) for c, a in zip(columnas, anchos)))
+    print("  " + "-+-".join("-" * a for a in anchos))
+    for fila in filas:
+        print("  " + " | ".join(str(v).rjust(a) for v, a in zip(fila, anchos)))
+
+
+# ============================================================================
+# LISTA DE HÉROES
+# ============================================================================
+
+class _ListaHeroesLineal:
+    """Referencia: la lista enlazada original sin índice ni cola (O(n) por operación)"""
+
+    def __init__(self):
+        self.cabeza: Optional[NodoHeroe] = None
+        self.tamano = 0
+
+    def agregar_heroe(self, nombre: str, nivel: int, pv: int, ataque: int) -> bool:
+        nuevo_nodo = NodoHeroe(HeroStats(nombre, nivel, pv, pv, ataque))
+        if not self.cabeza:
+            self.cabeza = nuevo_nodo
+        else:
+            actual = self.cabeza
+            while actual.siguiente:
+                actual = actual.siguiente
+            actual.siguiente = nuevo_nodo
+        self.tamano += 1
+        return True
+
+    def buscar_heroe(self, nombre: str) -> Optional[NodoHeroe]:
+        actual = self.cabeza
+        while actual:
+            if actual.nombre == nombre:
+                return actual
+            actual = actual.siguiente
+        return None
+
+    def mejorar_heroe(self, nombre: str) -> bool:
+        heroe = self.buscar_heroe(nombre)
+        if heroe:
+            heroe.stats.mejorar()
+            return True
+        return False
+
+    def eliminar_heroe(self, nombre: str) -> bool:
+        if not self.cabeza:
+            return False
+        if self.cabeza.nombre == nombre:
+            self.cabeza = self.cabeza.siguiente
+            self.tamano -= 1
+            return True
+        actual = self.cabeza
+        while actual.siguiente:
+            if actual.siguiente.nombre == nombre:
+                actual.siguiente = actual.siguiente.siguiente
+                self.tamano -= 1
+                return True
+            actual = actual.siguiente
+        return False
+
+
+def _ciclo_lista(clase: type, nombres: List[str]):
+    """Construye un roster y busca, mejora y elimina a cada héroe"""
+    lista = clase()
+    for nombre in nombres:
+        lista.agregar_heroe(nombre, 5, 100, 20)
+    for nombre in nombres:
+        lista.buscar_heroe(nombre)
+        lista.mejorar_heroe(nombre)
+    for nombre in reversed(nombres):
+        lista.eliminar_heroe(nombre)
+
+
+def bench_lista_heroes(tamanos: Optional[List[int]] = None):
+    """Curva de escalado de ListaHeroes antes (lineal) y después (indexada)"""
+    tamanos = tamanos or [250, 500, 1000, 2000, 4000]
+    filas = []
+    for n in tamanos:
+        nombres = [f"H{i}" for i in range(n)]
+        lineal = cronometrar(lambda: _ciclo_lista(_ListaHeroesLineal, nombres), 1)
+        indexada = cronometrar(lambda: _ciclo_lista(ListaHeroes, nombres))
+        filas.append([n, f"{lineal * 1000:.1f}", f"{indexada * 1000:.2f}",
+                      f"{lineal / n * 1e6:.1f}", f"{indexada / n * 1e6:.2f}",
+                      f"{lineal / indexada:.0f}x"])
+    imprimir_tabla("ListaHeroes: agregar + buscar + mejorar + eliminar n héroes",
+                   ["n", "antes ms", "después ms", "antes µs/héroe", "después µs/héroe",
+                    "mejora"], filas)
+
+
+# ============================================================================
+# LISTA CIRCULAR DE TURNOS
+# ============================================================================
+
+class _ListaCircularLineal:
+    """Referencia: el anillo simple original (recorre la lista para agregar y eliminar)"""
+
+    def __init__(self):
+        self.actual: Optional[NodoTurno] = None
+        self.tamano = 0
+
+    def agregar_turno(self, heroe: NodoHeroe) -> bool:
+        nuevo_nodo = NodoTurno(heroe)
+        if not self.actual:
+            nuevo_nodo.siguiente = nuevo_nodo
+            self.actual = nuevo_nodo
+        else:
+            temp = self.actual
+            while temp.siguiente != self.actual:
+                temp = temp.siguiente
+            temp.siguiente = nuevo_nodo
+            nuevo_nodo.siguiente = self.actual
+        self.tamano += 1
+        return True
+
+    def eliminar_turno(self, nombre: str) -> bool:
+        if self.tamano == 1:
+            if self.actual.heroe.nombre == nombre:
+                self.actual = None
+                self.tamano = 0
+                return True
+            return False
+        temp = self.actual
+        while temp.siguiente != self.actual:
+            temp = temp.siguiente
+        anterior = temp
+        temp = self.actual
+        for _ in range(self.tamano):
+            if temp.heroe.nombre == nombre:
+                anterior.siguiente = temp.siguiente
+                if temp == self.actual:
+                    self.actual = temp.siguiente
+                self.tamano -= 1
+                return True
+            anterior = temp
+            temp = temp.siguiente
+        return False
+
+    def siguiente_turno(self) -> Optional[NodoHeroe]:
+        self.actual = self.actual.siguiente
+        return self.actual.heroe
+
+
+def _ciclo_turnos(clase: type, heroes: List[NodoHeroe], orden_bajas: List[str]):
+    """Llena el anillo, da una vuelta completa y elimina a todos (una baja por turno)"""
+    turnos = clase()
+    for heroe in heroes:
+        turnos.agregar_turno(heroe)
+    for _ in heroes:
+        turnos.siguiente_turno()
+    for nombre in orden_bajas:
+        turnos.eliminar_turno(nombre)
+        if turnos.tamano:
+            turnos.siguiente_turno()
+
+
+def bench_turnos(tamanos: Optional[List[int]] = None, limite_lineal: int = 5000):
+    """ListaCircularTurnos antes (anillo simple) y después (doble enlace + mapa)"""
+    tamanos = tamanos or [10, 1000, 100000]
+    filas = []
+    for n in tamanos:
+        heroes = [NodoHeroe(HeroStats(f"H{i}", 5, 100, 100, 20)) for i in range(n)]
+        orden_bajas = [heroe.nombre for heroe in heroes]
+        random.Random(n).shuffle(orden_bajas)
+        repeticiones = max(1, 10000 // n)
+
+        despues = cronometrar(lambda: _ciclo_turnos(ListaCircularTurnos, heroes, orden_bajas),
+                              repeticiones)
+        if n <= limite_lineal:
+            antes = cronometrar(lambda: _ciclo_turnos(_ListaCircularLineal, heroes, orden_bajas),
+                                repeticiones)
+            columnas_antes = [f"{antes / n * 1e6:.2f}", f"{antes / despues:.1f}x"]
+        else:
+            columnas_antes = ["— (O(n²))", "—"]
+        filas.append([n, f"{despues * 1000:.2f}", f"{despues / n * 1e6:.2f}", *columnas_antes])
+    imprimir_tabla("ListaCircularTurnos: agregar n + vuelta completa + n bajas",
+                   ["participantes", "después ms", "después µs/héroe", "antes µs/héroe",
+                    "mejora"], filas)
+
+
+# ============================================================================
+# INICIATIVA
+# ============================================================================
+
+def _ordenar_burbuja(turnos: _ListaCircularLineal):
+    """Referencia: el ordenar_por_pv original (burbuja + reconstrucción O(n) por inserción)"""
+    heroes = []
+    temp = turnos.actual
+    for _ in range(turnos.tamano):
+        heroes.append(temp.heroe)
+        temp = temp.siguiente
+    for i in range(len(heroes)):
+        for j in range(len(heroes) - 1 - i):
+            if heroes[j].pv < heroes[j + 1].pv:
+                heroes[j], heroes[j + 1] = heroes[j + 1], heroes[j]
+    turnos.actual = None
+    turnos.tamano = 0
+    for heroe in heroes:
+        turnos.agregar_turno(heroe)
+
+
+def bench_iniciativa(tamanos: Optional[List[int]] = None, limite_burbuja: int = 2000):
+    """Reordenar por PV: burbuja original vs ordenar() y actualizaciones O(log n)"""
+    tamanos = tamanos or [10, 1000, 10000, 100000]
+    filas = []
+    for n in tamanos:
+        rng = random.Random(n)
+        heroes = [NodoHeroe(HeroStats(f"H{i}", 5, rng.randint(1, 200), 200, 20))
+                  for i in range(n)]
+
+        turnos = ListaCircularTurnos()
+        turnos.reconstruir(heroes)
+        ordenar = cronometrar(turnos.ordenar_por_pv)
+
+        planificador = PlanificadorIniciativa()
+        for heroe in heroes:
+            planificador.agregar(heroe)
+        cambios = [rng.choice(heroes) for _ in range(10000)]
+
+        def actualizar_todos():
+            for heroe in cambios:
+                heroe.stats.pv = max(1, heroe.stats.pv - 1)
+                planificador.actualizar(heroe)
+        actualizar = cronometrar(actualizar_todos, 1) / len(cambios)
+
+        if n <= limite_burbuja:
+            lineal = _ListaCircularLineal()
+            for heroe in heroes:
+                lineal.agregar_turno(heroe)
+            burbuja = f"{cronometrar(lambda: _ordenar_burbuja(lineal), 1) * 1000:.2f}"
+        else:
+            burbuja = "— (O(n²))"
+        filas.append([n, burbuja, f"{ordenar * 1000:.2f}", f"{actualizar * 1e6:.2f}"])
+    imprimir_tabla("Iniciativa: reordenar por PV y actualizar un héroe",
+                   ["héroes", "burbuja ms", "ordenar ms", "actualizar µs"], filas)
+
+
+# ============================================================================
+# MEMORIA
+# ============================================================================
+
+@dataclass
+class _HeroStatsConDict:
+    """Referencia: HeroStats como dataclass normal (con __dict__ por instancia)"""
+    nombre: str
+    nivel: int
+    pv: int
+    pv_max: int
+    ataque: int
+    defensa: int = 5
+    critico: float = 0.15
+    esquiva: float = 0.10
+    energia: int = 0
+    energia_max: int = 100
+
+
+class _NodoConDict:
+    """Referencia: nodo sin __slots__ (NodoHeroe y NodoTurno originales)"""
+
+    def __init__(self, valor):
+        self.valor = valor
+        self.siguiente = None
+
+
+def _medir_bytes(construir: Callable[[], object]) -> int:
+    """Bytes retenidos por el objeto que retorna construir()"""
+    tracemalloc.start()
+    inicio = tracemalloc.take_snapshot()
+    objeto = construir()
+    fin = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in fin.compare_to(inicio, "filename"))
+    del objeto
+    return total
+
+
+def bench_memoria(n: int = 100000):
+    """Bytes por héroe: objetos con __dict__ vs __slots__ vs almacén en arrays"""
+    nombres = [f"H{i}" for i in range(n)]  # compartidos: no se cuentan
+
+    def con_dict():
+        heroes = [_NodoConDict(_HeroStatsConDict(nombre, 5, 100, 100, 20)) for nombre in nombres]
+        return heroes, [_NodoConDict(heroe) for heroe in heroes]
+
+    def con_slots():
+        heroes = [NodoHeroe(HeroStats(nombre, 5, 100, 100, 20)) for nombre in nombres]
+        return heroes, [NodoTurno(heroe) for heroe in heroes]
+
+    def en_arrays():
+        almacen = AlmacenHeroes()
+        for nombre in nombres:
+            almacen.agregar(HeroStats(nombre, 5, 100, 100, 20))
+        return almacen
+
+    filas = []
+    base = None
+    for etiqueta, construir in [("antes: __dict__ (stats + nodo + turno)", con_dict),
+                                ("después: __slots__ (stats + nodo + turno)", con_slots),
+                                ("AlmacenHeroes (arrays)", en_arrays)]:
+        por_heroe = _medir_bytes(construir) / n
+        base = base or por_heroe
+        filas.append([etiqueta, f"{por_heroe:.0f}", f"{base / por_heroe:.1f}x"])
+    imprimir_tabla(f"Memoria por héroe (tracemalloc, {n} héroes)",
+                   ["representación", "bytes/héroe", "reducción"], filas)
+
+
+# ============================================================================
+# EVENTOS DE COMBATE
+# ============================================================================
+
+def _turnos_eventos(num_turnos: int, pool_eventos: int, convertir: Optional[Callable] = None,
+                    conservar: Optional[list] = None):
+    """Juega num_turnos turnos (reiniciando batallas) y opcionalmente conserva los resultados"""
+    rng = random.Random(0)
+    motor = MotorCombate(HeroFactory.crear_lista_inicial(), None, rng, pool_eventos)
+    for _ in range(num_turnos):
+        resultado = motor.ejecutar_turno()
+        if convertir:
+            resultado = convertir(resultado)
+        if conservar is not None:
+            conservar.append(resultado)
+        if resultado.get("fin_juego"):
+            motor = MotorCombate(HeroFactory.crear_lista_inicial(), None, rng, pool_eventos)
+
+
+def bench_eventos(num_turnos: int = 20000):
+    """Asignaciones por turno: dict por acción vs EventoCombate vs pool de eventos"""
+    configuraciones = [
+        ("antes: dict por acción", 0, lambda evento: evento.a_dict()),
+        ("EventoCombate (slots)", 0, None),
+        ("EventoCombate + PoolEventos", 8, None),
+    ]
+    filas = []
+    for etiqueta, pool, convertir in configuraciones:
+        segundos = cronometrar(lambda: _turnos_eventos(num_turnos, pool, convertir))
+
+        # Bytes que quedan vivos por turno si un consumidor conserva cada resultado
+        resultados: list = []
+        por_turno = _medir_bytes(
+            lambda: _turnos_eventos(num_turnos, pool, convertir, resultados)) / num_turnos
+
+        # Pico transitorio de memoria dentro de un turno
+        motor = MotorCombate(HeroFactory.crear_lista_inicial(), None, random.Random(1), pool)
+        tracemalloc.start()
+        picos = []
+        for _ in range(200):
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            resultado = motor.ejecutar_turno()
+            if convertir:
+                resultado = convertir(resultado)
+            picos.append(tracemalloc.get_traced_memory()[1] - base)
+            if resultado.get("fin_juego"):
+                motor = MotorCombate(HeroFactory.crear_lista_inicial(), None, random.Random(1), pool)
+        tracemalloc.stop()
+
+        filas.append([etiqueta, f"{por_turno:.0f}", f"{sum(picos) / len(picos):.0f}",
+                      f"{num_turnos / segundos:,.0f}"])
+    imprimir_tabla(f"Resultados de acción ({num_turnos} turnos)",
+                   ["formato", "bytes retenidos/turno", "pico bytes/turno", "turnos/s"], filas)
+
+
+# ============================================================================
+# DESPACHO DE OBSERVERS
+# ============================================================================
+
+class _ExportadorLento:
+    """Consumidor con un coste fijo de E/S por llamada (p. ej. telemetría)"""
+
+    def __init__(self, costo_llamada: float):
+        self.costo_llamada = costo_llamada
+        self.recibidos = 0
+
+    def __call__(self, eventos):
+        time.sleep(self.costo_llamada)
+        self.recibidos += len(eventos) if isinstance(eventos, list) else 1
+
+
+def _jugar_con_observer(num_turnos: int, observer: Callable) -> float:
+    """Juega num_turnos turnos con el observer dado. Retorna los segundos del bucle"""
+    rng = random.Random(0)
+    motor = MotorCombate(HeroFactory.crear_lista_inicial(), None, rng, 4)
+    motor.agregar_observer(observer)
+    inicio = time.perf_counter()
+    for _ in range(num_turnos):
+        if motor.ejecutar_turno().get("fin_juego"):
+            motor = MotorCombate(HeroFactory.crear_lista_inicial(), None, rng, 4)
+            motor.agregar_observer(observer)
+    return time.perf_counter() - inicio
+
+
+def bench_observadores(num_turnos: int = 5000, costo_llamada: float = 0.0002):
+    """Observer síncrono lento vs despacho por lotes en segundo plano"""
+    filas = []
+
+    exportador = _ExportadorLento(costo_llamada)
+    segundos = _jugar_con_observer(num_turnos, exportador)
+    filas.append(["síncrono", f"{num_turnos / segundos:,.0f}", exportador.recibidos,
+                  0, "-", f"{costo_llamada * 1e3:.3f}"])
+
+    for politica in ("bloquear", "descartar", "coalescer"):
+        exportador = _ExportadorLento(costo_llamada)
+        despachador = DespachadorEventos(capacidad=512, politica=politica, tamano_lote=128)
+        despachador.agregar_observer(exportador, lotes=True)
+        despachador.iniciar()
+        segundos = _jugar_con_observer(num_turnos, despachador)
+        despachador.detener()
+
+        latencia = despachador.latencia(exportador)
+        filas.append([f"lotes/{politica}", f"{num_turnos / segundos:,.0f}", exportador.recibidos,
+                      despachador.descartados + despachador.coalescidos,
+                      f"{latencia.espera_media * 1e3:.2f}",
+                      f"{latencia.segundos_medios * 1e3:.3f}"])
+
+    imprimir_tabla(f"Observer con {costo_llamada * 1e3:.1f} ms por llamada ({num_turnos} turnos)",
+                   ["modo", "turnos/s", "entregados", "perdidos", "espera ms", "ms/llamada"],
+                   filas)
+
+
+# ============================================================================
+# INSTANTÁNEAS DEL MOTOR
+# ============================================================================
+
+def bench_instantaneas(repeticiones: int = 2000):
+    """Bifurcar una batalla de 4 héroes: copy.deepcopy vs snapshot/restore vs clonar"""
+    motor = MotorCombate(HeroFactory.crear_lista_inicial(), None, random.Random(0))
+    for _ in range(6):
+        motor.ejecutar_turno()
+    estado = motor.snapshot()
+
+    def deepcopy():
+        for _ in range(repeticiones):
+            copy.deepcopy(motor)
+
+    def snapshot():
+        for _ in range(repeticiones):
+            motor.snapshot()
+
+    def snapshot_sin_rng():
+        for _ in range(repeticiones):
+            motor.snapshot(incluir_rng=False)
+
+    def restore():
+        for _ in range(repeticiones):
+            motor.restore(estado)
+
+    def clonar():
+        for _ in range(repeticiones):
+            motor.clonar()
+
+    # Comprobar que restaurar y continuar equivale a continuar el original
+    clon = motor.clonar()
+    motor.simular_hasta_fin()
+    clon.simular_hasta_fin()
+    assert clon.snapshot() == motor.snapshot()
+    motor.restore(estado)
+
+    referencia = cronometrar(deepcopy) / repeticiones
+    filas = [["copy.deepcopy", f"{referencia * 1e6:.1f}", "1.0x"]]
+    for nombre, funcion in (("snapshot", snapshot), ("snapshot sin generador", snapshot_sin_rng),
+                            ("restore", restore), ("clonar", clonar)):
+        segundos = cronometrar(funcion) / repeticiones
+        filas.append([nombre, f"{segundos * 1e6:.1f}", f"{referencia / segundos:.1f}x"])
+    filas.append(["tamaño del estado", f"{len(estado)} campos", ""])
+    imprimir_tabla("Bifurcar una batalla de 4 héroes", ["operación", "µs", "mejora"], filas)
+
+
+# ============================================================================
+# ARENA MASIVA
+# ============================================================================
+
+def bench_arena(tamanos: Optional[List[int]] = None):
+    """Coste por turno de una arena con objetivos vecinos según el número de héroes"""
+    tamanos = tamanos or [1000, 4000, 16000]
+    filas = []
+    base = None
+    for n in tamanos:
+        lado = int((n * 2) ** 0.5) + 1
+        motor, arena = crear_arena(n, lado, lado, rng=random.Random(0))
+        inicio = time.perf_counter()
+        motor.simular_hasta_fin()
+        segundos = time.perf_counter() - inicio
+        por_turno = segundos / motor.turnos_jugados
+        base = base or por_turno
+        filas.append([n, motor.turnos_jugados, f"{por_turno * 1e6:.1f}", f"{por_turno / base:.2f}x",
+                      arena.desplazamientos])
+    imprimir_tabla("Arena hasta el último en pie (radio 3)",
+                   ["héroes", "turnos", "µs/turno", "vs menor", "desplazamientos"], filas)
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+BENCHMARKS = {
+    "lista_heroes": bench_lista_heroes,
+    "turnos": bench_turnos,
+    "iniciativa": bench_iniciativa,
+    "memoria": bench_memoria,
+    "eventos": bench_eventos,
+    "observadores": bench_observadores,
+    "instantaneas": bench_instantaneas,
+    "arena": bench_arena,
+}
+
+
+def main(argv: Optional[List[str]] = None):
+    """Ejecuta los benchmarks indicados (todos por defecto)"""
+    parser = argparse.ArgumentParser(description="Benchmarks de Batalla de Héroes")
+    parser.add_argument("benchmarks", nargs="*",
+                        help=f"benchmarks a ejecutar: {', '.join(BENCHMARKS)}")
+    args = parser.parse_args(argv)
+
+    desconocidos = set(args.benchmarks) - set(BENCHMARKS)
+    if desconocidos:
+        parser.error(f"benchmark desconocido: {', '.join(sorted(desconocidos))}")
+
+    for nombre in args.benchmarks or BENCHMARKS:
+        BENCHMARKS[nombre]()
+
+
+if __name__ == "__main__":
+    main()
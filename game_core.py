@@ -4,17 +4,19 @@ Lógica del juego separada de la presentación (Patrón MVC - Model)
 """
 
 import random
-from typing import Optional, List, Callable
-from dataclasses import dataclass
+from array import array
+from collections.abc import MutableMapping
+from typing import Optional, List, Callable, Dict, Iterable
+from dataclasses import dataclass, replace
 
 
 # ============================================================================
 # ENTIDADES DEL DOMINIO
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class HeroStats:
-    """Value Object para estadísticas del héroe"""
+    """Value Object para estadísticas del héroe (con __slots__, sin __dict__)"""
     nombre: str
     nivel: int
     pv: int
@@ -29,10 +31,10 @@ class HeroStats:
     def esta_vivo(self) -> bool:
         return self.pv > 0
     
-    def recibir_dano(self, cantidad: int) -> tuple[int, bool]:
+    def recibir_dano(self, cantidad: int, rng=random) -> tuple[int, bool]:
         """Retorna (daño real aplicado, fue_esquivado)"""
         # Probabilidad de esquivar
-        if random.random() < self.esquiva:
+        if rng.random() < self.esquiva:
             return (0, True)
         
         # Aplicar defensa (reduce daño en un porcentaje)
@@ -71,10 +73,13 @@ class HeroStats:
 
 
 class NodoHeroe:
-    """Nodo para lista enlazada simple"""
+    """Nodo para lista enlazada (con enlace al anterior para eliminar en O(1))"""
+    __slots__ = ("stats", "siguiente", "anterior")
+
     def __init__(self, stats: HeroStats):
         self.stats = stats
         self.siguiente: Optional['NodoHeroe'] = None
+        self.anterior: Optional['NodoHeroe'] = None
     
     @property
     def nombre(self):
@@ -118,10 +123,13 @@ class NodoHeroe:
 
 
 class NodoTurno:
-    """Nodo para lista circular de turnos"""
+    """Nodo para lista circular de turnos (doblemente enlazada)"""
+    __slots__ = ("heroe", "siguiente", "anterior")
+
     def __init__(self, heroe: NodoHeroe):
         self.heroe = heroe
         self.siguiente: Optional['NodoTurno'] = None
+        self.anterior: Optional['NodoTurno'] = None
 
 
 # ============================================================================
@@ -129,11 +137,18 @@ class NodoTurno:
 # ============================================================================
 
 class ListaHeroes:
-    """Lista enlazada simple para gestionar héroes"""
+    """Lista enlazada para gestionar héroes con índice por nombre.
+
+    El índice nombre→nodos y el puntero a la cola hacen que agregar, buscar,
+    mejorar y eliminar sean O(1) amortizado sin cambiar la API de la lista.
+    """
     
     def __init__(self):
         self.cabeza: Optional[NodoHeroe] = None
+        self.cola: Optional[NodoHeroe] = None
         self.tamano: int = 0
+        # Nodos por nombre en orden de inserción (admite nombres repetidos)
+        self._indice: Dict[str, List[NodoHeroe]] = {}
     
     def agregar_heroe(self, nombre: str, nivel: int, pv: int, ataque: int) -> bool:
         """Agrega un héroe al final de la lista"""
@@ -141,49 +156,69 @@ class ListaHeroes:
             return False
         
         stats = HeroStats(nombre, nivel, pv, pv, ataque)
-        nuevo_nodo = NodoHeroe(stats)
-        
+        self._enlazar(NodoHeroe(stats))
+        return True
+
+    def agregar_stats(self, stats: HeroStats) -> bool:
+        """Agrega un héroe con estadísticas completas (defensa, crítico, esquiva)"""
+        if not self._validar_datos(stats.nombre, stats.nivel, stats.pv_max, stats.ataque):
+            return False
+
+        self._enlazar(NodoHeroe(stats))
+        return True
+
+    @classmethod
+    def copia_de(cls, roster: Iterable[HeroStats]) -> 'ListaHeroes':
+        """Lista con copias de las estadísticas, sin validar los límites de creación.
+
+        Para héroes que ya existen (p. ej. mejorados por encima de esos
+        límites): ninguno se descarta y el orden se conserva.
+        """
+        lista = cls()
+        for stats in roster:
+            lista._enlazar(NodoHeroe(replace(stats)))
+        return lista
+
+    def _enlazar(self, nuevo_nodo: NodoHeroe):
+        """Enlaza un nodo al final de la lista"""
         if not self.cabeza:
             self.cabeza = nuevo_nodo
         else:
-            actual = self.cabeza
-            while actual.siguiente:
-                actual = actual.siguiente
-            actual.siguiente = nuevo_nodo
-        
+            self.cola.siguiente = nuevo_nodo
+            nuevo_nodo.anterior = self.cola
+        self.cola = nuevo_nodo
+
+        self._indice.setdefault(nuevo_nodo.nombre, []).append(nuevo_nodo)
         self.tamano += 1
-        return True
-    
+
     def eliminar_heroe(self, nombre: str) -> bool:
-        """Elimina un héroe por nombre"""
-        if not self.cabeza:
+        """Elimina un héroe por nombre (la primera aparición)"""
+        nodos = self._indice.get(nombre)
+        if not nodos:
             return False
-        
-        # Caso especial: eliminar cabeza
-        if self.cabeza.nombre == nombre:
-            self.cabeza = self.cabeza.siguiente
-            self.tamano -= 1
-            return True
-        
-        # Buscar en el resto de la lista
-        actual = self.cabeza
-        while actual.siguiente:
-            if actual.siguiente.nombre == nombre:
-                actual.siguiente = actual.siguiente.siguiente
-                self.tamano -= 1
-                return True
-            actual = actual.siguiente
-        
-        return False
+
+        nodo = nodos.pop(0)
+        if not nodos:
+            del self._indice[nombre]
+
+        # Desenlazar
+        if nodo.anterior:
+            nodo.anterior.siguiente = nodo.siguiente
+        else:
+            self.cabeza = nodo.siguiente
+        if nodo.siguiente:
+            nodo.siguiente.anterior = nodo.anterior
+        else:
+            self.cola = nodo.anterior
+        nodo.siguiente = nodo.anterior = None
+
+        self.tamano -= 1
+        return True
     
     def buscar_heroe(self, nombre: str) -> Optional[NodoHeroe]:
         """Busca un héroe por nombre"""
-        actual = self.cabeza
-        while actual:
-            if actual.nombre == nombre:
-                return actual
-            actual = actual.siguiente
-        return None
+        nodos = self._indice.get(nombre)
+        return nodos[0] if nodos else None
     
     def mejorar_heroe(self, nombre: str, inc_pv: int = 10, inc_ataque: int = 5) -> bool:
         """Mejora las estadísticas de un héroe"""
@@ -225,71 +260,239 @@ class ListaHeroes:
         return True
 
 
+class AlmacenHeroes:
+    """Almacén compacto de héroes en columnas array (struct-of-arrays).
+
+    Guarda cada estadística en un array tipado en lugar de un objeto por
+    héroe; útil para mantener en memoria rosters de ligas con millones de
+    héroes y materializar solo los que participan en una batalla.
+    """
+
+    _ENTEROS = ("nivel", "pv", "pv_max", "ataque", "defensa", "energia", "energia_max")
+    _REALES = ("critico", "esquiva")
+
+    def __init__(self):
+        self.nombres: List[str] = []
+        self._columnas = {campo: array("l") for campo in self._ENTEROS}
+        self._columnas.update({campo: array("d") for campo in self._REALES})
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def agregar(self, stats: HeroStats) -> int:
+        """Agrega un héroe y retorna su índice"""
+        self.nombres.append(stats.nombre)
+        for campo, columna in self._columnas.items():
+            columna.append(getattr(stats, campo))
+        return len(self.nombres) - 1
+
+    def obtener(self, indice: int) -> HeroStats:
+        """Materializa las estadísticas de un héroe"""
+        valores = {campo: columna[indice] for campo, columna in self._columnas.items()}
+        return HeroStats(nombre=self.nombres[indice], **valores)
+
+    def guardar(self, indice: int, stats: HeroStats):
+        """Escribe de vuelta las estadísticas de un héroe materializado"""
+        self.nombres[indice] = stats.nombre
+        for campo, columna in self._columnas.items():
+            columna[indice] = getattr(stats, campo)
+
+    def columna(self, campo: str) -> array:
+        """Acceso directo a una columna (p. ej. para análisis por lotes)"""
+        return self._columnas[campo]
+
+    def crear_lista(self, indices: Optional[List[int]] = None) -> ListaHeroes:
+        """Materializa una ListaHeroes con los héroes indicados (todos por defecto)"""
+        lista = ListaHeroes()
+        for i in (range(len(self)) if indices is None else indices):
+            lista.agregar_stats(self.obtener(i))
+        return lista
+
+    @classmethod
+    def desde_lista(cls, lista: ListaHeroes) -> 'AlmacenHeroes':
+        """Crea un almacén a partir de una ListaHeroes"""
+        almacen = cls()
+        for nodo in lista.iterar():
+            almacen.agregar(nodo.stats)
+        return almacen
+
+
+class MonticuloIndexado:
+    """Montículo binario de mínimos con posición indexada por elemento.
+
+    Cada elemento aparece una sola vez; su prioridad puede actualizarse o el
+    elemento eliminarse en O(log n). Los empates se resuelven por orden de
+    inserción, como un ordenamiento estable.
+    """
+
+    def __init__(self):
+        self._claves: List[tuple] = []  # (prioridad, orden de inserción)
+        self._elementos: list = []
+        self._posiciones: dict = {}
+        self._contador = 0
+
+    def __len__(self) -> int:
+        return len(self._elementos)
+
+    def __contains__(self, elemento) -> bool:
+        return elemento in self._posiciones
+
+    def insertar(self, elemento, prioridad):
+        """Inserta un elemento, o actualiza su prioridad si ya existe"""
+        if elemento in self._posiciones:
+            self.actualizar(elemento, prioridad)
+            return
+        self._claves.append((prioridad, self._contador))
+        self._elementos.append(elemento)
+        self._posiciones[elemento] = len(self._elementos) - 1
+        self._contador += 1
+        self._subir(len(self._elementos) - 1)
+
+    def actualizar(self, elemento, prioridad):
+        """Cambia la prioridad de un elemento conservando su orden de inserción"""
+        i = self._posiciones.get(elemento)
+        if i is None:
+            self.insertar(elemento, prioridad)
+            return
+        anterior = self._claves[i]
+        if anterior[0] == prioridad:
+            return
+        self._claves[i] = (prioridad, anterior[1])
+        if prioridad < anterior[0]:
+            self._subir(i)
+        else:
+            self._bajar(i)
+
+    def eliminar(self, elemento) -> bool:
+        """Elimina un elemento. Retorna False si no estaba"""
+        i = self._posiciones.pop(elemento, None)
+        if i is None:
+            return False
+        ultimo = len(self._elementos) - 1
+        if i != ultimo:
+            self._claves[i] = self._claves[ultimo]
+            self._elementos[i] = self._elementos[ultimo]
+            self._posiciones[self._elementos[i]] = i
+        self._claves.pop()
+        self._elementos.pop()
+        if i < len(self._elementos):
+            self._subir(i)
+            self._bajar(i)
+        return True
+
+    def tope(self):
+        """Retorna el elemento de menor prioridad sin extraerlo"""
+        return self._elementos[0] if self._elementos else None
+
+    def tope_excluyendo(self, elemento):
+        """Retorna el menor elemento distinto del dado en O(1)"""
+        if not self._elementos:
+            return None
+        if self._elementos[0] is not elemento:
+            return self._elementos[0]
+        # El segundo menor siempre es uno de los hijos de la raíz
+        hijos = [i for i in (1, 2) if i < len(self._elementos)]
+        if not hijos:
+            return None
+        return self._elementos[min(hijos, key=self._claves.__getitem__)]
+
+    def ordenados(self) -> list:
+        """Retorna los elementos de menor a mayor prioridad en O(n log n)"""
+        indices = sorted(range(len(self._elementos)), key=self._claves.__getitem__)
+        return [self._elementos[i] for i in indices]
+
+    def extraer(self):
+        """Extrae y retorna el elemento de menor prioridad"""
+        elemento = self.tope()
+        if elemento is not None:
+            self.eliminar(elemento)
+        return elemento
+
+    def _intercambiar(self, i: int, j: int):
+        self._claves[i], self._claves[j] = self._claves[j], self._claves[i]
+        self._elementos[i], self._elementos[j] = self._elementos[j], self._elementos[i]
+        self._posiciones[self._elementos[i]] = i
+        self._posiciones[self._elementos[j]] = j
+
+    def _subir(self, i: int):
+        while i > 0:
+            padre = (i - 1) // 2
+            if self._claves[i] >= self._claves[padre]:
+                break
+            self._intercambiar(i, padre)
+            i = padre
+
+    def _bajar(self, i: int):
+        n = len(self._elementos)
+        while True:
+            menor = i
+            for hijo in (2 * i + 1, 2 * i + 2):
+                if hijo < n and self._claves[hijo] < self._claves[menor]:
+                    menor = hijo
+            if menor == i:
+                return
+            self._intercambiar(i, menor)
+            i = menor
+
+
 class ListaCircularTurnos:
-    """Lista circular para gestionar turnos de batalla"""
+    """Lista circular doblemente enlazada para gestionar turnos de batalla.
+
+    Un mapa de nodos por nombre permite agregar y eliminar turnos en O(1).
+    """
     
     def __init__(self):
         self.actual: Optional[NodoTurno] = None
         self.tamano: int = 0
+        # Nodos por nombre del héroe en orden de inserción
+        self._nodos: Dict[str, List[NodoTurno]] = {}
     
     def agregar_turno(self, heroe: NodoHeroe) -> bool:
-        """Agrega un turno a la lista circular"""
+        """Agrega un turno al final de la lista circular (antes del actual)"""
         nuevo_nodo = NodoTurno(heroe)
         
         if not self.actual:
             nuevo_nodo.siguiente = nuevo_nodo
+            nuevo_nodo.anterior = nuevo_nodo
             self.actual = nuevo_nodo
         else:
-            # Insertar al final
-            temp = self.actual
-            while temp.siguiente != self.actual:
-                temp = temp.siguiente
-            temp.siguiente = nuevo_nodo
+            cola = self.actual.anterior
+            cola.siguiente = nuevo_nodo
+            nuevo_nodo.anterior = cola
             nuevo_nodo.siguiente = self.actual
+            self.actual.anterior = nuevo_nodo
         
+        self._nodos.setdefault(heroe.nombre, []).append(nuevo_nodo)
         self.tamano += 1
         return True
     
     def eliminar_turno(self, nombre: str) -> bool:
         """Elimina un turno por nombre del héroe"""
-        if not self.actual or self.tamano == 0:
+        nodos = self._nodos.get(nombre)
+        if not nodos:
             return False
         
-        # Caso especial: un solo nodo
-        if self.tamano == 1:
-            if self.actual.heroe.nombre == nombre:
-                self.actual = None
-                self.tamano = 0
-                return True
-            return False
-        
-        # Buscar el nodo a eliminar
-        temp = self.actual
-        anterior = None
-        
-        # Encontrar el anterior al actual
-        while temp.siguiente != self.actual:
-            temp = temp.siguiente
-        anterior = temp
+        nodo = nodos.pop(0)
+        if not nodos:
+            del self._nodos[nombre]
         
-        # Buscar en toda la lista circular
-        temp = self.actual
-        for _ in range(self.tamano):
-            if temp.heroe.nombre == nombre:
-                if temp == self.actual:
-                    # Eliminar el actual
-                    anterior.siguiente = temp.siguiente
-                    self.actual = temp.siguiente
-                else:
-                    anterior.siguiente = temp.siguiente
-                
-                self.tamano -= 1
-                return True
-            
-            anterior = temp
-            temp = temp.siguiente
+        if self.tamano == 1:
+            self.actual = None
+        else:
+            nodo.anterior.siguiente = nodo.siguiente
+            nodo.siguiente.anterior = nodo.anterior
+            if nodo is self.actual:
+                self.actual = nodo.siguiente
+        nodo.siguiente = nodo.anterior = None
         
-        return False
+        self.tamano -= 1
+        return True
+
+    def vaciar(self):
+        """Elimina todos los turnos"""
+        self.actual = None
+        self.tamano = 0
+        self._nodos = {}
     
     def siguiente_turno(self) -> Optional[NodoHeroe]:
         """Avanza al siguiente turno"""
@@ -305,27 +508,191 @@ class ListaCircularTurnos:
     
     def ordenar_por_pv(self):
         """Ordena la lista circular por PV (descendente)"""
+        self.ordenar(lambda heroe: heroe.pv)
+
+    def ordenar(self, clave: Callable[[NodoHeroe], float], descendente: bool = True):
+        """Ordena la lista circular por una clave en O(n log n) (estable)"""
         if self.tamano <= 1:
             return
-        
-        # Convertir a lista
+        self.reconstruir(sorted(self.iterar(), key=clave, reverse=descendente))
+
+    def reconstruir(self, heroes: List[NodoHeroe]):
+        """Reemplaza el anillo por los héroes dados; el primero pasa a ser el actual"""
+        self.vaciar()
+        for heroe in heroes:
+            self.agregar_turno(heroe)
+
+    def iterar(self) -> List[NodoHeroe]:
+        """Retorna los héroes en orden de turno empezando por el actual"""
         heroes = []
         temp = self.actual
         for _ in range(self.tamano):
             heroes.append(temp.heroe)
             temp = temp.siguiente
-        
-        # Ordenar por PV (burbuja)
-        for i in range(len(heroes)):
-            for j in range(len(heroes) - 1 - i):
-                if heroes[j].pv < heroes[j + 1].pv:
-                    heroes[j], heroes[j + 1] = heroes[j + 1], heroes[j]
-        
-        # Reconstruir lista circular
-        self.actual = None
-        self.tamano = 0
-        for heroe in heroes:
-            self.agregar_turno(heroe)
+        return heroes
+
+
+class PlanificadorIniciativa:
+    """Planificador de iniciativa sobre un montículo indexado.
+
+    Mantiene a los héroes ordenados por una clave intercambiable (PV por
+    defecto, de mayor a menor). Actualizar la prioridad de un héroe cuando
+    cambia su PV a mitad de ronda cuesta O(log n) y obtener el orden completo
+    O(n log n).
+    """
+
+    def __init__(self, clave: Optional[Callable[[NodoHeroe], float]] = None,
+                 descendente: bool = True):
+        self.clave = clave or (lambda heroe: heroe.pv)
+        self.descendente = descendente
+        self._monticulo = MonticuloIndexado()
+
+    def __len__(self) -> int:
+        return len(self._monticulo)
+
+    def __contains__(self, heroe: NodoHeroe) -> bool:
+        return heroe in self._monticulo
+
+    def _prioridad(self, heroe: NodoHeroe) -> float:
+        valor = self.clave(heroe)
+        return -valor if self.descendente else valor
+
+    def agregar(self, heroe: NodoHeroe):
+        """Agrega un héroe (o actualiza su prioridad si ya estaba)"""
+        self._monticulo.insertar(heroe, self._prioridad(heroe))
+
+    def actualizar(self, heroe: NodoHeroe):
+        """Recalcula la prioridad de un héroe en O(log n)"""
+        self._monticulo.actualizar(heroe, self._prioridad(heroe))
+
+    def eliminar(self, heroe: NodoHeroe) -> bool:
+        """Quita a un héroe del planificador"""
+        return self._monticulo.eliminar(heroe)
+
+    def siguiente(self) -> Optional[NodoHeroe]:
+        """Héroe con mayor iniciativa en O(1)"""
+        return self._monticulo.tope()
+
+    def cambiar_clave(self, clave: Callable[[NodoHeroe], float], descendente: bool = True):
+        """Cambia la clave de ordenamiento y recalcula todas las prioridades"""
+        self.clave = clave
+        self.descendente = descendente
+        for heroe in self._monticulo.ordenados():
+            self.actualizar(heroe)
+
+    def orden(self) -> List[NodoHeroe]:
+        """Retorna todos los héroes de mayor a menor iniciativa"""
+        return self._monticulo.ordenados()
+
+    def vaciar(self):
+        """Quita a todos los héroes conservando la clave"""
+        self._monticulo = MonticuloIndexado()
+
+
+# ============================================================================
+# EVENTOS DE COMBATE
+# ============================================================================
+
+_AUSENTE = object()  # Marca de campo no asignado en un EventoCombate
+
+
+class EventoCombate(MutableMapping):
+    """Resultado tipado de una acción de combate (formato nativo del motor).
+
+    Es un registro con __slots__ que además se comporta como el dict que
+    retornaban las acciones: evento["dano"], evento.get("es_critico") y
+    "ganador" in evento siguen funcionando. Solo los campos asignados forman
+    parte de la vista dict.
+    """
+
+    __slots__ = ("tipo", "atacante", "objetivo", "heroe", "dano", "cantidad",
+                 "curacion_pasiva", "es_critico", "fue_esquivado", "objetivo_murio",
+                 "razon", "ronda", "fin_ronda", "fin_juego", "ganador")
+
+    def __init__(self, tipo: str = "", **campos):
+        self._reiniciar(tipo)
+        for clave, valor in campos.items():
+            self[clave] = valor
+
+    @classmethod
+    def preparar(cls, evento: Optional['EventoCombate'], tipo: str) -> 'EventoCombate':
+        """Reutiliza un evento (p. ej. de un PoolEventos) o crea uno nuevo"""
+        if evento is None:
+            return cls(tipo)
+        evento._reiniciar(tipo)
+        return evento
+
+    def _reiniciar(self, tipo: str):
+        self.tipo = tipo
+        self.atacante = self.objetivo = self.heroe = self.dano = self.cantidad = _AUSENTE
+        self.curacion_pasiva = self.es_critico = self.fue_esquivado = _AUSENTE
+        self.objetivo_murio = self.razon = self.ronda = _AUSENTE
+        self.fin_ronda = self.fin_juego = self.ganador = _AUSENTE
+
+    # --- Vista dict (compatibilidad con los observers existentes) ---
+
+    def __getitem__(self, clave: str):
+        valor = getattr(self, clave, _AUSENTE) if clave in EventoCombate.__slots__ else _AUSENTE
+        if valor is _AUSENTE:
+            raise KeyError(clave)
+        return valor
+
+    def __setitem__(self, clave: str, valor):
+        if clave not in EventoCombate.__slots__:
+            raise KeyError(clave)
+        setattr(self, clave, valor)
+
+    def __delitem__(self, clave: str):
+        self[clave]  # KeyError si no está asignado
+        setattr(self, clave, _AUSENTE)
+
+    def __iter__(self):
+        return (campo for campo in EventoCombate.__slots__
+                if getattr(self, campo) is not _AUSENTE)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, clave) -> bool:
+        return clave in EventoCombate.__slots__ and getattr(self, clave) is not _AUSENTE
+
+    def get(self, clave: str, defecto=None):
+        if clave not in EventoCombate.__slots__:
+            return defecto
+        valor = getattr(self, clave)
+        return defecto if valor is _AUSENTE else valor
+
+    def a_dict(self) -> dict:
+        """Copia como dict (el formato de resultado anterior)"""
+        return {campo: getattr(self, campo) for campo in self}
+
+    def copiar(self) -> 'EventoCombate':
+        """Copia independiente (necesaria para conservar eventos de un pool)"""
+        copia = EventoCombate.__new__(EventoCombate)
+        for campo in EventoCombate.__slots__:
+            setattr(copia, campo, getattr(self, campo))
+        return copia
+
+    def __repr__(self) -> str:
+        return f"EventoCombate({self.a_dict()!r})"
+
+
+class PoolEventos:
+    """Buffer circular de eventos preasignados.
+
+    Cada llamada a siguiente() reutiliza el evento más antiguo, de modo que un
+    evento es válido durante las siguientes `capacidad` acciones; quien quiera
+    conservarlo más tiempo debe usar evento.copiar().
+    """
+
+    def __init__(self, capacidad: int = 8):
+        self._eventos = [EventoCombate() for _ in range(max(1, capacidad))]
+        self._indice = 0
+
+    def siguiente(self) -> EventoCombate:
+        evento = self._eventos[self._indice]
+        self._indice = (self._indice + 1) % len(self._eventos)
+        return evento
 
 
 # ============================================================================
@@ -334,52 +701,60 @@ class ListaCircularTurnos:
 
 class AccionCombate:
     """Clase base para acciones de combate (Strategy Pattern)"""
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Generador inyectable; por defecto el módulo random global
+        self.rng = rng or random
     
-    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None) -> dict:
-        """Ejecuta la acción y retorna resultado"""
+    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None,
+                 evento: Optional[EventoCombate] = None) -> EventoCombate:
+        """Ejecuta la acción y retorna el resultado (en `evento` si se indica)"""
         raise NotImplementedError
 
 
 class AccionAtacar(AccionCombate):
     """Estrategia de ataque"""
     
-    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None) -> dict:
+    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None,
+                 evento: Optional[EventoCombate] = None) -> EventoCombate:
         if not objetivo or not objetivo.stats.esta_vivo():
-            return {"tipo": "ataque_fallido", "atacante": atacante.nombre}
+            resultado = EventoCombate.preparar(evento, "ataque_fallido")
+            resultado.atacante = atacante.nombre
+            return resultado
         
         # Calcular daño base
         dano_base = atacante.ataque
-        dano_aleatorio = random.randint(-5, 15)
+        dano_aleatorio = self.rng.randint(-5, 15)
         dano_total = dano_base + dano_aleatorio
         
         # Verificar crítico
-        es_critico = random.random() < atacante.critico
+        es_critico = self.rng.random() < atacante.critico
         if es_critico:
             dano_total = int(dano_total * 1.5)  # 50% más de daño
         
         # Aplicar daño (considera defensa y esquiva)
-        dano_real, fue_esquivado = objetivo.stats.recibir_dano(dano_total)
+        dano_real, fue_esquivado = objetivo.stats.recibir_dano(dano_total, self.rng)
         
         # Ganar energía por atacar
         atacante.stats.ganar_energia(15)
         
-        return {
-            "tipo": "ataque",
-            "atacante": atacante.nombre,
-            "objetivo": objetivo.nombre,
-            "dano": dano_real,
-            "es_critico": es_critico,
-            "fue_esquivado": fue_esquivado,
-            "objetivo_murio": not objetivo.stats.esta_vivo()
-        }
+        resultado = EventoCombate.preparar(evento, "ataque")
+        resultado.atacante = atacante.nombre
+        resultado.objetivo = objetivo.nombre
+        resultado.dano = dano_real
+        resultado.es_critico = es_critico
+        resultado.fue_esquivado = fue_esquivado
+        resultado.objetivo_murio = not objetivo.stats.esta_vivo()
+        return resultado
 
 
 class AccionCurar(AccionCombate):
     """Estrategia de curación"""
     
-    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None) -> dict:
+    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None,
+                 evento: Optional[EventoCombate] = None) -> EventoCombate:
         curacion_base = 15 + (atacante.nivel * 5)
-        curacion_aleatoria = random.randint(5, 20)
+        curacion_aleatoria = self.rng.randint(5, 20)
         curacion = curacion_base + curacion_aleatoria
         
         curacion_real = atacante.stats.curar(curacion)
@@ -387,75 +762,122 @@ class AccionCurar(AccionCombate):
         # Ganar energía por curar
         atacante.stats.ganar_energia(10)
         
-        return {
-            "tipo": "curacion",
-            "heroe": atacante.nombre,
-            "cantidad": curacion_real
-        }
+        resultado = EventoCombate.preparar(evento, "curacion")
+        resultado.heroe = atacante.nombre
+        resultado.cantidad = curacion_real
+        return resultado
 
 
 class AccionHabilidadEspecial(AccionCombate):
     """Estrategia de habilidad especial (cuesta energía)"""
     
-    def __init__(self, costo_energia: int = 50):
+    def __init__(self, costo_energia: int = 50, rng: Optional[random.Random] = None):
+        super().__init__(rng)
         self.costo_energia = costo_energia
     
-    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None) -> dict:
+    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None,
+                 evento: Optional[EventoCombate] = None) -> EventoCombate:
         # Verificar si tiene energía suficiente
         if not atacante.stats.usar_energia(self.costo_energia):
-            return {
-                "tipo": "habilidad_fallida",
-                "atacante": atacante.nombre,
-                "razon": "energia_insuficiente"
-            }
+            resultado = EventoCombate.preparar(evento, "habilidad_fallida")
+            resultado.atacante = atacante.nombre
+            resultado.razon = "energia_insuficiente"
+            return resultado
         
         if not objetivo or not objetivo.stats.esta_vivo():
-            return {"tipo": "habilidad_fallida", "atacante": atacante.nombre, "razon": "sin_objetivo"}
+            resultado = EventoCombate.preparar(evento, "habilidad_fallida")
+            resultado.atacante = atacante.nombre
+            resultado.razon = "sin_objetivo"
+            return resultado
         
         # Habilidad especial: Daño masivo ignorando defensa
         dano_base = int(atacante.ataque * 2.5)
-        dano_aleatorio = random.randint(20, 40)
+        dano_aleatorio = self.rng.randint(20, 40)
         dano_total = dano_base + dano_aleatorio
         
+        resultado = EventoCombate.preparar(evento, "habilidad")
+        resultado.atacante = atacante.nombre
+        resultado.objetivo = objetivo.nombre
+        
         # Ignorar defensa pero no esquiva
-        if random.random() < objetivo.esquiva:
-            return {
-                "tipo": "habilidad",
-                "atacante": atacante.nombre,
-                "objetivo": objetivo.nombre,
-                "dano": 0,
-                "fue_esquivado": True,
-                "objetivo_murio": False
-            }
+        if self.rng.random() < objetivo.esquiva:
+            resultado.dano = 0
+            resultado.fue_esquivado = True
+            resultado.objetivo_murio = False
+            return resultado
         
         # Aplicar daño directo
         dano_real = min(dano_total, objetivo.pv)
         objetivo.stats.pv = max(0, objetivo.stats.pv - dano_total)
         
-        return {
-            "tipo": "habilidad",
-            "atacante": atacante.nombre,
-            "objetivo": objetivo.nombre,
-            "dano": dano_real,
-            "fue_esquivado": False,
-            "objetivo_murio": not objetivo.stats.esta_vivo()
-        }
+        resultado.dano = dano_real
+        resultado.fue_esquivado = False
+        resultado.objetivo_murio = not objetivo.stats.esta_vivo()
+        return resultado
 
 
 class AccionPasar(AccionCombate):
     """Estrategia de pasar turno"""
     
-    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None) -> dict:
+    def ejecutar(self, atacante: NodoHeroe, objetivo: Optional[NodoHeroe] = None,
+                 evento: Optional[EventoCombate] = None) -> EventoCombate:
         # Recuperar energía y vida al pasar turno
         atacante.stats.ganar_energia(25)
         curacion = int(atacante.pv_max * 0.05)  # 5% de vida máxima
         curacion_real = atacante.stats.curar(curacion)
         
-        return {
-            "tipo": "pasar",
-            "heroe": atacante.nombre,
-            "curacion_pasiva": curacion_real
-        }
+        resultado = EventoCombate.preparar(evento, "pasar")
+        resultado.heroe = atacante.nombre
+        resultado.curacion_pasiva = curacion_real
+        return resultado
+
+
+# ============================================================================
+# POLÍTICAS DE DECISIÓN (Patrón Strategy)
+# ============================================================================
+
+class PoliticaCombate:
+    """Decide qué acción usa un héroe en su turno y contra quién.
+
+    El motor llama a seleccionar_accion y, si la acción necesita objetivo,
+    a seleccionar_objetivo. Las acciones disponibles están en motor.acciones.
+    """
+
+    def seleccionar_accion(self, motor: 'MotorCombate', heroe: NodoHeroe) -> AccionCombate:
+        raise NotImplementedError
+
+    def seleccionar_objetivo(self, motor: 'MotorCombate',
+                             heroe: NodoHeroe) -> Optional[NodoHeroe]:
+        """Por defecto, un enemigo vivo al azar"""
+        return motor.objetivo_aleatorio(heroe)
+
+
+class PoliticaUmbrales(PoliticaCombate):
+    """IA básica con umbrales fijos de probabilidad (política por defecto)"""
+
+    def seleccionar_accion(self, motor: 'MotorCombate', heroe: NodoHeroe) -> AccionCombate:
+        acciones = motor.acciones
+        rng = motor.rng
+
+        # Si tiene energía suficiente y poca vida del enemigo, usar habilidad
+        if heroe.energia >= 50:
+            objetivo_debil = motor.heroe_mas_debil(excluyendo=heroe)
+            if objetivo_debil:
+                if objetivo_debil.pv < 60 and rng.random() < 0.4:  # 40% chance si está débil
+                    return acciones["habilidad"]
+
+        # Curar si está por debajo del 40% de vida
+        if heroe.pv < heroe.pv_max * 0.4 and rng.random() < 0.6:  # 60% chance
+            return acciones["curar"]
+
+        # Decisión normal con ponderación
+        rand = rng.random()
+        if rand < 0.55:  # 55% atacar
+            return acciones["atacar"]
+        elif rand < 0.80:  # 25% curar
+            return acciones["curar"]
+        else:  # 20% pasar (regenerar energía)
+            return acciones["pasar"]
 
 
 # ============================================================================
@@ -463,13 +885,24 @@ class AccionPasar(AccionCombate):
 # ============================================================================
 
 class MotorCombate:
-    """Facade para la lógica de combate"""
+    """Facade para la lógica de combate.
+
+    Una ronda termina cuando todos los héroes vivos al inicio de ella han
+    jugado su turno (o han muerto). Al cerrar cada ronda se llama a
+    finalizar_ronda y, al alcanzar num_rondas (None = sin límite), la batalla
+    termina con el héroe de más PV como ganador.
+    """
     
-    def __init__(self, lista_heroes: ListaHeroes, num_rondas: int = 5):
+    def __init__(self, lista_heroes: ListaHeroes, num_rondas: Optional[int] = 5,
+                 rng: Optional[random.Random] = None, pool_eventos: int = 0,
+                 politica: Optional[PoliticaCombate] = None):
         self.lista_heroes = lista_heroes
+        self.rng = rng or random  # Generador inyectable para reproducibilidad
         self.turnos = ListaCircularTurnos()
         self.num_rondas = num_rondas
         self.ronda_actual = 0
+        self.turnos_jugados = 0
+        self.terminado = False
         self.estadisticas = {
             "ataques_totales": 0,
             "dano_total": 0,
@@ -480,59 +913,135 @@ class MotorCombate:
             "habilidades_usadas": 0
         }
         self.observers: List[Callable] = []
+        self._silencioso = False  # Suspende observers durante el avance rápido
+
+        # Estrategias reutilizadas entre turnos y, opcionalmente, un pool de
+        # eventos preasignados (los eventos se reciclan tras pool_eventos turnos)
+        self.acciones: Dict[str, AccionCombate] = {
+            "atacar": AccionAtacar(self.rng),
+            "curar": AccionCurar(self.rng),
+            "habilidad": AccionHabilidadEspecial(rng=self.rng),
+            "pasar": AccionPasar(self.rng),
+        }
+        self._pool = PoolEventos(pool_eventos) if pool_eventos > 0 else None
+        # El fin de ronda se notifica dentro del mismo turno: un evento propio
+        # fuera del pool para no pisar el del turno cuando pool_eventos == 1
+        self._evento_ronda = EventoCombate() if self._pool else None
+
+        # Conjunto de vivos mantenido incrementalmente: lista + posiciones para
+        # elegir objetivos en O(1), montículo por PV para el más débil y
+        # planificador de iniciativa (mayor PV primero) para el orden de ronda
+        self._vivos: List[NodoHeroe] = []
+        self._pos_vivos: Dict[NodoHeroe, int] = {}
+        self._pv_minimo = MonticuloIndexado()
+        self.iniciativa = PlanificadorIniciativa()
+
+        # Héroes que aún no han jugado en la ronda actual
+        self._pendientes_ronda: set = set()
+
+        # Posición fija de cada héroe para las instantáneas (snapshot/restore)
+        self._heroes: List[NodoHeroe] = lista_heroes.iterar()
+        self._indice_heroe: Dict[NodoHeroe, int] = {h: i for i, h in enumerate(self._heroes)}
+        
+        # Política de decisión general y, opcionalmente, una por héroe
+        self.politica = politica or PoliticaUmbrales()
+        self._politicas: Dict[str, PoliticaCombate] = {}
         
         # Inicializar turnos
         self._inicializar_turnos()
     
     def _inicializar_turnos(self):
-        """Inicializa la lista circular de turnos"""
+        """Inicializa la lista circular de turnos y el conjunto de vivos"""
         for heroe in self.lista_heroes.obtener_heroes_vivos():
             self.turnos.agregar_turno(heroe)
+            self._pos_vivos[heroe] = len(self._vivos)
+            self._vivos.append(heroe)
+            self._actualizar_pv(heroe)
+        self._pendientes_ronda = set(self._vivos)
+
+    def _actualizar_pv(self, heroe: NodoHeroe):
+        """Refleja el PV actual de un héroe en el conjunto de vivos"""
+        if heroe not in self._pos_vivos:
+            return
+        if not heroe.stats.esta_vivo():
+            self._eliminar_vivo(heroe)
+            return
+        self._pv_minimo.actualizar(heroe, heroe.pv)
+        self.iniciativa.actualizar(heroe)
+
+    def _eliminar_vivo(self, heroe: NodoHeroe):
+        """Quita un héroe del conjunto de vivos en O(log n)"""
+        i = self._pos_vivos.pop(heroe)
+        ultimo = self._vivos.pop()
+        if ultimo is not heroe:
+            self._vivos[i] = ultimo
+            self._pos_vivos[ultimo] = i
+        self._pv_minimo.eliminar(heroe)
+        self.iniciativa.eliminar(heroe)
+        self._pendientes_ronda.discard(heroe)
+
+    @property
+    def num_vivos(self) -> int:
+        """Cantidad de héroes vivos en O(1)"""
+        return len(self._vivos)
     
     def agregar_observer(self, callback: Callable):
         """Patrón Observer para notificar eventos"""
         self.observers.append(callback)
     
-    def notificar(self, evento: dict):
+    def notificar(self, evento: EventoCombate):
         """Notifica a los observers"""
+        if self._silencioso:
+            return
         for observer in self.observers:
             observer(evento)
     
-    def ejecutar_turno(self) -> dict:
+    def _nuevo_evento(self) -> Optional[EventoCombate]:
+        """Evento del pool para la siguiente acción (None = asignar uno nuevo)"""
+        return self._pool.siguiente() if self._pool else None
+
+    def ejecutar_turno(self) -> EventoCombate:
         """Ejecuta un turno de combate"""
         heroe_actual = self.turnos.obtener_turno_actual()
-        if not heroe_actual:
-            return {"tipo": "fin_juego"}
+        if not heroe_actual or self.terminado:
+            return EventoCombate.preparar(self._nuevo_evento(), "fin_juego")
         
-        # Seleccionar acción con IA
-        accion = self._seleccionar_accion(heroe_actual)
+        # Seleccionar acción con la política del héroe
+        politica = self._politicas.get(heroe_actual.nombre, self.politica)
+        accion = politica.seleccionar_accion(self, heroe_actual)
         
         # Ejecutar acción
         if isinstance(accion, (AccionAtacar, AccionHabilidadEspecial)):
-            objetivo = self._seleccionar_objetivo(heroe_actual)
-            resultado = accion.ejecutar(heroe_actual, objetivo)
+            objetivo = politica.seleccionar_objetivo(self, heroe_actual)
+            resultado = accion.ejecutar(heroe_actual, objetivo, self._nuevo_evento())
+            if objetivo:
+                self._actualizar_pv(objetivo)
             
-            if resultado["tipo"] in ["ataque", "habilidad"]:
+            if resultado.tipo == "ataque" or resultado.tipo == "habilidad":
                 self.estadisticas["ataques_totales"] += 1
-                self.estadisticas["dano_total"] += resultado.get("dano", 0)
+                self.estadisticas["dano_total"] += resultado.dano
                 
                 # Trackear críticos y esquivas
-                if resultado.get("es_critico"):
+                if resultado.es_critico is True:  # ausente en habilidades
                     self.estadisticas["criticos"] += 1
-                if resultado.get("fue_esquivado"):
+                if resultado.fue_esquivado:
                     self.estadisticas["esquivas"] += 1
-                if resultado["tipo"] == "habilidad":
+                if resultado.tipo == "habilidad":
                     self.estadisticas["habilidades_usadas"] += 1
                 
                 # Si murió, eliminar de turnos
-                if resultado.get("objetivo_murio", False):
-                    self.turnos.eliminar_turno(resultado["objetivo"])
+                if resultado.objetivo_murio:
+                    self.turnos.eliminar_turno(resultado.objetivo)
         else:
-            resultado = accion.ejecutar(heroe_actual)
+            resultado = accion.ejecutar(heroe_actual, None, self._nuevo_evento())
             
-            if resultado["tipo"] == "curacion":
+            if resultado.tipo == "curacion":
                 self.estadisticas["curaciones_totales"] += 1
-                self.estadisticas["salud_restaurada"] += resultado["cantidad"]
+                self.estadisticas["salud_restaurada"] += resultado.cantidad
+
+        self._actualizar_pv(heroe_actual)
+        self._pendientes_ronda.discard(heroe_actual)
+        self.turnos_jugados += 1
         
         # Notificar evento
         self.notificar(resultado)
@@ -541,64 +1050,205 @@ class MotorCombate:
         self.turnos.siguiente_turno()
         
         # Verificar fin de juego
-        heroes_vivos = self.lista_heroes.obtener_heroes_vivos()
-        if len(heroes_vivos) <= 1:
-            resultado["fin_juego"] = True
-            resultado["ganador"] = heroes_vivos[0] if heroes_vivos else None
+        if len(self._vivos) <= 1:
+            self.terminado = True
+            resultado.fin_juego = True
+            resultado.ganador = self._vivos[0] if self._vivos else None
+        elif not self._pendientes_ronda:
+            # Todos los vivos jugaron: cerrar la ronda
+            self.finalizar_ronda()
+            resultado.fin_ronda = self.ronda_actual
+            if self.num_rondas is not None and self.ronda_actual >= self.num_rondas:
+                self.terminado = True
+                resultado.fin_juego = True
+                resultado.ganador = self.obtener_ganador()
         
         return resultado
     
     def finalizar_ronda(self):
         """Finaliza una ronda y ordena por PV"""
         self.ronda_actual += 1
-        self.turnos.ordenar_por_pv()
-        self.notificar({
-            "tipo": "fin_ronda",
-            "ronda": self.ronda_actual
-        })
+        self.turnos.reconstruir(self.iniciativa.orden())
+        self._pendientes_ronda = set(self._vivos)
+        if self.observers and not self._silencioso:
+            evento = EventoCombate.preparar(self._evento_ronda, "fin_ronda")
+            evento.ronda = self.ronda_actual
+            self.notificar(evento)
+
+    def simular_ronda(self) -> EventoCombate:
+        """Ejecuta turnos hasta cerrar la ronda actual o terminar la batalla.
+
+        Los observers no reciben los eventos intermedios. Retorna el resultado
+        del último turno jugado.
+        """
+        ronda = self.ronda_actual
+        resultado = EventoCombate("fin_juego")
+        silencioso, self._silencioso = self._silencioso, True
+        try:
+            while not self.terminado and self.ronda_actual == ronda and self._vivos:
+                resultado = self.ejecutar_turno()
+        finally:
+            self._silencioso = silencioso
+        return resultado
+
+    def simular_hasta_fin(self, max_rondas: Optional[int] = None,
+                          max_turnos: Optional[int] = None) -> dict:
+        """Avanza la batalla sin UI hasta que termine o se alcance un límite.
+
+        max_rondas por defecto es num_rondas; max_turnos es una salvaguarda
+        opcional para batallas sin límite de rondas. Retorna el resultado final.
+        """
+        limite_rondas = max_rondas if max_rondas is not None else self.num_rondas
+        motivo = None
+        silencioso, self._silencioso = self._silencioso, True
+        try:
+            while not self.terminado and self._vivos:
+                if limite_rondas is not None and self.ronda_actual >= limite_rondas:
+                    motivo = "limite_rondas"
+                    break
+                if max_turnos is not None and self.turnos_jugados >= max_turnos:
+                    motivo = "limite_turnos"
+                    break
+                self.ejecutar_turno()
+        finally:
+            self._silencioso = silencioso
+        return self.resultado_final(motivo)
+
+    def resultado_final(self, motivo: Optional[str] = None) -> dict:
+        """Resumen del estado de la batalla (ganador, rondas, turnos, estadísticas)"""
+        if len(self._vivos) <= 1:
+            motivo = "ultimo_en_pie" if self._vivos else "sin_heroes"
+        elif self.terminado:
+            motivo = "limite_rondas"
+        return {
+            "tipo": "fin_batalla",
+            "motivo": motivo or "en_curso",
+            "ganador": self.obtener_ganador(),
+            "rondas": self.ronda_actual,
+            "turnos": self.turnos_jugados,
+            "estadisticas": dict(self.estadisticas)
+        }
     
     def obtener_ganador(self) -> Optional[NodoHeroe]:
-        """Retorna el héroe ganador"""
-        heroes = self.lista_heroes.obtener_heroes_vivos()
-        if not heroes:
-            return None
-        
-        ganador = heroes[0]
-        for heroe in heroes[1:]:
-            if heroe.pv > ganador.pv:
-                ganador = heroe
-        
-        return ganador
-    
-    def _seleccionar_accion(self, heroe: NodoHeroe) -> AccionCombate:
-        """Selecciona acción con IA básica"""
-        # Si tiene energía suficiente y poca vida del enemigo, usar habilidad
-        if heroe.energia >= 50:
-            posibles_objetivos = [h for h in self.lista_heroes.obtener_heroes_vivos() 
-                                  if h.nombre != heroe.nombre]
-            if posibles_objetivos:
-                objetivo_debil = min(posibles_objetivos, key=lambda h: h.pv)
-                if objetivo_debil.pv < 60 and random.random() < 0.4:  # 40% chance si está débil
-                    return AccionHabilidadEspecial()
-        
-        # Curar si está por debajo del 40% de vida
-        if heroe.pv < heroe.pv_max * 0.4 and random.random() < 0.6:  # 60% chance
-            return AccionCurar()
-        
-        # Decisión normal con ponderación
-        rand = random.random()
-        if rand < 0.55:  # 55% atacar
-            return AccionAtacar()
-        elif rand < 0.80:  # 25% curar
-            return AccionCurar()
-        else:  # 20% pasar (regenerar energía)
-            return AccionPasar()
+        """Retorna el héroe ganador (el vivo con más PV)"""
+        return self.iniciativa.siguiente()
+
+    # --- Instantáneas ---
+
+    def snapshot(self, incluir_rng: bool = True) -> tuple:
+        """Captura el estado de la batalla en un vector plano.
+
+        Solo guarda lo que cambia durante el combate: contadores, PV y
+        energía de cada héroe, anillo de turnos, orden interno de vivos,
+        pendientes de la ronda, estadísticas y estado del generador. Los
+        héroes se referencian por su posición en la lista original.
+        Copiar el estado del generador es lo más caro; incluir_rng=False lo
+        omite cuando el estado restaurado usará otra secuencia aleatoria.
+        """
+        indice = self._indice_heroe
+        vector = [self.turnos_jugados, self.ronda_actual, self.terminado]
+        for heroe in self._heroes:
+            stats = heroe.stats
+            vector.append(stats.pv)
+            vector.append(stats.energia)
+        anillo = self.turnos.iterar()
+        vector.append(len(anillo))
+        vector.extend([indice[heroe] for heroe in anillo])
+        vector.append(len(self._vivos))
+        vector.extend([indice[heroe] for heroe in self._vivos])
+        pendientes = 0
+        for heroe in self._pendientes_ronda:
+            pendientes |= 1 << indice[heroe]
+        vector.append(pendientes)
+        vector.extend(self.estadisticas.values())
+        vector.append(self.rng.getstate() if incluir_rng else None)
+        return tuple(vector)
+
+    def restore(self, estado: tuple):
+        """Restablece un estado capturado con snapshot() (de este motor o de un clon).
+
+        Si el estado no incluye el generador, este conserva su secuencia actual.
+        """
+        heroes = self._heroes
+        self.turnos_jugados, self.ronda_actual, self.terminado = estado[0], estado[1], estado[2]
+        i = 3
+        for heroe in heroes:
+            heroe.stats.pv = estado[i]
+            heroe.stats.energia = estado[i + 1]
+            i += 2
+
+        n = estado[i]
+        self.turnos.reconstruir([heroes[j] for j in estado[i + 1:i + 1 + n]])
+        i += 1 + n
+
+        n = estado[i]
+        self._vivos = [heroes[j] for j in estado[i + 1:i + 1 + n]]
+        self._pos_vivos = {heroe: j for j, heroe in enumerate(self._vivos)}
+        i += 1 + n
+
+        pendientes = estado[i]
+        self._pendientes_ronda = {heroe for j, heroe in enumerate(heroes) if pendientes >> j & 1}
+        i += 1
+
+        for clave in self.estadisticas:
+            self.estadisticas[clave] = estado[i]
+            i += 1
+        if estado[i] is not None:
+            self.rng.setstate(estado[i])
+
+        # Los montículos solo dependen de los PV y del orden de la lista:
+        # reinsertar a los vivos en ese orden reproduce los desempates
+        self._pv_minimo = MonticuloIndexado()
+        self.iniciativa.vaciar()
+        for heroe in heroes:
+            if heroe in self._pos_vivos:
+                self._pv_minimo.insertar(heroe, heroe.pv)
+                self.iniciativa.agregar(heroe)
+
+    def clonar(self, rng: Optional[random.Random] = None) -> 'MotorCombate':
+        """Copia independiente de la batalla, sin observers.
+
+        El clon tiene su propio generador (por defecto con el mismo estado),
+        de modo que avanzarlo no altera el motor original.
+        """
+        lista = ListaHeroes.copia_de(heroe.stats for heroe in self._heroes)
+        if lista.tamano != len(self._heroes):
+            raise RuntimeError(f"El clon tiene {lista.tamano} héroes y el original {len(self._heroes)}")
+        clon = MotorCombate(lista, self.num_rondas, rng or random.Random())
+        clon.restore(self.snapshot(incluir_rng=rng is None))
+        return clon
     
-    def _seleccionar_objetivo(self, atacante: NodoHeroe) -> Optional[NodoHeroe]:
-        """Selecciona objetivo aleatorio"""
-        posibles_objetivos = [h for h in self.lista_heroes.obtener_heroes_vivos() 
-                              if h.nombre != atacante.nombre]
-        return random.choice(posibles_objetivos) if posibles_objetivos else None
+    # --- Políticas y consultas para ellas ---
+
+    def asignar_politica(self, politica: PoliticaCombate, heroe: Optional[str] = None):
+        """Asigna la política de un héroe (o la general si no se indica héroe)"""
+        if heroe is None:
+            self.politica = politica
+        else:
+            self._politicas[heroe] = politica
+
+    def heroe_mas_debil(self, excluyendo: Optional[NodoHeroe] = None) -> Optional[NodoHeroe]:
+        """Héroe vivo con menos PV (distinto de `excluyendo`) en O(1)"""
+        if excluyendo is None:
+            return self._pv_minimo.tope()
+        return self._pv_minimo.tope_excluyendo(excluyendo)
+
+    def heroes_vivos(self) -> List[NodoHeroe]:
+        """Héroes vivos (en el orden interno del conjunto de vivos)"""
+        return list(self._vivos)
+
+    def objetivo_aleatorio(self, atacante: NodoHeroe) -> Optional[NodoHeroe]:
+        """Selecciona objetivo aleatorio entre los demás vivos en O(1)"""
+        n = len(self._vivos)
+        propia = self._pos_vivos.get(atacante)
+        candidatos = n - 1 if propia is not None else n
+        if candidatos <= 0:
+            return None
+
+        i = self.rng.randrange(candidatos)
+        if propia is not None and i >= propia:
+            i += 1
+        return self._vivos[i]
 
 
 # ============================================================================
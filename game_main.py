@@ -5,6 +5,7 @@ Aplicación principal con gestión de estados
 
 import pygame
 import sys
+import time
 from typing import Dict, Optional
 from game_screens import *
 
@@ -45,9 +46,14 @@ class GameApp:
         self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
         pygame.display.set_caption("⚔️ Batalla de Héroes - Edición Modular")
         
-        # Reloj para FPS
+        # Reloj para FPS: a pleno ritmo solo mientras el estado anima; en
+        # reposo el bucle duerme en pygame.event.wait hasta idle_timeout ms
         self.clock = pygame.time.Clock()
         self.fps = 60
+        self.idle_timeout = 500
+        
+        # Indicador de rendimiento (F3)
+        self.overlay = PerformanceOverlay()
         
         # Estado del juego
         self.running = True
@@ -87,18 +93,57 @@ class GameApp:
         """Termina la aplicación"""
         self.running = False
     
+    def _wait_events(self, animating: bool) -> list:
+        """Eventos del frame; en reposo bloquea hasta uno o hasta idle_timeout"""
+        if animating:
+            return pygame.event.get()
+        event = pygame.event.wait(self.idle_timeout)
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return events + pygame.event.get()
+    
+    def _toggle_overlay(self):
+        """Muestra u oculta el indicador de FPS/CPU"""
+        self.overlay.visible = not self.overlay.visible
+        self.overlay.mark_dirty()
+        if not self.overlay.visible and self.current_state:
+            self.current_state.mark_dirty(self.overlay.dirty_area())
+    
+    def _render(self) -> list:
+        """Repinta el estado y, encima, el indicador si está visible"""
+        if self.overlay.visible and self.overlay.is_dirty():
+            # El texto anterior puede ser más ancho que el nuevo
+            self.current_state.mark_dirty(self.overlay.dirty_area())
+        
+        rects = self.current_state.render_dirty(self.screen)
+        if self.overlay.visible and (rects or self.overlay.is_dirty()):
+            self.overlay.draw(self.screen)
+            rects.append(self.overlay.dirty_area())
+        self.overlay.clean()
+        return rects
+    
     def run(self):
         """Bucle principal del juego"""
         while self.running:
+            # Esperar eventos (sin gastar CPU si nada se anima)
+            animating = self.current_state is not None and self.current_state.is_animating()
+            events = self._wait_events(animating)
+            frame_start = time.perf_counter()
+            
             # Manejar eventos
-            events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.VIDEOEXPOSE and self.current_state:
+                    # La ventana volvió a verse: repintar todo
+                    self.current_state.mark_dirty()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_F11:
                         # Toggle fullscreen
                         pygame.display.toggle_fullscreen()
+                        if self.current_state:
+                            self.current_state.mark_dirty()
+                    elif event.key == pygame.K_F3:
+                        self._toggle_overlay()
                 elif event.type == pygame.VIDEORESIZE:
                     # Manejar redimensionamiento de ventana
                     self.width = event.w
@@ -116,12 +161,13 @@ class GameApp:
                 self.current_state.handle_events(events)
                 self.current_state.update()
             
-            # Renderizar
+            # Renderizar solo las áreas que cambiaron y enviarlas a la pantalla
             if self.current_state:
-                self.current_state.render(self.screen)
+                rects = self._render()
+                if rects:
+                    pygame.display.update(rects)
             
-            # Actualizar pantalla
-            pygame.display.flip()
+            self.overlay.frame(animating, time.perf_counter() - frame_start)
             self.clock.tick(self.fps)
         
         # Limpiar
@@ -147,7 +193,9 @@ def main():
     print("\n🎮 Controles:")
     print("  • ESC - Volver al menú")
     print("  • ESPACIO - Pausar/Reanudar batalla")
+    print("  • 1/2/3 - Velocidad de batalla 1×, 10× o máxima")
     print("  • F11 - Pantalla completa")
+    print("  • F3 - Mostrar FPS y uso de CPU")
     print("  • Redimensionar ventana - Ajusta automáticamente la interfaz")
     print("\n🚀 Iniciando juego...\n")
     
@@ -0,0 +1,289 @@
+"""
+🆚 BATALLA DE HÉROES - MATRIZ DE EMPAREJAMIENTOS
+Tasa de victorias H×H con intervalos de confianza para balancear el roster
+
+Cada par de héroes se enfrenta en duelos (alternando quién empieza) por
+lotes repartidos entre procesos. Un par deja de programarse cuando la
+anchura de su intervalo de Wilson baja del objetivo o alcanza el máximo de
+duelos. Los resultados se guardan en una caché JSON indexada por el hash
+de las estadísticas de ambos héroes: al volver a ejecutar, los pares sin
+cambios no se simulan (o solo se completan si se pide más precisión).
+
+Uso:
+    python -m game_matchups
+    python -m game_matchups --roster extra.json --ancho 0.03 --trabajadores 0
+    python -m game_matchups --csv matriz.csv --npy matriz.npy --cache matchups.json
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import math
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import astuple, dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+from game_core import HeroFactory, HeroStats, MotorCombate
+from game_sim import cargar_roster, crear_lista
+
+
+Z_95 = 1.959964
+VERSION_CACHE = 2  # cambia al corregir cómo se cuentan los duelos (invalida la caché)
+
+
+# ============================================================================
+# ESTADÍSTICA
+# ============================================================================
+
+def intervalo_wilson(victorias: float, n: int, z: float = Z_95) -> Tuple[float, float]:
+    """Intervalo de Wilson para una proporción (los empates cuentan como media victoria)"""
+    if n == 0:
+        return (0.0, 1.0)
+    p = victorias / n
+    denominador = 1 + z * z / n
+    centro = (p + z * z / (2 * n)) / denominador
+    margen = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominador
+    return (max(0.0, centro - margen), min(1.0, centro + margen))
+
+
+@dataclass
+class ResultadoPar:
+    """Duelos acumulados entre a y b"""
+    victorias_a: int = 0
+    victorias_b: int = 0
+    empates: int = 0
+
+    @property
+    def duelos(self) -> int:
+        return self.victorias_a + self.victorias_b + self.empates
+
+    @property
+    def tasa_a(self) -> float:
+        """Tasa de victorias de a (los empates cuentan como media)"""
+        return (self.victorias_a + self.empates / 2) / self.duelos if self.duelos else 0.5
+
+    def intervalo(self) -> Tuple[float, float]:
+        return intervalo_wilson(self.victorias_a + self.empates / 2, self.duelos)
+
+    def sumar(self, victorias_a: int, victorias_b: int, empates: int):
+        self.victorias_a += victorias_a
+        self.victorias_b += victorias_b
+        self.empates += empates
+
+    def invertido(self) -> 'ResultadoPar':
+        return ResultadoPar(self.victorias_b, self.victorias_a, self.empates)
+
+
+# ============================================================================
+# DUELOS
+# ============================================================================
+
+def _duelos(a: HeroStats, b: HeroStats, num_duelos: int, semilla: str,
+            num_rondas: Optional[int], max_turnos: int) -> Tuple[int, int, int]:
+    """Juega num_duelos duelos a contra b. Retorna (victorias a, victorias b, empates)"""
+    rng = random.Random(semilla)
+    # Nombres prefijados por bando: un héroe propio puede llamarse como un predefinido
+    a, b = replace(a, nombre=f"0:{a.nombre}"), replace(b, nombre=f"1:{b.nombre}")
+    victorias_a = victorias_b = empates = 0
+    for k in range(num_duelos):
+        orden = [a, b] if k % 2 == 0 else [b, a]
+        motor = MotorCombate(crear_lista(orden), num_rondas, rng, pool_eventos=4)
+        resultado = motor.simular_hasta_fin(max_turnos=max_turnos)
+        ganador = resultado["ganador"]
+        if resultado["motivo"] == "limite_turnos" or ganador is None:
+            empates += 1
+        elif ganador.nombre[0] == "0":
+            victorias_a += 1
+        else:
+            victorias_b += 1
+    return victorias_a, victorias_b, empates
+
+
+def clave_par(a: HeroStats, b: HeroStats, num_rondas: Optional[int],
+              max_turnos: int) -> Tuple[str, bool]:
+    """Hash del par independiente del orden. Retorna (clave, invertido)"""
+    ta, tb = list(astuple(a)), list(astuple(b))
+    invertido = tb < ta
+    primero, segundo = (tb, ta) if invertido else (ta, tb)
+    datos = json.dumps([VERSION_CACHE, primero, segundo, num_rondas, max_turnos],
+                       ensure_ascii=False)
+    return hashlib.sha1(datos.encode("utf-8")).hexdigest(), invertido
+
+
+def cargar_cache(ruta: Optional[str]) -> Dict[str, ResultadoPar]:
+    if not ruta or not os.path.exists(ruta):
+        return {}
+    with open(ruta, encoding="utf-8") as archivo:
+        return {clave: ResultadoPar(**valor) for clave, valor in json.load(archivo).items()}
+
+
+def guardar_cache(ruta: str, cache: Dict[str, ResultadoPar]):
+    temporal = ruta + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump({clave: vars(resultado) for clave, resultado in cache.items()}, archivo)
+    os.replace(temporal, ruta)
+
+
+# ============================================================================
+# MATRIZ
+# ============================================================================
+
+@dataclass
+class MatrizEmparejamientos:
+    """Tasas de victoria de la fila contra la columna, con su intervalo"""
+    nombres: List[str]
+    tasa: List[List[float]]
+    bajo: List[List[float]]
+    alto: List[List[float]]
+    duelos: List[List[int]]
+    simulados: int = 0  # duelos jugados en esta ejecución (el resto venía de caché)
+
+    def guardar_csv(self, ruta: str):
+        """Formato largo: una fila por par ordenado"""
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(["heroe", "rival", "tasa", "ic_bajo", "ic_alto", "duelos"])
+            for i, nombre in enumerate(self.nombres):
+                for j, rival in enumerate(self.nombres):
+                    if i != j:
+                        escritor.writerow([nombre, rival, f"{self.tasa[i][j]:.6f}",
+                                           f"{self.bajo[i][j]:.6f}", f"{self.alto[i][j]:.6f}",
+                                           self.duelos[i][j]])
+
+    def guardar_npy(self, ruta: str):
+        """Arreglo (3, H, H) con tasa, límite inferior y superior (requiere NumPy)"""
+        import numpy as np
+        np.save(ruta, np.array([self.tasa, self.bajo, self.alto], dtype=np.float64))
+
+
+def calcular_matriz(roster: List[HeroStats], ancho: float = 0.05, lote: int = 500,
+                    max_duelos: int = 20000, trabajadores: Optional[int] = None,
+                    semilla: int = 0, num_rondas: Optional[int] = None,
+                    max_turnos: int = 10000,
+                    cache: Optional[Dict[str, ResultadoPar]] = None,
+                    ruta_cache: Optional[str] = None) -> MatrizEmparejamientos:
+    """Calcula la matriz H×H repartiendo los lotes de duelos entre procesos.
+
+    Cada lote usa una semilla derivada de (semilla, par, número de lote), así
+    que el resultado no depende del número de trabajadores ni del orden en
+    que terminen los lotes. Con ruta_cache la caché se guarda tras cada lote,
+    de modo que una ejecución interrumpida conserva los pares ya jugados.
+    """
+    cache = {} if cache is None else cache
+    n = len(roster)
+    pares: Dict[str, Tuple[int, int, bool]] = {}
+    for i in range(n):
+        for j in range(i + 1, n):
+            clave, invertido = clave_par(roster[i], roster[j], num_rondas, max_turnos)
+            pares.setdefault(clave, (i, j, invertido))
+            cache.setdefault(clave, ResultadoPar())
+
+    def convergido(clave: str) -> bool:
+        resultado = cache[clave]
+        bajo, alto = resultado.intervalo()
+        return resultado.duelos >= max_duelos or (resultado.duelos > 0 and alto - bajo <= ancho)
+
+    def enviar(pool, clave: str):
+        i, j, invertido = pares[clave]
+        a, b = (roster[j], roster[i]) if invertido else (roster[i], roster[j])
+        hechos = cache[clave].duelos
+        cantidad = min(lote, max_duelos - hechos)
+        semilla_lote = f"{semilla}:{clave}:{hechos}"
+        return pool.submit(_duelos, a, b, cantidad, semilla_lote, num_rondas, max_turnos)
+
+    simulados = 0
+    trabajadores = trabajadores or os.cpu_count() or 1
+    pendientes = [clave for clave in pares if not convergido(clave)]
+    if pendientes:
+        with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+            en_curso = {enviar(pool, clave): clave for clave in pendientes}
+            while en_curso:
+                hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in hechos:
+                    clave = en_curso.pop(futuro)
+                    victorias_a, victorias_b, empates = futuro.result()
+                    cache[clave].sumar(victorias_a, victorias_b, empates)
+                    simulados += victorias_a + victorias_b + empates
+                    if not convergido(clave):
+                        en_curso[enviar(pool, clave)] = clave
+                if ruta_cache:
+                    guardar_cache(ruta_cache, cache)
+
+    tasa = [[0.5] * n for _ in range(n)]
+    bajo = [[0.5] * n for _ in range(n)]
+    alto = [[0.5] * n for _ in range(n)]
+    duelos = [[0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            clave, invertido = clave_par(roster[i], roster[j], num_rondas, max_turnos)
+            resultado = cache[clave].invertido() if invertido else cache[clave]
+            tasa[i][j], tasa[j][i] = resultado.tasa_a, 1 - resultado.tasa_a
+            bajo[i][j], alto[i][j] = resultado.intervalo()
+            bajo[j][i], alto[j][i] = 1 - alto[i][j], 1 - bajo[i][j]
+            duelos[i][j] = duelos[j][i] = resultado.duelos
+
+    return MatrizEmparejamientos([stats.nombre for stats in roster], tasa, bajo, alto,
+                                 duelos, simulados)
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def imprimir_matriz(matriz: MatrizEmparejamientos):
+    """Muestra la matriz de tasas de victoria (fila contra columna)"""
+    ancho = max(11, max(len(nombre) for nombre in matriz.nombres))
+    print(" " * ancho + " | " + " | ".join(f"{nombre:>{ancho}}" for nombre in matriz.nombres))
+    for i, nombre in enumerate(matriz.nombres):
+        celdas = []
+        for j in range(len(matriz.nombres)):
+            celda = "—" if i == j else f"{matriz.tasa[i][j]:.1%}±{(matriz.alto[i][j] - matriz.bajo[i][j]) / 2:.1%}"
+            celdas.append(f"{celda:>{ancho}}")
+        print(f"{nombre:>{ancho}} | " + " | ".join(celdas))
+
+
+def main(argv: Optional[List[str]] = None):
+    """Función principal del generador de emparejamientos"""
+    parser = argparse.ArgumentParser(description="Matriz de emparejamientos del roster")
+    parser.add_argument("--roster", help="JSON con héroes adicionales a los predefinidos")
+    parser.add_argument("--solo-roster", action="store_true", help="no incluir los predefinidos")
+    parser.add_argument("--ancho", type=float, default=0.05, help="anchura objetivo del IC 95%%")
+    parser.add_argument("--lote", type=int, default=500, help="duelos por lote")
+    parser.add_argument("--max-duelos", type=int, default=20000, help="máximo de duelos por par")
+    parser.add_argument("--trabajadores", type=int, default=0, help="procesos (0 = todos los núcleos)")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla maestra")
+    parser.add_argument("--rondas", type=int, help="límite de rondas por duelo")
+    parser.add_argument("--max-turnos", type=int, default=10000, help="límite de turnos por duelo")
+    parser.add_argument("--cache", default="matchups_cache.json", help="caché de resultados por par")
+    parser.add_argument("--csv", help="guarda la matriz en CSV (formato largo)")
+    parser.add_argument("--npy", help="guarda la matriz en .npy (requiere NumPy)")
+    args = parser.parse_args(argv)
+
+    roster = [] if args.solo_roster else [HeroFactory.crear_heroe(nombre)
+                                          for nombre in HeroFactory.HEROES_PREDEF]
+    if args.roster:
+        roster.extend(cargar_roster(args.roster))
+    if len(roster) < 2:
+        parser.error("se necesitan al menos dos héroes")
+
+    cache = cargar_cache(args.cache)
+    matriz = calcular_matriz(roster, args.ancho, args.lote, args.max_duelos,
+                             args.trabajadores or None, args.semilla, args.rondas,
+                             args.max_turnos, cache, args.cache)
+    if args.cache:
+        guardar_cache(args.cache, cache)  # también si todo venía de caché
+
+    print(f"🆚 {len(roster)} héroes | {matriz.simulados} duelos simulados "
+          f"(el resto desde caché)")
+    imprimir_matriz(matriz)
+    if args.csv:
+        matriz.guardar_csv(args.csv)
+    if args.npy:
+        matriz.guardar_npy(args.npy)
+
+
+if __name__ == "__main__":
+    main()
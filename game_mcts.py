@@ -0,0 +1,272 @@
+"""
+🌲 BATALLA DE HÉROES - IA CON MONTE CARLO TREE SEARCH
+Política de decisión MCTS (UCT de lazo abierto) para el modo competitivo
+
+En cada turno del héroe se clona el motor y se repiten simulaciones hasta
+agotar el presupuesto de tiempo: se elige una jugada (acción + objetivo) con
+UCB1, el resto de héroes juega con su política por defecto y la simulación
+sigue hasta el final de la batalla o `profundidad` turnos. El árbol es de
+lazo abierto: sus nodos son secuencias de jugadas propias, no estados, porque
+el combate es estocástico. Cada simulación restaura el clon con
+MotorCombate.restore, sin volver a construirlo.
+
+Uso:
+    python -m game_mcts --batallas 50 --heroe Thor --presupuesto 0.02
+"""
+
+import argparse
+import math
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from game_core import (AccionCombate, HeroFactory, MotorCombate, NodoHeroe, PoliticaCombate,
+                       PoliticaUmbrales)
+
+
+Jugada = Tuple[str, Optional[str]]  # (acción, nombre del objetivo)
+
+
+# ============================================================================
+# ÁRBOL
+# ============================================================================
+
+class _Nodo:
+    """Nodo de lazo abierto: estadísticas de una secuencia de jugadas propias"""
+    __slots__ = ("visitas", "valor", "hijos")
+
+    def __init__(self):
+        self.visitas = 0
+        self.valor = 0.0
+        self.hijos: Dict[Jugada, '_Nodo'] = {}
+
+
+class _PoliticaForzada(PoliticaCombate):
+    """Juega la jugada indicada por la búsqueda o, si no hay, la política base"""
+
+    def __init__(self, base: PoliticaCombate):
+        self.base = base
+        self.jugada: Optional[Jugada] = None
+
+    def seleccionar_accion(self, motor: MotorCombate, heroe: NodoHeroe) -> AccionCombate:
+        if self.jugada is None:
+            return self.base.seleccionar_accion(motor, heroe)
+        return motor.acciones[self.jugada[0]]
+
+    def seleccionar_objetivo(self, motor: MotorCombate,
+                             heroe: NodoHeroe) -> Optional[NodoHeroe]:
+        if self.jugada is None or self.jugada[1] is None:
+            return self.base.seleccionar_objetivo(motor, heroe)
+        return motor.lista_heroes.buscar_heroe(self.jugada[1])
+
+
+def jugadas_legales(motor: MotorCombate, heroe: NodoHeroe) -> List[Jugada]:
+    """Acciones posibles del héroe con cada objetivo vivo"""
+    enemigos = [otro.nombre for otro in motor.heroes_vivos() if otro is not heroe]
+    jugadas: List[Jugada] = [("atacar", nombre) for nombre in enemigos]
+    if heroe.energia >= motor.acciones["habilidad"].costo_energia:
+        jugadas.extend(("habilidad", nombre) for nombre in enemigos)
+    jugadas.append(("curar", None))
+    jugadas.append(("pasar", None))
+    return jugadas
+
+
+# ============================================================================
+# POLÍTICA MCTS
+# ============================================================================
+
+class PoliticaMCTS(PoliticaCombate):
+    """Política que decide cada turno con búsqueda Monte Carlo (UCT).
+
+    presupuesto son los segundos por decisión; max_simulaciones la limita
+    además por número (útil para resultados reproducibles con semilla).
+    La recompensa de una simulación es 1 si el héroe gana, 0 si muere y, si
+    la batalla sigue abierta, su fracción de los PV vivos.
+    """
+
+    def __init__(self, presupuesto: float = 0.05, max_simulaciones: Optional[int] = None,
+                 profundidad: int = 60, exploracion: float = 1.4,
+                 base: Optional[PoliticaCombate] = None, semilla: Optional[int] = None):
+        self.presupuesto = presupuesto
+        self.max_simulaciones = max_simulaciones
+        self.profundidad = profundidad
+        self.exploracion = exploracion
+        self.base = base or PoliticaUmbrales()
+        self.rng = random.Random(semilla)
+
+        self._objetivo: Optional[str] = None
+
+        # Métricas acumuladas
+        self.decisiones = 0
+        self.simulaciones = 0
+        self.segundos = 0.0
+        self.latencias: List[float] = []
+
+    # --- Interfaz PoliticaCombate ---
+
+    def seleccionar_accion(self, motor: MotorCombate, heroe: NodoHeroe) -> AccionCombate:
+        inicio = time.perf_counter()
+        accion, self._objetivo = self.buscar(motor, heroe)
+        latencia = time.perf_counter() - inicio
+        self.decisiones += 1
+        self.segundos += latencia
+        self.latencias.append(latencia)
+        return motor.acciones[accion]
+
+    def seleccionar_objetivo(self, motor: MotorCombate,
+                             heroe: NodoHeroe) -> Optional[NodoHeroe]:
+        objetivo = motor.lista_heroes.buscar_heroe(self._objetivo) if self._objetivo else None
+        if objetivo is None or not objetivo.stats.esta_vivo():
+            return motor.objetivo_aleatorio(heroe)
+        return objetivo
+
+    # --- Búsqueda ---
+
+    def buscar(self, motor: MotorCombate, heroe: NodoHeroe) -> Jugada:
+        """Ejecuta la búsqueda y retorna la jugada más visitada"""
+        raiz_legales = jugadas_legales(motor, heroe)
+        if len(raiz_legales) == 1:
+            return raiz_legales[0]
+
+        simulador = motor.clonar(random.Random(self.rng.getrandbits(64)))
+        forzada = _PoliticaForzada(self.base)
+        simulador.asignar_politica(self.base)
+        simulador.asignar_politica(forzada, heroe.nombre)
+        estado = simulador.snapshot(incluir_rng=False)
+
+        raiz = _Nodo()
+        limite = time.perf_counter() + self.presupuesto
+        simulaciones = 0
+        while True:
+            self._simular(simulador, estado, forzada, heroe.nombre, raiz)
+            simulaciones += 1
+            if self.max_simulaciones is not None and simulaciones >= self.max_simulaciones:
+                break
+            if self.max_simulaciones is None and time.perf_counter() >= limite:
+                break
+        self.simulaciones += simulaciones
+
+        return max(raiz.hijos.items(), key=lambda item: item[1].visitas)[0]
+
+    def _elegir(self, nodo: _Nodo, legales: List[Jugada]) -> Tuple[Jugada, bool]:
+        """Jugada por UCB1 entre las legales. Retorna (jugada, es_nueva)"""
+        nuevas = [jugada for jugada in legales if jugada not in nodo.hijos]
+        if nuevas:
+            return self.rng.choice(nuevas), True
+
+        registro = math.log(nodo.visitas)
+        mejor, mejor_valor = legales[0], -1.0
+        for jugada in legales:
+            hijo = nodo.hijos[jugada]
+            valor = (hijo.valor / hijo.visitas
+                     + self.exploracion * math.sqrt(registro / hijo.visitas))
+            if valor > mejor_valor:
+                mejor, mejor_valor = jugada, valor
+        return mejor, False
+
+    def _simular(self, simulador: MotorCombate, estado: tuple, forzada: _PoliticaForzada,
+                 nombre: str, raiz: _Nodo):
+        """Una simulación: selección/expansión en el árbol, rollout y retropropagación"""
+        simulador.restore(estado)
+        propio = simulador.lista_heroes.buscar_heroe(nombre)
+        nodo = raiz
+        camino = [raiz]
+        en_arbol = True
+
+        for _ in range(self.profundidad):
+            if simulador.terminado or simulador.num_vivos <= 1:
+                break
+            actual = simulador.turnos.obtener_turno_actual()
+            forzada.jugada = None
+            if actual is propio and en_arbol:
+                jugada, es_nueva = self._elegir(nodo, jugadas_legales(simulador, propio))
+                if es_nueva:
+                    nodo.hijos[jugada] = _Nodo()
+                    en_arbol = False  # Una expansión por simulación
+                nodo = nodo.hijos[jugada]
+                camino.append(nodo)
+                forzada.jugada = jugada
+            simulador.ejecutar_turno()
+
+        recompensa = self._recompensa(simulador, propio)
+        for visitado in camino:
+            visitado.visitas += 1
+            visitado.valor += recompensa
+
+    @staticmethod
+    def _recompensa(simulador: MotorCombate, propio: NodoHeroe) -> float:
+        if not propio.stats.esta_vivo():
+            return 0.0
+        if simulador.terminado or simulador.num_vivos <= 1:
+            return 1.0 if simulador.obtener_ganador() is propio else 0.0
+        total = sum(heroe.pv for heroe in simulador.heroes_vivos())
+        return propio.pv / total if total else 0.0
+
+    # --- Métricas ---
+
+    def metricas(self) -> dict:
+        """Simulaciones por segundo y percentiles de latencia por decisión (ms)"""
+        latencias = sorted(self.latencias)
+
+        def percentil(p: float) -> float:
+            if not latencias:
+                return 0.0
+            return latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1e3
+
+        return {
+            "decisiones": self.decisiones,
+            "simulaciones": self.simulaciones,
+            "simulaciones_por_segundo": self.simulaciones / self.segundos if self.segundos else 0.0,
+            "p50_ms": percentil(0.50),
+            "p90_ms": percentil(0.90),
+            "p99_ms": percentil(0.99),
+            "max_ms": latencias[-1] * 1e3 if latencias else 0.0,
+        }
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def _tasa_victorias(heroe: str, batallas: int, semilla: int, num_rondas: Optional[int],
+                    politica: Optional[PoliticaCombate]) -> float:
+    """Fracción de batallas que gana `heroe` (con la política dada o la básica)"""
+    victorias = 0
+    for i in range(batallas):
+        motor = MotorCombate(HeroFactory.crear_lista_inicial(), num_rondas,
+                             random.Random(semilla + i))
+        if politica is not None:
+            motor.asignar_politica(politica, heroe)
+        while not motor.terminado and motor.num_vivos > 1:
+            motor.ejecutar_turno()
+        ganador = motor.obtener_ganador()
+        victorias += ganador is not None and ganador.nombre == heroe
+    return victorias / batallas
+
+
+def main(argv: Optional[List[str]] = None):
+    """Compara un héroe con MCTS frente a la IA básica"""
+    parser = argparse.ArgumentParser(description="IA de Monte Carlo Tree Search")
+    parser.add_argument("--batallas", type=int, default=50, help="batallas por configuración")
+    parser.add_argument("--heroe", default="Thor", help="héroe controlado por MCTS")
+    parser.add_argument("--presupuesto", type=float, default=0.02, help="segundos por decisión")
+    parser.add_argument("--profundidad", type=int, default=60, help="turnos máximos por simulación")
+    parser.add_argument("--rondas", type=int, help="límite de rondas (por defecto hasta que quede uno)")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla base de las batallas")
+    args = parser.parse_args(argv)
+
+    base = _tasa_victorias(args.heroe, args.batallas, args.semilla, args.rondas, None)
+    politica = PoliticaMCTS(args.presupuesto, profundidad=args.profundidad, semilla=args.semilla)
+    mcts = _tasa_victorias(args.heroe, args.batallas, args.semilla, args.rondas, politica)
+    metricas = politica.metricas()
+
+    print(f"🌲 {args.heroe}: {base:.1%} victorias con IA básica | {mcts:.1%} con MCTS "
+          f"({args.batallas} batallas)")
+    print(f"⏱️ {metricas['decisiones']} decisiones | {metricas['simulaciones']} simulaciones | "
+          f"{metricas['simulaciones_por_segundo']:,.0f} simulaciones/s")
+    print(f"📈 Latencia por decisión: p50 {metricas['p50_ms']:.1f} ms | p90 {metricas['p90_ms']:.1f} ms | "
+          f"p99 {metricas['p99_ms']:.1f} ms | máx {metricas['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+📨 BATALLA DE HÉROES - DESPACHO DE EVENTOS
+Entrega por lotes de los eventos de MotorCombate a observers lentos
+
+El despachador se registra como un observer más del motor: encola una copia
+de cada evento en una cola acotada y la entrega por lotes, ya sea desde un
+hilo en segundo plano (iniciar) o desde el bucle principal (drenar), que es
+lo que necesita pygame porque no admite dibujar desde otros hilos.
+
+Uso:
+    despachador = DespachadorEventos(capacidad=256, politica="coalescer")
+    despachador.agregar_observer(exportar_telemetria, lotes=True)
+    despachador.iniciar()
+    motor.agregar_observer(despachador)
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+
+POLITICAS = ("bloquear", "descartar", "coalescer")
+
+log = logging.getLogger(__name__)
+
+
+# ============================================================================
+# MÉTRICAS
+# ============================================================================
+
+@dataclass
+class LatenciaObserver:
+    """Contadores de latencia de un observer"""
+    llamadas: int = 0
+    eventos: int = 0
+    errores: int = 0
+    segundos_total: float = 0.0   # Tiempo dentro del callback
+    segundos_max: float = 0.0
+    espera_total: float = 0.0     # Tiempo en cola hasta la entrega
+    espera_max: float = 0.0
+
+    @property
+    def segundos_medios(self) -> float:
+        return self.segundos_total / self.llamadas if self.llamadas else 0.0
+
+    @property
+    def espera_media(self) -> float:
+        return self.espera_total / self.eventos if self.eventos else 0.0
+
+
+class _Suscripcion:
+    """Observer registrado en el despachador"""
+    __slots__ = ("callback", "lotes", "latencia")
+
+    def __init__(self, callback: Callable, lotes: bool):
+        self.callback = callback
+        self.lotes = lotes
+        self.latencia = LatenciaObserver()
+
+
+# ============================================================================
+# DESPACHADOR
+# ============================================================================
+
+class DespachadorEventos:
+    """Observer que desacopla a los consumidores lentos del bucle de combate.
+
+    Políticas cuando la cola está llena:
+      - bloquear: el motor espera a que haya hueco (o drena él mismo si no
+        hay hilo de entrega), no se pierde ningún evento.
+      - descartar: el evento nuevo se descarta.
+      - coalescer: el evento sustituye al último pendiente con la misma clave
+        (por defecto el tipo); si no hay ninguno se descarta el más antiguo.
+    """
+
+    def __init__(self, capacidad: int = 1024, politica: str = "bloquear",
+                 tamano_lote: int = 64, clave: Optional[Callable] = None):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política desconocida: {politica} (opciones: {', '.join(POLITICAS)})")
+        if capacidad < 1:
+            raise ValueError("La capacidad debe ser positiva")
+
+        self.capacidad = capacidad
+        self.politica = politica
+        self.tamano_lote = tamano_lote
+        self.clave = clave or (lambda evento: evento.get("tipo"))
+
+        self._cola: deque = deque()  # (instante de encolado, evento)
+        self._condicion = threading.Condition()
+        self._hilo: Optional[threading.Thread] = None
+        self._activo = False
+        self._suscripciones: List[_Suscripcion] = []
+
+        self.encolados = 0
+        self.descartados = 0
+        self.coalescidos = 0
+        self.bloqueos = 0
+
+    # --- Registro ---
+
+    def agregar_observer(self, callback: Callable, lotes: bool = False):
+        """Registra un consumidor (lotes=True: recibe una lista por entrega)"""
+        self._suscripciones.append(_Suscripcion(callback, lotes))
+
+    def latencias(self) -> List[Tuple[Callable, LatenciaObserver]]:
+        """Pares (callback, contadores) en orden de registro, uno por suscripción.
+
+        No se indexan por nombre: dos lambdas o dos métodos de instancias
+        distintas comparten __qualname__ y sus contadores se perderían.
+        """
+        return [(s.callback, s.latencia) for s in self._suscripciones]
+
+    def latencia(self, callback: Callable) -> LatenciaObserver:
+        """Contadores del observer registrado con ese callback"""
+        for suscripcion in self._suscripciones:
+            if suscripcion.callback is callback or suscripcion.callback == callback:
+                return suscripcion.latencia
+        raise KeyError(callback)
+
+    @property
+    def pendientes(self) -> int:
+        return len(self._cola)
+
+    # --- Productor (hilo del motor) ---
+
+    def __call__(self, evento):
+        """Encola una copia del evento (los eventos del pool se reciclan)"""
+        copia = evento.copiar() if hasattr(evento, "copiar") else dict(evento)
+        entrada = (time.perf_counter(), copia)
+
+        with self._condicion:
+            if len(self._cola) >= self.capacidad:
+                if self.politica == "descartar":
+                    self.descartados += 1
+                    return
+                if self.politica == "coalescer":
+                    self._coalescer(entrada)
+                    return
+                self.bloqueos += 1
+                if not self._activo:
+                    # Sin hilo de entrega nadie liberaría la cola: drenar aquí
+                    self._condicion.release()
+                    try:
+                        self.drenar()
+                    finally:
+                        self._condicion.acquire()
+                while len(self._cola) >= self.capacidad and self._activo:
+                    self._condicion.wait()
+
+            self._cola.append(entrada)
+            self.encolados += 1
+            if len(self._cola) >= self.tamano_lote:
+                self._condicion.notify_all()
+
+    def _coalescer(self, entrada: tuple):
+        """Sustituye el último evento pendiente con la misma clave"""
+        clave = self.clave(entrada[1])
+        for i in range(len(self._cola) - 1, -1, -1):
+            if self.clave(self._cola[i][1]) == clave:
+                # Se conserva el instante de encolado original para medir la espera
+                self._cola[i] = (self._cola[i][0], entrada[1])
+                self.coalescidos += 1
+                return
+        self._cola.popleft()
+        self._cola.append(entrada)
+        self.descartados += 1
+        self.encolados += 1
+
+    # --- Consumidor ---
+
+    def _extraer_lote(self) -> list:
+        """Saca hasta tamano_lote entradas (el llamador tiene el candado)"""
+        lote = []
+        while self._cola and len(lote) < self.tamano_lote:
+            lote.append(self._cola.popleft())
+        self._condicion.notify_all()
+        return lote
+
+    def _entregar(self, lote: list):
+        """Entrega un lote a cada observer midiendo espera y duración"""
+        eventos = [evento for _, evento in lote]
+        for suscripcion in self._suscripciones:
+            latencia = suscripcion.latencia
+            inicio = time.perf_counter()
+            for encolado, _ in lote:
+                espera = inicio - encolado
+                latencia.espera_total += espera
+                if espera > latencia.espera_max:
+                    latencia.espera_max = espera
+
+            try:
+                if suscripcion.lotes:
+                    suscripcion.callback(eventos)
+                else:
+                    for evento in eventos:
+                        suscripcion.callback(evento)
+            except Exception:
+                # Un observer roto no detiene a los demás, pero el error queda registrado
+                latencia.errores += 1
+                log.exception("Error en el observer %s",
+                              getattr(suscripcion.callback, "__qualname__", suscripcion.callback))
+
+            duracion = time.perf_counter() - inicio
+            latencia.llamadas += 1
+            latencia.eventos += len(eventos)
+            latencia.segundos_total += duracion
+            if duracion > latencia.segundos_max:
+                latencia.segundos_max = duracion
+
+    def drenar(self, max_lotes: Optional[int] = None) -> int:
+        """Entrega los eventos pendientes en el hilo actual. Retorna cuántos"""
+        entregados = 0
+        lotes = 0
+        while max_lotes is None or lotes < max_lotes:
+            with self._condicion:
+                lote = self._extraer_lote()
+            if not lote:
+                break
+            self._entregar(lote)
+            entregados += len(lote)
+            lotes += 1
+        return entregados
+
+    # --- Hilo en segundo plano ---
+
+    def iniciar(self, intervalo: float = 0.01):
+        """Arranca el hilo de entrega (lotes llenos o cada `intervalo` segundos)"""
+        if self._hilo is not None:
+            return
+        self._activo = True
+        self._hilo = threading.Thread(target=self._bucle, args=(intervalo,),
+                                      name="DespachadorEventos", daemon=True)
+        self._hilo.start()
+
+    def _bucle(self, intervalo: float):
+        while True:
+            with self._condicion:
+                if len(self._cola) < self.tamano_lote and self._activo:
+                    self._condicion.wait(intervalo)
+                if not self._cola and not self._activo:
+                    return
+                lote = self._extraer_lote()
+            if lote:
+                self._entregar(lote)
+
+    def detener(self):
+        """Detiene el hilo tras entregar todo lo pendiente"""
+        if self._hilo is None:
+            return
+        with self._condicion:
+            self._activo = False
+            self._condicion.notify_all()
+        self._hilo.join()
+        self._hilo = None
+        self.drenar()
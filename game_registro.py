@@ -0,0 +1,412 @@
+"""
+📼 BATALLA DE HÉROES - REGISTRO BINARIO DE BATALLAS
+Formato binario de solo anexado para auditar y reproducir millones de batallas
+
+Estructura del archivo:
+    cabecera   16 bytes   magia, versión y tamaño de registro
+    registros  32 bytes   uno por evento (tamaño fijo, direccionables por índice)
+    cadenas               tabla de nombres de héroes (u16 longitud + UTF-8)
+    índice     16 bytes   por batalla: id, primer registro, número de registros
+    pie        40 bytes   desplazamientos de las secciones anteriores
+
+El escritor vuelca los registros a disco a medida que avanzan las batallas y
+escribe cadenas, índice y pie al cerrar. El lector usa mmap y búsqueda
+binaria, así que saltar a una batalla o a un turno no recorre el archivo.
+Si el escritor no llegó a cerrarse, el lector reconstruye el índice a partir
+de los registros completos (los héroes aparecen como #n: la tabla de nombres
+se escribe al cerrar).
+
+Uso:
+    python -m game_sim --batallas 10000 --semilla 1 --registro batallas.bhr
+    python -m game_registro batallas.bhr
+    python -m game_registro batallas.bhr --batalla 42 --turno 10
+"""
+
+import argparse
+import bisect
+import mmap
+import struct
+from array import array
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from game_core import EventoCombate
+
+
+# ============================================================================
+# FORMATO
+# ============================================================================
+
+MAGIA = b"BHREG\x00"
+MAGIA_PIE = b"BHREGFIN"
+VERSION = 2
+
+CABECERA = struct.Struct("<6sHH6x")
+# batalla, turno, ronda, tipo, banderas, actor, objetivo, valor, extra
+# (turno y ronda cuentan los turnos y rondas ya completados al producirse el
+# evento; valor es el daño, la curación, la ronda cerrada o las rondas jugadas)
+REGISTRO = struct.Struct("<IIHBBIIiH6x")
+INDICE = struct.Struct("<IQI")
+# desplazamiento cadenas, desplazamiento índice, nº cadenas, nº registros, nº batallas
+PIE = struct.Struct("<QQIQI8s")
+
+SIN_HEROE = 0xFFFFFFFF  # actor/objetivo ausente (u32: un registro puede tener millones de nombres)
+
+TIPOS = ("", "ataque", "ataque_fallido", "habilidad", "habilidad_fallida",
+         "curacion", "pasar", "fin_ronda", "fin_batalla")
+CODIGO_TIPO = {tipo: codigo for codigo, tipo in enumerate(TIPOS)}
+
+# Códigos del campo extra: razón de una habilidad fallida o motivo del final
+RAZONES = ("", "energia_insuficiente", "sin_objetivo",
+           "ultimo_en_pie", "sin_heroes", "limite_rondas", "limite_turnos", "en_curso")
+CODIGO_RAZON = {razon: codigo for codigo, razon in enumerate(RAZONES)}
+
+CRITICO = 1
+ESQUIVADO = 2
+MURIO = 4
+
+
+class RegistroEvento(NamedTuple):
+    """Registro decodificado (los índices de héroe ya resueltos a nombres)"""
+    batalla: int
+    turno: int
+    ronda: int
+    tipo: str
+    banderas: int
+    actor: Optional[str]
+    objetivo: Optional[str]
+    valor: int
+    extra: str
+
+    def a_evento(self) -> EventoCombate:
+        """Reconstruye el EventoCombate con los mismos campos que emitió el motor"""
+        tipo = self.tipo
+        if tipo == "ataque" or tipo == "habilidad":
+            evento = EventoCombate(tipo, atacante=self.actor, objetivo=self.objetivo,
+                                   dano=self.valor, fue_esquivado=bool(self.banderas & ESQUIVADO),
+                                   objetivo_murio=bool(self.banderas & MURIO))
+            if tipo == "ataque":
+                evento.es_critico = bool(self.banderas & CRITICO)
+        elif tipo == "ataque_fallido":
+            evento = EventoCombate(tipo, atacante=self.actor)
+        elif tipo == "habilidad_fallida":
+            evento = EventoCombate(tipo, atacante=self.actor, razon=self.extra)
+        elif tipo == "curacion":
+            evento = EventoCombate(tipo, heroe=self.actor, cantidad=self.valor)
+        elif tipo == "pasar":
+            evento = EventoCombate(tipo, heroe=self.actor, curacion_pasiva=self.valor)
+        elif tipo == "fin_ronda":
+            evento = EventoCombate(tipo, ronda=self.valor)
+        else:
+            evento = EventoCombate("fin_juego", fin_juego=True, ganador=self.actor,
+                                   ronda=self.valor, razon=self.extra)
+        return evento
+
+
+# ============================================================================
+# ESCRITOR
+# ============================================================================
+
+class EscritorRegistro:
+    """Escribe eventos de combate en streaming.
+
+    Se usa como observer del motor (motor.agregar_observer(escritor)) o
+    llamando a registrar() con el resultado de cada ejecutar_turno(). En
+    ambos casos cada batalla se abre con iniciar_batalla() y se cierra con
+    finalizar_batalla(motor.resultado_final()).
+    """
+
+    def __init__(self, ruta: str, tamano_buffer: int = 1 << 16):
+        self.ruta = ruta
+        self._archivo = open(ruta, "wb")
+        self._archivo.write(CABECERA.pack(MAGIA, VERSION, REGISTRO.size))
+        self._buffer = bytearray()
+        self._tamano_buffer = tamano_buffer
+
+        self._nombres: Dict[str, int] = {}
+        self.num_registros = 0
+
+        # Índice de batallas en columnas compactas (millones de batallas)
+        self._ids = array("L")
+        self._inicios = array("Q")
+        self._cantidades = array("L")
+
+        self._batalla: Optional[int] = None
+        self._turno = 0
+        self._ronda = 0
+
+    def __enter__(self) -> 'EscritorRegistro':
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def _indice_nombre(self, nombre) -> int:
+        if nombre is None:
+            return SIN_HEROE
+        if not isinstance(nombre, str):
+            nombre = nombre.nombre  # ganador como NodoHeroe
+        indice = self._nombres.get(nombre)
+        if indice is None:
+            indice = len(self._nombres)
+            if indice >= SIN_HEROE:
+                raise OverflowError(f"{self.ruta}: demasiados nombres de héroe distintos ({indice})")
+            self._nombres[nombre] = indice
+        return indice
+
+    def _escribir(self, tipo: str, banderas: int, actor, objetivo, valor: int, extra: str = ""):
+        if self._batalla is None:
+            self.iniciar_batalla()
+        self._buffer += REGISTRO.pack(self._batalla, self._turno, self._ronda, CODIGO_TIPO[tipo],
+                                      banderas, self._indice_nombre(actor),
+                                      self._indice_nombre(objetivo), valor, CODIGO_RAZON[extra])
+        self.num_registros += 1
+        self._cantidades[-1] += 1
+        if len(self._buffer) >= self._tamano_buffer:
+            self._volcar()
+
+    def _volcar(self):
+        self._archivo.write(self._buffer)
+        self._buffer.clear()
+
+    # --- Batallas ---
+
+    def iniciar_batalla(self) -> int:
+        """Abre una batalla nueva. Retorna su id"""
+        self._batalla = len(self._ids)
+        self._ids.append(self._batalla)
+        self._inicios.append(self.num_registros)
+        self._cantidades.append(0)
+        self._turno = 0
+        self._ronda = 0
+        return self._batalla
+
+    def __call__(self, evento: EventoCombate):
+        """Observer: registra el evento notificado por el motor"""
+        self.registrar(evento)
+
+    def registrar(self, evento: EventoCombate):
+        """Registra una acción o un fin de ronda.
+
+        Acepta tanto los eventos notificados (fin_ronda llega aparte) como los
+        resultados de ejecutar_turno (fin_ronda viene marcado en la acción).
+        """
+        tipo = evento.tipo
+        if tipo == "fin_ronda":
+            self._escribir("fin_ronda", 0, None, None, evento.ronda)
+            self._ronda = evento.ronda
+            return
+        if tipo == "fin_juego":
+            return
+
+        if tipo == "ataque" or tipo == "habilidad":
+            banderas = ((CRITICO if evento.es_critico is True else 0)
+                        | (ESQUIVADO if evento.fue_esquivado else 0)
+                        | (MURIO if evento.objetivo_murio else 0))
+            self._escribir(tipo, banderas, evento.atacante, evento.objetivo, evento.dano)
+        elif tipo == "curacion":
+            self._escribir(tipo, 0, evento.heroe, None, evento.cantidad)
+        elif tipo == "pasar":
+            self._escribir(tipo, 0, evento.heroe, None, evento.curacion_pasiva)
+        elif tipo == "habilidad_fallida":
+            self._escribir(tipo, 0, evento.atacante, None, 0, evento.razon)
+        else:
+            self._escribir(tipo, 0, evento.atacante, None, 0)
+        self._turno += 1
+
+        fin_ronda = evento.get("fin_ronda")
+        if fin_ronda:
+            self._escribir("fin_ronda", 0, None, None, fin_ronda)
+            self._ronda = fin_ronda
+
+    def finalizar_batalla(self, resultado: dict):
+        """Cierra la batalla con el resultado final del motor"""
+        self._escribir("fin_batalla", 0, resultado["ganador"], None,
+                       resultado["rondas"], resultado["motivo"])
+        self._batalla = None
+
+    def cerrar(self):
+        """Vuelca lo pendiente y escribe tabla de cadenas, índice y pie"""
+        if self._archivo.closed:
+            return
+        self._volcar()
+
+        desplazamiento_cadenas = self._archivo.tell()
+        for nombre in self._nombres:  # orden de inserción = índice
+            datos = nombre.encode("utf-8")
+            self._archivo.write(struct.pack("<H", len(datos)) + datos)
+
+        desplazamiento_indice = self._archivo.tell()
+        for i in range(len(self._ids)):
+            self._buffer += INDICE.pack(self._ids[i], self._inicios[i], self._cantidades[i])
+            if len(self._buffer) >= self._tamano_buffer:
+                self._volcar()
+        self._volcar()
+
+        self._archivo.write(PIE.pack(desplazamiento_cadenas, desplazamiento_indice,
+                                     len(self._nombres), self.num_registros,
+                                     len(self._ids), MAGIA_PIE))
+        self._archivo.close()
+
+
+# ============================================================================
+# LECTOR
+# ============================================================================
+
+class _Columna:
+    """Secuencia perezosa sobre un campo de una tabla binaria (para bisect)"""
+
+    def __init__(self, datos, base: int, formato: struct.Struct, campo: int,
+                 inicio: int, fin: int):
+        self._datos = datos
+        self._base = base
+        self._formato = formato
+        self._campo = campo
+        self._inicio = inicio
+        self._fin = fin
+
+    def __len__(self) -> int:
+        return self._fin - self._inicio
+
+    def __getitem__(self, i: int):
+        desplazamiento = self._base + (self._inicio + i) * self._formato.size
+        return self._formato.unpack_from(self._datos, desplazamiento)[self._campo]
+
+
+class LectorRegistro:
+    """Acceso aleatorio a un registro binario mediante mmap"""
+
+    def __init__(self, ruta: str):
+        self._archivo = open(ruta, "rb")
+        self._datos = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magia, version, tamano = CABECERA.unpack_from(self._datos, 0)
+        if magia != MAGIA or version != VERSION or tamano != REGISTRO.size:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es un registro de batallas compatible")
+
+        pie = None
+        if len(self._datos) >= CABECERA.size + PIE.size:
+            pie = PIE.unpack_from(self._datos, len(self._datos) - PIE.size)
+        self.completo = pie is not None and pie[-1] == MAGIA_PIE
+        self.nombres: List[str] = []
+        if not self.completo:
+            self._reconstruir_indice()
+            return
+
+        (desplazamiento_cadenas, desplazamiento_indice, num_cadenas,
+         self.num_registros, self.num_batallas, _) = pie
+        self._indice, self._base_indice = self._datos, desplazamiento_indice
+
+        # La tabla de cadenas es pequeña (un nombre por héroe): se carga entera
+        posicion = desplazamiento_cadenas
+        for _ in range(num_cadenas):
+            (longitud,) = struct.unpack_from("<H", self._datos, posicion)
+            posicion += 2
+            self.nombres.append(bytes(self._datos[posicion:posicion + longitud]).decode("utf-8"))
+            posicion += longitud
+
+    def _reconstruir_indice(self):
+        """Índice de un archivo sin pie (el escritor no se cerró).
+
+        Los registros tienen tamaño fijo y las batallas son contiguas con ids
+        crecientes: cada límite de batalla se halla por búsqueda binaria.
+        """
+        self.num_registros = (len(self._datos) - CABECERA.size) // REGISTRO.size
+        ids = _Columna(self._datos, CABECERA.size, REGISTRO, 0, 0, self.num_registros)
+        indice = bytearray()
+        inicio = 0
+        while inicio < self.num_registros:
+            batalla = ids[inicio]
+            fin = bisect.bisect_right(ids, batalla, inicio)
+            indice += INDICE.pack(batalla, inicio, fin - inicio)
+            inicio = fin
+        self.num_batallas = len(indice) // INDICE.size
+        self._indice, self._base_indice = indice, 0
+
+    def __enter__(self) -> 'LectorRegistro':
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def __len__(self) -> int:
+        return self.num_registros
+
+    def cerrar(self):
+        self._datos.close()
+        self._archivo.close()
+
+    def _nombre(self, indice: int) -> Optional[str]:
+        if indice == SIN_HEROE:
+            return None
+        return self.nombres[indice] if indice < len(self.nombres) else f"#{indice}"
+
+    # --- Registros ---
+
+    def registro(self, posicion: int) -> RegistroEvento:
+        """Decodifica el registro en la posición dada (O(1))"""
+        if not 0 <= posicion < self.num_registros:
+            raise IndexError(posicion)
+        (batalla, turno, ronda, tipo, banderas, actor, objetivo, valor,
+         extra) = REGISTRO.unpack_from(self._datos, CABECERA.size + posicion * REGISTRO.size)
+        return RegistroEvento(batalla, turno, ronda, TIPOS[tipo], banderas, self._nombre(actor),
+                              self._nombre(objetivo), valor, RAZONES[extra])
+
+    def iterar(self, inicio: int = 0, fin: Optional[int] = None) -> Iterator[RegistroEvento]:
+        """Recorre los registros [inicio, fin)"""
+        fin = self.num_registros if fin is None else min(fin, self.num_registros)
+        for posicion in range(inicio, fin):
+            yield self.registro(posicion)
+
+    # --- Búsquedas ---
+
+    def rango_batalla(self, batalla: int) -> tuple[int, int]:
+        """Posiciones [inicio, fin) de los registros de una batalla (búsqueda binaria)"""
+        ids = _Columna(self._indice, self._base_indice, INDICE, 0, 0, self.num_batallas)
+        i = bisect.bisect_left(ids, batalla)
+        if i == self.num_batallas or ids[i] != batalla:
+            raise KeyError(f"Batalla {batalla} no registrada")
+        _, inicio, cantidad = INDICE.unpack_from(self._indice, self._base_indice + i * INDICE.size)
+        return inicio, inicio + cantidad
+
+    def batalla(self, batalla: int) -> List[RegistroEvento]:
+        """Todos los registros de una batalla"""
+        return list(self.iterar(*self.rango_batalla(batalla)))
+
+    def buscar_turno(self, batalla: int, turno: int) -> int:
+        """Posición del primer registro de la batalla con ese turno o posterior"""
+        inicio, fin = self.rango_batalla(batalla)
+        turnos = _Columna(self._datos, CABECERA.size, REGISTRO, 1, inicio, fin)
+        return inicio + bisect.bisect_left(turnos, turno)
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    """Muestra el resumen de un registro o los eventos de una batalla"""
+    parser = argparse.ArgumentParser(description="Lector de registros binarios de batallas")
+    parser.add_argument("ruta", help="archivo de registro")
+    parser.add_argument("--batalla", type=int, help="batalla a mostrar")
+    parser.add_argument("--turno", type=int, default=0, help="turno desde el que mostrar")
+    parser.add_argument("--limite", type=int, default=40, help="registros a mostrar")
+    args = parser.parse_args(argv)
+
+    with LectorRegistro(args.ruta) as lector:
+        print(f"📼 {args.ruta}: {lector.num_batallas} batallas | {lector.num_registros} registros | "
+              f"{len(lector.nombres)} héroes" + ("" if lector.completo else " | ⚠️ sin cerrar"))
+        if args.batalla is None:
+            return
+
+        try:
+            _, fin = lector.rango_batalla(args.batalla)
+        except KeyError:
+            parser.error(f"--batalla {args.batalla} no está en el registro")
+        inicio = lector.buscar_turno(args.batalla, args.turno)
+        for registro in lector.iterar(inicio, min(fin, inicio + args.limite)):
+            print(f"  T{registro.turno:>4} R{registro.ronda:>3} {registro.a_evento()!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+⏪ BATALLA DE HÉROES - REPETICIÓN DETERMINISTA
+Reconstruye cualquier turno de una batalla a partir de la semilla y del
+registro de acciones
+
+Una grabación guarda el roster inicial, la semilla del generador y la acción
+elegida en cada turno. Como el motor es determinista para una semilla dada,
+volver a ejecutarlo reproduce la batalla exacta; el registro de acciones
+sirve para detectar divergencias si el motor cambió desde la grabación.
+Cada `intervalo` turnos se guarda una instantánea del motor
+(MotorCombate.snapshot), así que saltar a un turno cuesta como mucho
+`intervalo` turnos re-ejecutados.
+
+Uso:
+    python -m game_replay --semilla 5 --turno 30
+    python -m game_replay --roster heroes.json --semilla 5 --turno 4000 --intervalo 256
+    python -m game_replay --cargar batalla.json --turno 120
+"""
+
+import argparse
+import bisect
+import json
+import random
+import time
+from dataclasses import asdict, dataclass, replace
+from typing import List, Optional
+
+from game_core import HeroFactory, HeroStats, ListaHeroes, MotorCombate
+from game_sim import cargar_roster
+
+
+# Acción elegida en cada turno, deducida del tipo de resultado
+ACCIONES = {
+    "ataque": "A", "ataque_fallido": "A",
+    "habilidad": "H", "habilidad_fallida": "H",
+    "curacion": "C",
+    "pasar": "P",
+}
+
+
+class ReplayDivergente(Exception):
+    """La re-ejecución no coincide con las acciones grabadas"""
+
+
+# ============================================================================
+# INSTANTÁNEAS
+# ============================================================================
+
+@dataclass
+class Instantanea:
+    """Estado del motor (MotorCombate.snapshot) tras `turno` turnos jugados"""
+    turno: int
+    estado: tuple
+
+
+def capturar(motor: MotorCombate) -> Instantanea:
+    """Copia el estado del motor en una instantánea"""
+    return Instantanea(motor.turnos_jugados, motor.snapshot())
+
+
+# ============================================================================
+# GRABACIÓN
+# ============================================================================
+
+class Replay:
+    """Grabación de una batalla con acceso a cualquier turno"""
+
+    def __init__(self, roster: List[HeroStats], semilla: int,
+                 num_rondas: Optional[int] = None, intervalo: int = 256):
+        self.roster = [replace(stats) for stats in roster]
+        self.semilla = semilla
+        self.num_rondas = num_rondas
+        self.intervalo = intervalo
+        self.acciones: List[str] = []
+        self.instantaneas: List[Instantanea] = []
+
+    @property
+    def num_turnos(self) -> int:
+        return len(self.acciones)
+
+    def motor_inicial(self) -> MotorCombate:
+        """Motor en el turno 0, con el generador sembrado"""
+        # Sin validar límites: el roster puede traer héroes ya mejorados
+        return MotorCombate(ListaHeroes.copia_de(self.roster), self.num_rondas,
+                            random.Random(self.semilla))
+
+    @classmethod
+    def grabar(cls, roster: List[HeroStats], semilla: int, num_rondas: Optional[int] = None,
+               max_turnos: int = 10000, intervalo: int = 256) -> 'Replay':
+        """Juega una batalla completa grabando acciones e instantáneas"""
+        replay = cls(roster, semilla, num_rondas, intervalo)
+        motor = replay.motor_inicial()
+        while not motor.terminado and motor.num_vivos and motor.turnos_jugados < max_turnos:
+            if motor.turnos_jugados % intervalo == 0:
+                replay.instantaneas.append(capturar(motor))
+            replay.acciones.append(ACCIONES[motor.ejecutar_turno().tipo])
+        return replay
+
+    def _reconstruir_instantaneas(self):
+        """Recalcula las instantáneas re-ejecutando la batalla una vez"""
+        self.instantaneas = [capturar(self.motor_inicial())]
+        motor = self.motor_inicial()
+        self._avanzar(motor, self.num_turnos, guardar=True)
+
+    def _avanzar(self, motor: MotorCombate, turno: int, guardar: bool = False):
+        """Re-ejecuta turnos hasta `turno` comprobando las acciones grabadas"""
+        while motor.turnos_jugados < turno:
+            if guardar and motor.turnos_jugados % self.intervalo == 0 and motor.turnos_jugados:
+                self.instantaneas.append(capturar(motor))
+            esperada = self.acciones[motor.turnos_jugados]
+            obtenida = ACCIONES.get(motor.ejecutar_turno().tipo)
+            if obtenida != esperada:
+                raise ReplayDivergente(
+                    f"Turno {motor.turnos_jugados - 1}: grabado {esperada}, obtenido {obtenida}")
+
+    def motor_en(self, turno: int) -> MotorCombate:
+        """Motor con el estado exacto tras `turno` turnos jugados.
+
+        Parte de la última instantánea anterior, por lo que re-ejecuta como
+        mucho `intervalo` turnos.
+        """
+        if not 0 <= turno <= self.num_turnos:
+            raise IndexError(f"Turno {turno} fuera de la grabación (0-{self.num_turnos})")
+        if not self.instantaneas:
+            self._reconstruir_instantaneas()
+        i = bisect.bisect_right(self.instantaneas, turno, key=lambda inst: inst.turno) - 1
+        motor = self.motor_inicial()
+        motor.restore(self.instantaneas[i].estado)
+        self._avanzar(motor, turno)
+        return motor
+
+    def verificar(self) -> bool:
+        """Re-ejecuta la batalla entera desde la semilla. Lanza ReplayDivergente"""
+        self._avanzar(self.motor_inicial(), self.num_turnos)
+        return True
+
+    # --- Persistencia (las instantáneas se recalculan al cargar) ---
+
+    def guardar(self, ruta: str):
+        datos = {
+            "semilla": self.semilla,
+            "num_rondas": self.num_rondas,
+            "intervalo": self.intervalo,
+            "roster": [asdict(stats) for stats in self.roster],
+            "acciones": "".join(self.acciones)
+        }
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(datos, archivo, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, ruta: str) -> 'Replay':
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        replay = cls([HeroStats(**stats) for stats in datos["roster"]], datos["semilla"],
+                     datos["num_rondas"], datos["intervalo"])
+        replay.acciones = list(datos["acciones"])
+        return replay
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    """Graba (o carga) una batalla y muestra el estado en un turno"""
+    parser = argparse.ArgumentParser(description="Repetición determinista de batallas")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de la batalla")
+    parser.add_argument("--roster", help="archivo JSON con el roster (por defecto los héroes iniciales)")
+    parser.add_argument("--rondas", type=int, help="límite de rondas (por defecto hasta que quede uno)")
+    parser.add_argument("--max-turnos", type=int, default=10000, help="límite de turnos")
+    parser.add_argument("--intervalo", type=int, default=256, help="turnos entre instantáneas")
+    parser.add_argument("--turno", type=int, default=0, help="turno a reconstruir")
+    parser.add_argument("--guardar", help="guarda la grabación en un archivo JSON")
+    parser.add_argument("--cargar", help="carga una grabación en lugar de jugar una nueva")
+    args = parser.parse_args(argv)
+
+    if args.cargar:
+        replay = Replay.cargar(args.cargar)
+    else:
+        if args.roster:
+            roster = cargar_roster(args.roster)
+        else:
+            roster = [nodo.stats for nodo in HeroFactory.crear_lista_inicial().iterar()]
+        replay = Replay.grabar(roster, args.semilla, args.rondas, args.max_turnos, args.intervalo)
+    if args.guardar:
+        replay.guardar(args.guardar)
+
+    turno = min(args.turno, replay.num_turnos)
+    inicio = time.perf_counter()
+    motor = replay.motor_en(turno)
+    segundos = time.perf_counter() - inicio
+
+    print(f"⏪ Batalla de {replay.num_turnos} turnos (semilla {replay.semilla}) | "
+          f"turno {turno} reconstruido en {segundos * 1e3:.2f} ms")
+    print(f"🔄 Ronda {motor.ronda_actual} | orden: "
+          f"{' → '.join(heroe.nombre for heroe in motor.turnos.iterar())}")
+    for heroe in motor.lista_heroes.iterar():
+        print(f"  • {heroe.nombre}: {heroe.pv}/{heroe.pv_max} PV | "
+              f"energía {heroe.energia}/{heroe.energia_max}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,10 +4,12 @@ Pantallas del juego usando State Pattern
 """
 
 import pygame
+import time
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 from ui_components import *
 from game_core import *
+from game_observadores import DespachadorEventos
 
 if TYPE_CHECKING:
     from game_main import GameApp
@@ -24,6 +26,11 @@ class GameState(ABC):
         self.app = app
         self.theme = Theme()
         self.components: list[Component] = []
+        
+        # Repintado incremental: áreas marcadas por el estado (además de los
+        # componentes sucios) o la pantalla completa
+        self._full_repaint = True
+        self._dirty_areas: list[pygame.Rect] = []
     
     @abstractmethod
     def handle_events(self, events: list):
@@ -40,6 +47,43 @@ class GameState(ABC):
         """Renderiza la pantalla"""
         pass
     
+    def is_animating(self) -> bool:
+        """True si el estado cambia sin entrada del usuario (el bucle no debe dormir)"""
+        return any(component.is_animating() for component in self.components)
+    
+    def mark_dirty(self, area: Optional[pygame.Rect] = None):
+        """Marca un área para repintar (None = pantalla completa)"""
+        if area is None:
+            self._full_repaint = True
+        else:
+            self._dirty_areas.append(pygame.Rect(area))
+    
+    def render_dirty(self, surface: pygame.Surface) -> list[pygame.Rect]:
+        """Repinta solo lo que cambió. Retorna los rects a enviar a la pantalla.
+        
+        Cada área sucia se repinta con render() recortado a ella, así que los
+        estados no necesitan saber qué hay debajo de cada componente. Un frame
+        sin cambios no dibuja nada y retorna una lista vacía.
+        """
+        if self._full_repaint:
+            self.render(surface)
+            areas = [surface.get_rect()]
+        else:
+            areas = self._dirty_areas + [component.dirty_area()
+                                         for component in self.components if component.is_dirty()]
+            if len(areas) > 4:
+                areas = [areas[0].unionall(areas[1:])]
+            for area in areas:
+                surface.set_clip(area)
+                self.render(surface)
+            surface.set_clip(None)
+        
+        self._full_repaint = False
+        self._dirty_areas = []
+        for component in self.components:
+            component.clean()
+        return areas
+    
     def enter(self):
         """Llamado al entrar al estado"""
         pass
@@ -59,6 +103,7 @@ class GameState(ABC):
         scale_y = height / 768
         for component in self.components:
             component.set_scale(scale_x, scale_y)
+        self.mark_dirty()
 
 
 # ============================================================================
@@ -165,7 +210,16 @@ class MenuState(GameState):
 # ============================================================================
 
 class BattleState(GameState):
-    """Pantalla de batalla"""
+    """Pantalla de batalla.
+    
+    La simulación avanza con un reloj de paso fijo independiente de los FPS:
+    cada `turn_interval` segundos simulados se juega un turno, y la velocidad
+    multiplica el tiempo simulado. A velocidad máxima se juegan turnos hasta
+    agotar `max_speed_budget` segundos por frame, sin pasar por los
+    observers, y la UI se redibuja una vez desde el estado del motor.
+    """
+    
+    SPEEDS = (1, 10, None)  # None = máxima
     
     def __init__(self, app: 'GameApp', num_rondas: int = 5, 
                  lista_heroes: Optional[ListaHeroes] = None):
@@ -176,12 +230,22 @@ class BattleState(GameState):
             lista_heroes = HeroFactory.crear_lista_inicial()
         
         self.motor = MotorCombate(lista_heroes, num_rondas)
-        self.motor.agregar_observer(self._on_combat_event)
+        
+        # Los eventos se encolan y se entregan por lotes una vez por frame
+        # (pygame solo puede tocar la UI desde el hilo principal)
+        self.despachador = DespachadorEventos(capacidad=256, politica="bloquear")
+        self.despachador.agregar_observer(self._on_combat_events, lotes=True)
+        self.motor.agregar_observer(self.despachador)
         
         # Estado de la batalla
         self.auto_play = True
-        self.auto_timer = 0
-        self.auto_delay = 90  # frames entre turnos
+        self.turn_interval = 1.5  # segundos simulados entre turnos
+        self.max_speed_budget = 0.008  # segundos de simulación por frame a velocidad máxima
+        self.fast_forward_chunk = 16  # turnos por tramo silencioso a velocidad máxima
+        self.speed = 1
+        self._sim_time = 0.0  # tiempo simulado acumulado aún sin jugar
+        self._last_update = time.perf_counter()
+        self._cards_stale = False
         self.paused = False
         self.game_over = False
         self.ganador = None
@@ -238,17 +302,42 @@ class BattleState(GameState):
             lambda: self.app.change_state('menu')
         )
         
+        self.btn_speed = Button(
+            540, base_height - 80, 150, 60,
+            "⏩ 1×",
+            self.theme.SECONDARY,
+            self._cycle_speed
+        )
+        
         self.components = [
             self.log_panel,
             self.stats_panel,
             self.btn_next,
             self.btn_pause,
-            self.btn_menu
+            self.btn_menu,
+            self.btn_speed
         ] + self.hero_cards
         
         # Aplicar escala inicial
         self.on_resize(self.app.width, self.app.height)
     
+    def _on_combat_events(self, eventos: list):
+        """Procesa un lote de eventos y refresca las tarjetas una sola vez"""
+        for evento in eventos:
+            self._on_combat_event(evento)
+        
+        # Limitar log
+        if len(self.battle_log) > self.max_log_entries:
+            self.battle_log = self.battle_log[-self.max_log_entries:]
+        
+        # Las tarjetas se actualizan una vez por frame, tras el último lote
+        self._cards_stale = True
+        
+        # Log, estadísticas y título se dibujan en render(): repintar sus áreas
+        self.log_panel.mark_dirty()
+        self.stats_panel.mark_dirty()
+        self.mark_dirty(pygame.Rect(0, 0, self.app.width, int(80 * self.app.scale_y)))
+    
     def _on_combat_event(self, evento: dict):
         """Observador de eventos de combate con eventos mejorados"""
         tipo = evento.get("tipo")
@@ -302,13 +391,6 @@ class BattleState(GameState):
         
         elif tipo == "fin_ronda":
             self.battle_log.append(f"═══ FIN RONDA {evento['ronda']} ═══")
-        
-        # Limitar log
-        if len(self.battle_log) > self.max_log_entries:
-            self.battle_log = self.battle_log[-self.max_log_entries:]
-        
-        # Actualizar tarjetas
-        self._actualizar_hero_cards()
     
     def _actualizar_hero_cards(self):
         """Actualiza las tarjetas de héroes con todas las stats"""
@@ -335,10 +417,49 @@ class BattleState(GameState):
             self.game_over = True
             self.ganador = resultado.get("ganador")
     
+    def _fast_forward(self, deadline: float):
+        """Avanza sin observers hasta `deadline` y refleja solo el estado final"""
+        inicio = self.motor.turnos_jugados
+        while time.perf_counter() < deadline:
+            resultado = self.motor.simular_hasta_fin(max_turnos=self.motor.turnos_jugados + self.fast_forward_chunk)
+            if resultado["motivo"] != "limite_turnos":
+                self.game_over = True
+                self.ganador = resultado["ganador"]
+                break
+        
+        jugados = self.motor.turnos_jugados - inicio
+        if not jugados:
+            return
+        
+        # Una sola línea de log por frame en lugar de un evento por turno
+        self.battle_log.append(f"⏩ {jugados} turnos simulados")
+        if len(self.battle_log) > self.max_log_entries:
+            self.battle_log = self.battle_log[-self.max_log_entries:]
+        self._cards_stale = True
+        self.log_panel.mark_dirty()
+        self.stats_panel.mark_dirty()
+        self.mark_dirty(pygame.Rect(0, 0, self.app.width, int(80 * self.app.scale_y)))
+    
+    def is_animating(self) -> bool:
+        if self.auto_play and not self.paused and not self.game_over:
+            return True
+        return super().is_animating()
+    
+    def set_speed(self, speed: Optional[int]):
+        """Cambia la velocidad de simulación (1, 10 o None = máxima)"""
+        self.speed = speed
+        self._sim_time = 0.0
+        self.btn_speed.set_text(f"⏩ {speed}×" if speed else "⏩ Máx")
+    
+    def _cycle_speed(self):
+        """Pasa a la siguiente velocidad"""
+        i = self.SPEEDS.index(self.speed)
+        self.set_speed(self.SPEEDS[(i + 1) % len(self.SPEEDS)])
+    
     def _toggle_pause(self):
         """Alterna pausa"""
         self.paused = not self.paused
-        self.btn_pause.text = "▶ Reanudar" if self.paused else "⏸️ Pausa"
+        self.btn_pause.set_text("▶ Reanudar" if self.paused else "⏸️ Pausa")
     
     def handle_events(self, events: list):
         mouse_pos = pygame.mouse.get_pos()
@@ -352,21 +473,40 @@ class BattleState(GameState):
                     self.app.change_state('menu')
                 elif event.key == pygame.K_SPACE:
                     self._toggle_pause()
+                elif event.key in (pygame.K_1, pygame.K_2, pygame.K_3):
+                    self.set_speed(self.SPEEDS[event.key - pygame.K_1])
     
     def update(self):
+        now = time.perf_counter()
+        # Limitar el paso tras una pausa o un frame lento (evita ráfagas de turnos)
+        dt = min(now - self._last_update, 0.25)
+        self._last_update = now
+        
         # Auto-avance si no está pausado
         if self.auto_play and not self.paused and not self.game_over:
-            self.auto_timer += 1
-            if self.auto_timer >= self.auto_delay:
-                self._next_turn()
-                self.auto_timer = 0
+            if self.speed is None:
+                self._fast_forward(now + self.max_speed_budget)
+            else:
+                self._sim_time += dt * self.speed
+                while self._sim_time >= self.turn_interval and not self.game_over:
+                    self._next_turn()
+                    self._sim_time -= self.turn_interval
+        
+        self.despachador.drenar()
+        if self._cards_stale:
+            self._actualizar_hero_cards()
+            self._cards_stale = False
     
     def render(self, surface: pygame.Surface):
         surface.fill(self.theme.BG)
         
         # Título con ronda
-        title_text = f"RONDA {self.motor.ronda_actual + 1}/{self.motor.num_rondas}"
-        title_surf = self.theme.FONT_M.render(title_text, True, self.theme.PRIMARY_LIGHT)
+        if self.motor.num_rondas is None:  # Sin límite de rondas
+            title_text = f"RONDA {self.motor.ronda_actual + 1}"
+        else:
+            ronda = min(self.motor.ronda_actual + 1, self.motor.num_rondas)
+            title_text = f"RONDA {ronda}/{self.motor.num_rondas}"
+        title_surf = self.theme.render_text(self.theme.FONT_M, title_text, self.theme.PRIMARY_LIGHT)
         title_rect = title_surf.get_rect(center=(self.app.width // 2, 40))
         surface.blit(title_surf, title_rect)
         
@@ -377,7 +517,7 @@ class BattleState(GameState):
         # Log de batalla
         log_y = 140
         for i, log_entry in enumerate(self.battle_log):
-            log_surf = self.theme.FONT_XS.render(log_entry, True, self.theme.TEXT_DIM)
+            log_surf = self.theme.render_text(self.theme.FONT_XS, log_entry, self.theme.TEXT_DIM)
             surface.blit(log_surf, (720, log_y + i * 30))
         
         # Estadísticas mejoradas
@@ -390,7 +530,7 @@ class BattleState(GameState):
         ]
         
         for i, stat in enumerate(stats):
-            stat_surf = self.theme.FONT_XS.render(stat, True, self.theme.TEXT_DIM)
+            stat_surf = self.theme.render_text(self.theme.FONT_XS, stat, self.theme.TEXT_DIM)
             surface.blit(stat_surf, (720, stats_y + i * 30))
 
 
@@ -437,8 +577,8 @@ class ResultsState(GameState):
         surface.fill(self.theme.BG)
         
         # Título
-        title_surf = self.theme.FONT_XL.render("🏆 ¡BATALLA FINALIZADA! 🏆", 
-                                              True, self.theme.PRIMARY_LIGHT)
+        title_surf = self.theme.render_text(self.theme.FONT_XL, "🏆 ¡BATALLA FINALIZADA! 🏆",
+                                            self.theme.PRIMARY_LIGHT)
         title_rect = title_surf.get_rect(center=(self.app.width // 2, 80))
         surface.blit(title_surf, title_rect)
         
@@ -449,23 +589,23 @@ class ResultsState(GameState):
             pygame.draw.rect(surface, self.theme.SUCCESS, panel_rect, width=4, border_radius=20)
             
             # Nombre del ganador
-            winner_title = self.theme.FONT_L.render("👑 GANADOR 👑", True, self.theme.SUCCESS)
+            winner_title = self.theme.render_text(self.theme.FONT_L, "👑 GANADOR 👑", self.theme.SUCCESS)
             winner_rect = winner_title.get_rect(center=(self.app.width // 2, 240))
             surface.blit(winner_title, winner_rect)
             
-            winner_name = self.theme.FONT_M.render(self.ganador.nombre, True, self.theme.TEXT)
+            winner_name = self.theme.render_text(self.theme.FONT_M, self.ganador.nombre, self.theme.TEXT)
             name_rect = winner_name.get_rect(center=(self.app.width // 2, 290))
             surface.blit(winner_name, name_rect)
             
             # Stats del ganador
             stats_text = f"❤️ PV: {self.ganador.pv}/{self.ganador.pv_max}  |  ⚔️ Ataque: {self.ganador.ataque}  |  🏅 Nivel: {self.ganador.nivel}"
-            stats_surf = self.theme.FONT_S.render(stats_text, True, self.theme.TEXT_DIM)
+            stats_surf = self.theme.render_text(self.theme.FONT_S, stats_text, self.theme.TEXT_DIM)
             stats_rect = stats_surf.get_rect(center=(self.app.width // 2, 340))
             surface.blit(stats_surf, stats_rect)
         
         # Estadísticas finales mejoradas
         stats_y = 420
-        stats_title = self.theme.FONT_L.render("📊 Estadísticas Finales", True, self.theme.PRIMARY_LIGHT)
+        stats_title = self.theme.render_text(self.theme.FONT_L, "📊 Estadísticas Finales", self.theme.PRIMARY_LIGHT)
         stats_title_rect = stats_title.get_rect(center=(self.app.width // 2, stats_y))
         surface.blit(stats_title, stats_title_rect)
         
@@ -477,7 +617,7 @@ class ResultsState(GameState):
         ]
         
         for i, stat in enumerate(stats_list):
-            stat_surf = self.theme.FONT_S.render(stat, True, self.theme.TEXT_DIM)
+            stat_surf = self.theme.render_text(self.theme.FONT_S, stat, self.theme.TEXT_DIM)
             stat_rect = stat_surf.get_rect(center=(self.app.width // 2, stats_y + 60 + i * 40))
             surface.blit(stat_surf, stat_rect)
         
@@ -553,6 +693,7 @@ class TestState(GameState):
         
         if self.lista_heroes.agregar_heroe(nombre, nivel, pv, ataque):
             self.message_box.show_message(f"✅ {nombre} agregado!", "success")
+            self.mark_dirty()  # La lista de héroes se dibuja en render()
             self.input_nombre.clear()
             self.input_nivel.clear()
             self.input_pv.clear()
@@ -564,6 +705,7 @@ class TestState(GameState):
         nombre = self.input_nombre.get_text()
         if self.lista_heroes.eliminar_heroe(nombre):
             self.message_box.show_message(f"✅ {nombre} eliminado!", "success")
+            self.mark_dirty()  # La lista de héroes se dibuja en render()
         else:
             self.message_box.show_message(f"❌ {nombre} no encontrado", "error")
     
@@ -580,6 +722,7 @@ class TestState(GameState):
         nombre = self.input_nombre.get_text()
         if self.lista_heroes.mejorar_heroe(nombre):
             self.message_box.show_message(f"✅ {nombre} mejorado!", "success")
+            self.mark_dirty()  # La lista de héroes se dibuja en render()
         else:
             self.message_box.show_message(f"❌ {nombre} no encontrado", "error")
     
@@ -601,7 +744,7 @@ class TestState(GameState):
         surface.fill(self.theme.BG)
         
         # Título
-        title_surf = self.theme.FONT_L.render("🧪 Modo Prueba", True, self.theme.PRIMARY_LIGHT)
+        title_surf = self.theme.render_text(self.theme.FONT_L, "🧪 Modo Prueba", self.theme.PRIMARY_LIGHT)
         title_rect = title_surf.get_rect(center=(self.app.width // 2, 40))
         surface.blit(title_surf, title_rect)
         
@@ -610,14 +753,14 @@ class TestState(GameState):
         for i, heroe in enumerate(self.lista_heroes.iterar()):
             estado = "✅" if heroe.pv > 0 else "💀"
             text = f"{i+1}. {estado} {heroe.nombre} [Nv.{heroe.nivel}] | PV: {heroe.pv}/{heroe.pv_max} | Atq: {heroe.ataque}"
-            text_surf = self.theme.FONT_XS.render(text, True, self.theme.TEXT_DIM)
+            text_surf = self.theme.render_text(self.theme.FONT_XS, text, self.theme.TEXT_DIM)
             surface.blit(text_surf, (50, list_y + i * 35))
         
         # Labels de campos
         labels = ["Nombre:", "Nivel:", "PV:", "Ataque:"]
         for i, label in enumerate(labels):
             x = 50 + i * 220 if i < 2 else 50 + (i-2) * 180
-            label_surf = self.theme.FONT_XS.render(label, True, self.theme.TEXT)
+            label_surf = self.theme.render_text(self.theme.FONT_XS, label, self.theme.TEXT)
             surface.blit(label_surf, (x, 395))
         
         # Componentes
@@ -0,0 +1,271 @@
+"""
+🧮 BATALLA DE HÉROES - SIMULADOR HEADLESS
+Ejecuta batallas completas de MotorCombate sin interfaz gráfica (sin pygame)
+
+Uso:
+    python -m game_sim --batallas 1000
+    python -m game_sim --batallas 500 --roster heroes.json
+    python -m game_sim --batallas 1000000 --trabajadores 8 --semilla 42
+    python -m game_sim --batallas 10000 --semilla 1 --registro batallas.bhr
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from collections import Counter
+from dataclasses import dataclass, field, replace
+from typing import Callable, List, Optional
+
+from game_core import HeroFactory, HeroStats, ListaHeroes, MotorCombate
+from game_registro import EscritorRegistro
+
+
+# ============================================================================
+# ROSTERS
+# ============================================================================
+
+def cargar_roster(ruta: str) -> List[HeroStats]:
+    """Carga un roster desde un archivo JSON.
+
+    El archivo contiene una lista cuyos elementos son nombres de héroes
+    predefinidos ("Thor") u objetos con nombre, nivel, pv, ataque y,
+    opcionalmente, defensa, critico y esquiva.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        return roster_desde_datos(json.load(archivo))
+
+
+def roster_desde_datos(datos: list) -> List[HeroStats]:
+    """Construye un roster a partir de la lista ya decodificada (ver cargar_roster)"""
+    roster = []
+    for entrada in datos:
+        if isinstance(entrada, str):
+            stats = HeroFactory.crear_heroe(entrada)
+            if stats is None:
+                raise ValueError(f"Héroe predefinido desconocido: {entrada}")
+        else:
+            stats = HeroStats(
+                nombre=entrada["nombre"],
+                nivel=entrada["nivel"],
+                pv=entrada["pv"],
+                pv_max=entrada["pv"],
+                ataque=entrada["ataque"],
+                defensa=entrada.get("defensa", 5),
+                critico=entrada.get("critico", 0.15),
+                esquiva=entrada.get("esquiva", 0.10)
+            )
+        roster.append(stats)
+    return roster
+
+
+def crear_lista(roster: List[HeroStats]) -> ListaHeroes:
+    """Crea una ListaHeroes nueva con copias de las estadísticas del roster"""
+    lista = ListaHeroes()
+    for stats in roster:
+        if not lista.agregar_stats(replace(stats)):
+            raise ValueError(f"Estadísticas inválidas para {stats.nombre}")
+    return lista
+
+
+# ============================================================================
+# SIMULACIÓN
+# ============================================================================
+
+@dataclass
+class ResultadoLote:
+    """Resumen de un lote de batallas simuladas"""
+    batallas: int = 0
+    turnos: int = 0
+    empates: int = 0
+    segundos: float = 0.0
+    victorias: Counter = field(default_factory=Counter)
+    estadisticas: Counter = field(default_factory=Counter)
+
+    @property
+    def batallas_por_segundo(self) -> float:
+        return self.batallas / self.segundos if self.segundos else 0.0
+
+    @property
+    def turnos_por_segundo(self) -> float:
+        return self.turnos / self.segundos if self.segundos else 0.0
+
+    def combinar(self, otro: 'ResultadoLote'):
+        """Acumula los contadores de otro lote (el tiempo lo fija quien combina)"""
+        self.batallas += otro.batallas
+        self.turnos += otro.turnos
+        self.empates += otro.empates
+        self.victorias.update(otro.victorias)
+        self.estadisticas.update(otro.estadisticas)
+
+
+def _simular_registrando(motor: MotorCombate, max_turnos: int,
+                         registro: EscritorRegistro) -> dict:
+    """Como simular_hasta_fin, pero escribiendo cada turno en el registro"""
+    registro.iniciar_batalla()
+    motivo = None
+    while not motor.terminado and motor.num_vivos:
+        if motor.turnos_jugados >= max_turnos:
+            motivo = "limite_turnos"
+            break
+        registro.registrar(motor.ejecutar_turno())
+    resultado = motor.resultado_final(motivo)
+    registro.finalizar_batalla(resultado)
+    return resultado
+
+
+def simular_batalla(motor: MotorCombate, max_turnos: int = 10000,
+                    registro: Optional[EscritorRegistro] = None) -> tuple[Optional[str], int]:
+    """Ejecuta una batalla hasta el final. Retorna (ganador, turnos jugados)"""
+    if registro is not None:
+        resultado = _simular_registrando(motor, max_turnos, registro)
+    else:
+        resultado = motor.simular_hasta_fin(max_turnos=max_turnos)
+    ganador = resultado["ganador"]
+    if resultado["motivo"] == "limite_turnos" or ganador is None:
+        return (None, resultado["turnos"])
+    return (ganador.nombre, resultado["turnos"])
+
+
+def ejecutar_lote(num_batallas: int,
+                  fabrica_lista: Callable[[], ListaHeroes] = HeroFactory.crear_lista_inicial,
+                  max_turnos: int = 10000,
+                  rng: Optional[random.Random] = None,
+                  num_rondas: Optional[int] = None,
+                  registro: Optional[EscritorRegistro] = None) -> ResultadoLote:
+    """Ejecuta num_batallas batallas completas tan rápido como permita la CPU.
+
+    num_rondas limita la duración de cada batalla (None = hasta que quede uno).
+    Si se indica un registro, cada evento se escribe en él.
+    """
+    resultado = ResultadoLote()
+    inicio = time.perf_counter()
+
+    for _ in range(num_batallas):
+        motor = MotorCombate(fabrica_lista(), num_rondas, rng=rng, pool_eventos=4)
+        ganador, turnos = simular_batalla(motor, max_turnos, registro)
+
+        resultado.batallas += 1
+        resultado.turnos += turnos
+        if ganador is None:
+            resultado.empates += 1
+        else:
+            resultado.victorias[ganador] += 1
+        resultado.estadisticas.update(motor.estadisticas)
+
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+
+# ============================================================================
+# MONTE CARLO MULTIPROCESO
+# ============================================================================
+
+def derivar_semillas(semilla_maestra: int, cantidad: int) -> List[int]:
+    """Deriva una semilla independiente por trabajador a partir de la maestra"""
+    generador = random.Random(semilla_maestra)
+    return [generador.getrandbits(64) for _ in range(cantidad)]
+
+
+def _lote_trabajador(num_batallas: int, semilla: int, roster: Optional[List[HeroStats]],
+                     max_turnos: int, num_rondas: Optional[int]) -> ResultadoLote:
+    """Ejecuta un lote en un proceso hijo con su propio flujo aleatorio"""
+    if roster:
+        fabrica = lambda: crear_lista(roster)
+    else:
+        fabrica = HeroFactory.crear_lista_inicial
+    return ejecutar_lote(num_batallas, fabrica, max_turnos, random.Random(semilla), num_rondas)
+
+
+def ejecutar_paralelo(num_batallas: int, trabajadores: Optional[int] = None,
+                      semilla: int = 0, roster: Optional[List[HeroStats]] = None,
+                      max_turnos: int = 10000,
+                      num_rondas: Optional[int] = None) -> ResultadoLote:
+    """Reparte las batallas entre procesos y combina sus resultados.
+
+    Cada trabajador recibe un número fijo de batallas y un generador propio
+    derivado de la semilla maestra, por lo que la misma semilla con el mismo
+    número de trabajadores produce exactamente los mismos resultados.
+    """
+    trabajadores = trabajadores or os.cpu_count() or 1
+    trabajadores = max(1, min(trabajadores, num_batallas))
+    semillas = derivar_semillas(semilla, trabajadores)
+    reparto = [num_batallas // trabajadores + (1 if i < num_batallas % trabajadores else 0)
+               for i in range(trabajadores)]
+
+    resultado = ResultadoLote()
+    inicio = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=trabajadores) as pool:
+        lotes = pool.map(_lote_trabajador, reparto, semillas, [roster] * trabajadores,
+                         [max_turnos] * trabajadores, [num_rondas] * trabajadores)
+        for lote in lotes:
+            resultado.combinar(lote)
+
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+
+def imprimir_resultado(resultado: ResultadoLote):
+    """Muestra un resumen legible del lote"""
+    print(f"🧮 Batallas: {resultado.batallas} | Turnos: {resultado.turnos} | "
+          f"Empates: {resultado.empates}")
+    print(f"⏱️ {resultado.segundos:.3f} s | {resultado.batallas_por_segundo:,.1f} batallas/s | "
+          f"{resultado.turnos_por_segundo:,.1f} turnos/s")
+    print("🏆 Victorias:")
+    for nombre, victorias in resultado.victorias.most_common():
+        print(f"  • {nombre}: {victorias} ({victorias / resultado.batallas:.1%})")
+    print("📊 Estadísticas acumuladas:")
+    for clave, valor in sorted(resultado.estadisticas.items()):
+        print(f"  • {clave}: {valor}")
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    """Función principal del simulador"""
+    parser = argparse.ArgumentParser(description="Simulador headless de Batalla de Héroes")
+    parser.add_argument("--batallas", type=int, default=1000, help="número de batallas")
+    parser.add_argument("--roster", help="archivo JSON con el roster (por defecto los héroes iniciales)")
+    parser.add_argument("--max-turnos", type=int, default=10000, help="límite de turnos por batalla")
+    parser.add_argument("--rondas", type=int,
+                        help="límite de rondas por batalla (por defecto hasta que quede uno)")
+    parser.add_argument("--trabajadores", type=int, default=1,
+                        help="procesos en paralelo (0 = todos los núcleos)")
+    parser.add_argument("--semilla", type=int, help="semilla maestra para resultados reproducibles")
+    parser.add_argument("--registro", help="archivo donde escribir el registro binario de eventos")
+    args = parser.parse_args(argv)
+    if args.registro and args.trabajadores != 1:
+        parser.error("--registro solo admite un trabajador")
+
+    roster = cargar_roster(args.roster) if args.roster else None
+
+    if args.trabajadores != 1:
+        semilla = args.semilla
+        if semilla is None:
+            # Cada ejecución distinta, pero repetible con la semilla mostrada
+            semilla = random.randrange(2 ** 63)
+            print(f"🎲 Semilla: {semilla} (--semilla {semilla} para repetir)")
+        resultado = ejecutar_paralelo(args.batallas, args.trabajadores or None,
+                                      semilla, roster, args.max_turnos, args.rondas)
+    else:
+        if roster:
+            fabrica = lambda: crear_lista(roster)
+        else:
+            fabrica = HeroFactory.crear_lista_inicial
+        rng = random.Random(args.semilla) if args.semilla is not None else None
+        if args.registro:
+            with EscritorRegistro(args.registro) as registro:
+                resultado = ejecutar_lote(args.batallas, fabrica, args.max_turnos, rng,
+                                          args.rondas, registro)
+        else:
+            resultado = ejecutar_lote(args.batallas, fabrica, args.max_turnos, rng, args.rondas)
+    imprimir_resultado(resultado)
+
+
+if __name__ == "__main__":
+    main()
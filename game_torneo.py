@@ -0,0 +1,389 @@
+"""
+🏟️ BATALLA DE HÉROES - TORNEOS
+Todos contra todos, sistema suizo y eliminación directa con clasificación Elo
+en streaming
+
+Cada participante es un equipo de héroes (una ListaHeroes). Los equipos se
+guardan en un AlmacenHeroes compartido, las puntuaciones en arrays y el
+calendario se genera de forma perezosa, de modo que la memoria no crece con
+el número de partidas: un todos contra todos de 10.000 participantes (50
+millones de partidas) solo mantiene en vuelo una ventana acotada de
+partidas. La clasificación Elo se actualiza con cada resultado en cuanto
+llega, sin esperar al final de la ronda.
+
+MotorCombate no tiene bandos: una partida es un todos contra todos entre
+los héroes de ambos equipos y gana el equipo del último héroe en pie (o del
+de más PV al llegar al límite de rondas).
+
+Uso:
+    python -m game_torneo --formato suizo --participantes 10000 --trabajadores 0
+    python -m game_torneo --formato liga --participantes 200 --informe 2000
+    python -m game_torneo --formato eliminacion --archivo equipos.json
+"""
+
+import argparse
+import heapq
+import json
+import math
+import os
+import random
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import replace
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from game_core import AlmacenHeroes, HeroFactory, HeroStats, ListaHeroes, MotorCombate
+from game_sim import crear_lista, roster_desde_datos
+
+
+FORMATOS = ("liga", "suizo", "eliminacion")
+
+Partida = Tuple[int, int, int]  # (participante a, participante b, semilla)
+
+
+# ============================================================================
+# PARTICIPANTES Y CLASIFICACIÓN
+# ============================================================================
+
+class Participantes:
+    """Equipos de héroes guardados en columnas (un rango del almacén por equipo)"""
+
+    def __init__(self):
+        self.almacen = AlmacenHeroes()
+        self.nombres: List[str] = []
+        self._inicios = array("l")
+        self._tamanos = array("l")
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def agregar(self, nombre: str, heroes: Iterable[HeroStats]) -> int:
+        """Agrega un equipo y retorna su índice"""
+        self._inicios.append(len(self.almacen))
+        for stats in heroes:
+            self.almacen.agregar(stats)
+        self._tamanos.append(len(self.almacen) - self._inicios[-1])
+        self.nombres.append(nombre)
+        return len(self.nombres) - 1
+
+    def agregar_lista(self, nombre: str, lista: ListaHeroes) -> int:
+        return self.agregar(nombre, (nodo.stats for nodo in lista.iterar()))
+
+    def equipo(self, indice: int) -> List[HeroStats]:
+        """Materializa las estadísticas de un equipo"""
+        inicio = self._inicios[indice]
+        return [self.almacen.obtener(i) for i in range(inicio, inicio + self._tamanos[indice])]
+
+    @classmethod
+    def aleatorios(cls, cantidad: int, tamano: int = 2, semilla: int = 0) -> 'Participantes':
+        """Equipos de héroes predefinidos con variaciones de ataque y defensa"""
+        rng = random.Random(semilla)
+        nombres = list(HeroFactory.HEROES_PREDEF)
+        participantes = cls()
+        for i in range(cantidad):
+            heroes = []
+            for nombre in rng.sample(nombres, min(tamano, len(nombres))):
+                stats = HeroFactory.crear_heroe(nombre)
+                stats.ataque = min(50, max(5, stats.ataque + rng.randint(-5, 5)))
+                stats.defensa = max(0, stats.defensa + rng.randint(-3, 3))
+                heroes.append(stats)
+            participantes.agregar(f"Equipo {i + 1}", heroes)
+        return participantes
+
+    @classmethod
+    def cargar(cls, ruta: str) -> 'Participantes':
+        """Carga equipos de un JSON: {"nombre": [héroes como en --roster], ...}"""
+        with open(ruta, encoding="utf-8") as archivo:
+            datos = json.load(archivo)
+        participantes = cls()
+        for nombre, heroes in datos.items():
+            roster = roster_desde_datos(heroes)
+            crear_lista(roster)  # ValueError al cargar, no a mitad del torneo
+            participantes.agregar(nombre, roster)
+        return participantes
+
+
+class ClasificacionElo:
+    """Clasificación Elo incremental en arrays (memoria O(participantes))"""
+
+    def __init__(self, cantidad: int, inicial: float = 1500.0, k: float = 32.0):
+        self.k = k
+        self.elo = array("d", [inicial]) * cantidad
+        self.puntos = array("d", [0.0]) * cantidad
+        self.partidas = array("l", [0]) * cantidad
+        self.registradas = 0
+
+    def registrar(self, a: int, b: int, resultado_a: float):
+        """Aplica un resultado (1 = gana a, 0 = gana b, 0.5 = empate)"""
+        esperado_a = 1 / (1 + 10 ** ((self.elo[b] - self.elo[a]) / 400))
+        cambio = self.k * (resultado_a - esperado_a)
+        self.elo[a] += cambio
+        self.elo[b] -= cambio
+        self.puntos[a] += resultado_a
+        self.puntos[b] += 1 - resultado_a
+        self.partidas[a] += 1
+        self.partidas[b] += 1
+        self.registradas += 1
+
+    def top(self, cantidad: int = 10) -> List[int]:
+        """Índices de los mejores por Elo en O(n log cantidad)"""
+        return heapq.nlargest(cantidad, range(len(self.elo)), key=self.elo.__getitem__)
+
+
+# ============================================================================
+# PARTIDAS
+# ============================================================================
+
+def jugar_partida(equipo_a: List[HeroStats], equipo_b: List[HeroStats], semilla: int,
+                  num_rondas: Optional[int] = None, max_turnos: int = 2000) -> float:
+    """Juega una partida entre dos equipos. Retorna 1, 0 o 0.5 para el equipo a"""
+    lista = ListaHeroes()
+    # Héroes intercalados y renombrados por bando (los nombres deben ser únicos)
+    for k in range(max(len(equipo_a), len(equipo_b))):
+        for lado, equipo in ((0, equipo_a), (1, equipo_b)):
+            if k < len(equipo):
+                if not lista.agregar_stats(replace(equipo[k], nombre=f"{lado}{k}:{equipo[k].nombre}")):
+                    raise ValueError(f"Estadísticas inválidas para {equipo[k].nombre}")
+
+    motor = MotorCombate(lista, num_rondas, random.Random(semilla), pool_eventos=4)
+    resultado = motor.simular_hasta_fin(max_turnos=max_turnos)
+    ganador = resultado["ganador"]
+    if resultado["motivo"] == "limite_turnos" or ganador is None:
+        return 0.5
+    return 1.0 if ganador.nombre[0] == "0" else 0.0
+
+
+def _jugar(argumentos: tuple) -> float:
+    return jugar_partida(*argumentos)
+
+
+# ============================================================================
+# TORNEO
+# ============================================================================
+
+class Torneo:
+    """Ejecuta partidas en un pool de procesos con una ventana acotada en vuelo"""
+
+    def __init__(self, participantes: Participantes, trabajadores: int = 1,
+                 ventana: Optional[int] = None, semilla: int = 0,
+                 num_rondas: Optional[int] = None, max_turnos: int = 2000,
+                 informe: Optional[Callable[['Torneo'], None]] = None, informe_cada: int = 0):
+        self.participantes = participantes
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.ventana = ventana or self.trabajadores * 8
+        self.semilla = semilla
+        self.num_rondas = num_rondas
+        self.max_turnos = max_turnos
+        self.clasificacion = ClasificacionElo(len(participantes))
+        self.informe = informe
+        self.informe_cada = informe_cada
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'Torneo':
+        if self.trabajadores > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.trabajadores)
+        return self
+
+    def __exit__(self, *excepcion):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _argumentos(self, partida: Partida) -> tuple:
+        a, b, semilla = partida
+        return (self.participantes.equipo(a), self.participantes.equipo(b), semilla,
+                self.num_rondas, self.max_turnos)
+
+    def _semilla(self, a: int, b: int, ronda: int) -> int:
+        return hash((self.semilla, a, b, ronda)) & 0xFFFFFFFF
+
+    def jugar(self, partidas: Iterable[Partida]) -> Iterator[Tuple[int, int, float]]:
+        """Juega las partidas y produce (a, b, resultado) a medida que terminan.
+
+        Como mucho `ventana` partidas están en vuelo a la vez; cada resultado
+        actualiza la clasificación antes de producirse.
+        """
+        partidas = iter(partidas)
+        if self._pool is None:
+            for partida in partidas:
+                resultado = jugar_partida(*self._argumentos(partida))
+                yield self._registrar(partida, resultado)
+            return
+
+        en_curso = {}
+        for partida in partidas:
+            en_curso[self._pool.submit(_jugar, self._argumentos(partida))] = partida
+            if len(en_curso) >= self.ventana:
+                break
+        while en_curso:
+            hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                partida = en_curso.pop(futuro)
+                yield self._registrar(partida, futuro.result())
+                siguiente = next(partidas, None)
+                if siguiente is not None:
+                    en_curso[self._pool.submit(_jugar, self._argumentos(siguiente))] = siguiente
+
+    def _registrar(self, partida: Partida, resultado: float) -> Tuple[int, int, float]:
+        a, b, _ = partida
+        self.clasificacion.registrar(a, b, resultado)
+        if self.informe and self.informe_cada and \
+                self.clasificacion.registradas % self.informe_cada == 0:
+            self.informe(self)
+        return a, b, resultado
+
+    # --- Formatos ---
+
+    def liga(self, vueltas: int = 1):
+        """Todos contra todos; el calendario se genera sobre la marcha"""
+        n = len(self.participantes)
+
+        def calendario() -> Iterator[Partida]:
+            for vuelta in range(vueltas):
+                for a in range(n):
+                    for b in range(a + 1, n):
+                        # Alternar quién abre en cada vuelta
+                        local, visitante = (a, b) if vuelta % 2 == 0 else (b, a)
+                        yield local, visitante, self._semilla(local, visitante, vuelta)
+
+        for _ in self.jugar(calendario()):
+            pass
+
+    def suizo(self, rondas: Optional[int] = None):
+        """Sistema suizo: cada ronda empareja a participantes con puntuación similar"""
+        n = len(self.participantes)
+        rondas = rondas or max(1, math.ceil(math.log2(max(n, 2))))
+        jugados = set()  # pares ya enfrentados (n × rondas / 2 como mucho)
+        descansaron = set()
+        clasificacion = self.clasificacion
+
+        for ronda in range(rondas):
+            orden = sorted(range(n), key=lambda i: (-clasificacion.puntos[i], -clasificacion.elo[i]))
+            if n % 2:
+                # Descansa el peor clasificado que aún no lo haya hecho (cuenta como victoria)
+                libre = next((i for i in reversed(orden) if i not in descansaron), orden[-1])
+                descansaron.add(libre)
+                orden.remove(libre)
+                clasificacion.puntos[libre] += 1
+
+            emparejado = bytearray(n)
+            partidas = []
+            for posicion, a in enumerate(orden):
+                if emparejado[a]:
+                    continue
+                rival = None
+                for siguiente in range(posicion + 1, len(orden)):  # sin copiar el resto de orden
+                    b = orden[siguiente]
+                    if not emparejado[b]:
+                        if rival is None:
+                            rival = b  # por si todos los demás ya se enfrentaron
+                        if (min(a, b), max(a, b)) not in jugados:
+                            rival = b
+                            break
+                if rival is None:
+                    continue
+                emparejado[a] = emparejado[rival] = 1
+                jugados.add((min(a, rival), max(a, rival)))
+                partidas.append((a, rival, self._semilla(a, rival, ronda)))
+
+            for _ in self.jugar(partidas):
+                pass
+
+    def eliminacion(self) -> int:
+        """Eliminación directa con cabezas de serie por Elo. Retorna el campeón"""
+        n = len(self.participantes)
+        tamano = 1 << max(0, (n - 1).bit_length())
+        por_elo = self.clasificacion.top(n)
+        cuadro: List[Optional[int]] = [por_elo[cabeza - 1] if cabeza <= n else None
+                                       for cabeza in _orden_cabezas(tamano)]
+
+        ronda = 0
+        while len(cuadro) > 1:
+            partidas = []
+            posiciones = {}
+            siguiente: List[Optional[int]] = []
+            for k in range(0, len(cuadro), 2):
+                a, b = cuadro[k], cuadro[k + 1]
+                if a is None or b is None:
+                    siguiente.append(a if b is None else b)  # pase directo
+                    continue
+                posiciones[(a, b)] = len(siguiente)
+                siguiente.append(None)
+                partidas.append((a, b, self._semilla(a, b, ronda)))
+            for a, b, resultado in self.jugar(partidas):
+                if resultado == 0.5:  # empate: pasa el de mejor Elo
+                    resultado = 1.0 if self.clasificacion.elo[a] >= self.clasificacion.elo[b] else 0.0
+                siguiente[posiciones[(a, b)]] = a if resultado == 1.0 else b
+            cuadro = siguiente
+            ronda += 1
+        return cuadro[0]
+
+
+def _orden_cabezas(tamano: int) -> List[int]:
+    """Cabezas de serie en orden de cuadro (1 y 2 solo pueden verse en la final)"""
+    orden = [1]
+    while len(orden) < tamano:
+        total = len(orden) * 2 + 1
+        orden = [cabeza for c in orden for cabeza in (c, total - c)]
+    return orden
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def imprimir_clasificacion(torneo: Torneo, cantidad: int = 10):
+    """Muestra los mejores participantes"""
+    clasificacion = torneo.clasificacion
+    for posicion, i in enumerate(clasificacion.top(cantidad), 1):
+        print(f"  {posicion:>2}. {torneo.participantes.nombres[i]:<16} Elo {clasificacion.elo[i]:7.1f} | "
+              f"{clasificacion.puntos[i]:g} pts en {clasificacion.partidas[i]} partidas")
+
+
+def main(argv: Optional[List[str]] = None):
+    """Función principal de torneos"""
+    parser = argparse.ArgumentParser(description="Torneos de Batalla de Héroes")
+    parser.add_argument("--formato", default="suizo", help=f"formato ({', '.join(FORMATOS)})")
+    parser.add_argument("--participantes", type=int, default=64, help="equipos aleatorios")
+    parser.add_argument("--tamano", type=int, default=2, help="héroes por equipo aleatorio")
+    parser.add_argument("--archivo", help="JSON con equipos {nombre: [héroes]}")
+    parser.add_argument("--rondas", type=int, help="rondas del sistema suizo")
+    parser.add_argument("--vueltas", type=int, default=1, help="vueltas de la liga")
+    parser.add_argument("--trabajadores", type=int, default=1, help="procesos (0 = todos los núcleos)")
+    parser.add_argument("--ventana", type=int, help="partidas en vuelo como máximo")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla del torneo")
+    parser.add_argument("--informe", type=int, default=0,
+                        help="muestra el líder cada N partidas (0 = solo al final)")
+    args = parser.parse_args(argv)
+
+    if args.formato not in FORMATOS:
+        parser.error(f"formato desconocido: {args.formato} (opciones: {', '.join(FORMATOS)})")
+    if args.archivo:
+        participantes = Participantes.cargar(args.archivo)
+    else:
+        participantes = Participantes.aleatorios(args.participantes, args.tamano, args.semilla)
+    if len(participantes) < 2:
+        parser.error("se necesitan al menos dos participantes")
+
+    def informe(torneo: Torneo):
+        lider = torneo.clasificacion.top(1)[0]
+        print(f"📈 {torneo.clasificacion.registradas} partidas | líder: "
+              f"{torneo.participantes.nombres[lider]} ({torneo.clasificacion.elo[lider]:.0f})")
+
+    with Torneo(participantes, args.trabajadores, args.ventana, args.semilla,
+                informe=informe, informe_cada=args.informe) as torneo:
+        print(f"🏟️ {args.formato}: {len(participantes)} participantes")
+        if args.formato == "liga":
+            torneo.liga(args.vueltas)
+        elif args.formato == "suizo":
+            torneo.suizo(args.rondas)
+        else:
+            campeon = torneo.eliminacion()
+            print(f"🏆 Campeón: {participantes.nombres[campeon]}")
+
+    print(f"📊 Clasificación tras {torneo.clasificacion.registradas} partidas:")
+    imprimir_clasificacion(torneo)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""
+🧮 BATALLA DE HÉROES - MOTOR VECTORIZADO
+Motor de combate por lotes (struct-of-arrays) con NumPy
+
+Mantiene las estadísticas de B batallas × H héroes en arreglos NumPy y avanza
+todas las batallas activas un turno por paso, con las mismas reglas que
+HeroStats.recibir_dano, las clases Accion* y PoliticaUmbrales.seleccionar_accion,
+incluido el cierre de ronda (reordenar por PV) y el límite de rondas.
+
+Uso:
+    python -m game_vectorizado --batallas 100000
+    python -m game_vectorizado --batallas 5000 --verificar
+"""
+
+import argparse
+import math
+import random
+import time
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+
+from game_core import HeroFactory, HeroStats
+from game_sim import crear_lista, ejecutar_lote, cargar_roster
+
+
+# Códigos de acción
+ATACAR, CURAR, HABILIDAD, PASAR = 0, 1, 2, 3
+
+
+class MotorVectorizado:
+    """Motor de combate que avanza B batallas en paralelo"""
+
+    def __init__(self, roster: List[HeroStats], num_batallas: int,
+                 semilla: Optional[int] = None, num_rondas: Optional[int] = None):
+        self.nombres = [stats.nombre for stats in roster]
+        self.num_batallas = num_batallas
+        self.num_heroes = len(roster)
+        self.num_rondas = num_rondas
+        self.rng = np.random.default_rng(semilla)
+
+        def columna(campo: str, dtype) -> np.ndarray:
+            valores = np.array([getattr(stats, campo) for stats in roster], dtype=dtype)
+            return np.tile(valores, (num_batallas, 1))
+
+        # Struct-of-arrays: una fila por batalla, una columna por héroe
+        self.pv = columna("pv", np.int64)
+        self.pv_max = columna("pv_max", np.int64)
+        self.ataque = columna("ataque", np.int64)
+        self.defensa = columna("defensa", np.int64)
+        self.critico = columna("critico", np.float64)
+        self.esquiva = columna("esquiva", np.float64)
+        self.energia = columna("energia", np.int64)
+        self.energia_max = columna("energia_max", np.int64)
+        self.nivel = columna("nivel", np.int64)
+
+        # Estado de cada batalla: orden de turnos (equivale al anillo), posición
+        # del turno actual y héroes que aún no han jugado en la ronda
+        vivos = self.pv > 0
+        self.orden = np.tile(np.arange(self.num_heroes), (num_batallas, 1))
+        self.pos = np.argmax(vivos, axis=1)
+        self.pendientes = vivos.copy()
+        self.rondas = np.zeros(num_batallas, dtype=np.int64)
+        self.activas = vivos.sum(axis=1) > 1
+        self.ganador = np.where(vivos.sum(axis=1) == 1, np.argmax(vivos, axis=1), -1)
+        self.turnos = np.zeros(num_batallas, dtype=np.int64)
+
+        self.estadisticas = {
+            clave: np.zeros(num_batallas, dtype=np.int64)
+            for clave in ("ataques_totales", "dano_total", "curaciones_totales",
+                          "salud_restaurada", "criticos", "esquivas", "habilidades_usadas")
+        }
+
+    # ------------------------------------------------------------------
+    # Simulación
+    # ------------------------------------------------------------------
+
+    def paso(self) -> int:
+        """Avanza un turno todas las batallas activas. Retorna cuántas quedan"""
+        b = np.nonzero(self.activas)[0]
+        if b.size == 0:
+            return 0
+
+        n = b.size
+        filas = np.arange(n)
+        h = self.orden[b, self.pos[b]]
+        u = self.rng.random((n, 6))
+
+        pv = self.pv[b]
+        vivos = pv > 0
+        otros = vivos.copy()
+        otros[filas, h] = False
+
+        # --- Selección de acción (misma lógica que MotorCombate) ---
+        pv_h = pv[filas, h]
+        pv_max_h = self.pv_max[b, h]
+        energia_h = self.energia[b, h]
+        mas_debil = np.where(otros, pv, np.iinfo(np.int64).max).min(axis=1)
+
+        usar_habilidad = (energia_h >= 50) & (mas_debil < 60) & (u[:, 0] < 0.4)
+        curar_urgente = ~usar_habilidad & (pv_h < pv_max_h * 0.4) & (u[:, 1] < 0.6)
+        accion = np.select(
+            [usar_habilidad, curar_urgente, u[:, 2] < 0.55, u[:, 2] < 0.80],
+            [HABILIDAD, CURAR, ATACAR, CURAR],
+            default=PASAR
+        )
+
+        # --- Selección de objetivo uniforme entre los otros vivos ---
+        candidatos = otros.sum(axis=1)
+        k = np.floor(u[:, 3] * candidatos).astype(np.int64)
+        objetivo = np.argmax(np.cumsum(otros, axis=1) > k[:, None], axis=1)
+
+        self._atacar(b[accion == ATACAR], h[accion == ATACAR], objetivo[accion == ATACAR],
+                     u[accion == ATACAR])
+        self._habilidad(b[accion == HABILIDAD], h[accion == HABILIDAD],
+                        objetivo[accion == HABILIDAD], u[accion == HABILIDAD])
+        self._curar(b[accion == CURAR], h[accion == CURAR])
+        self._pasar(b[accion == PASAR], h[accion == PASAR])
+
+        # --- Avanzar turno al siguiente héroe vivo (orden circular) ---
+        vivos = self.pv[b] > 0
+        pendientes = self.pendientes[b]
+        pendientes[filas, h] = False
+        pendientes &= vivos
+        self.pendientes[b] = pendientes
+
+        desplazamientos = (self.pos[b][:, None] + np.arange(1, self.num_heroes + 1)) % self.num_heroes
+        en_orden = np.take_along_axis(self.orden[b], desplazamientos, axis=1)
+        siguiente = np.argmax(np.take_along_axis(vivos, en_orden, axis=1), axis=1)
+        self.pos[b] = desplazamientos[filas, siguiente]
+        self.turnos[b] += 1
+
+        # --- Fin de juego ---
+        num_vivos = vivos.sum(axis=1)
+        terminadas = num_vivos <= 1
+        self.activas[b[terminadas]] = False
+        self.ganador[b[terminadas]] = np.where(num_vivos[terminadas] == 1,
+                                               np.argmax(vivos[terminadas], axis=1), -1)
+
+        # --- Fin de ronda: reordenar por PV (estable) y reiniciar pendientes ---
+        cierre = ~terminadas & ~pendientes.any(axis=1)
+        if cierre.any():
+            r = b[cierre]
+            self.orden[r] = np.argsort(-self.pv[r], axis=1, kind="stable")
+            self.pos[r] = 0
+            self.pendientes[r] = vivos[cierre]
+            self.rondas[r] += 1
+            if self.num_rondas is not None:
+                limite = r[self.rondas[r] >= self.num_rondas]
+                self.activas[limite] = False
+                self.ganador[limite] = np.argmax(self.pv[limite], axis=1)
+        return int(self.activas.sum())
+
+    def simular(self, max_turnos: int = 10000):
+        """Avanza hasta que todas las batallas terminen o se alcance el límite"""
+        for _ in range(max_turnos):
+            if self.paso() == 0:
+                break
+
+    def _atacar(self, b: np.ndarray, h: np.ndarray, t: np.ndarray, u: np.ndarray):
+        """AccionAtacar + HeroStats.recibir_dano"""
+        dano = self.ataque[b, h] + self.rng.integers(-5, 16, size=b.size)
+        es_critico = u[:, 4] < self.critico[b, h]
+        dano = np.where(es_critico, (dano * 1.5).astype(np.int64), dano)
+
+        fue_esquivado = u[:, 5] < self.esquiva[b, t]
+        reduccion = np.minimum(0.7, self.defensa[b, t] * 0.02)
+        dano_reducido = (dano * (1 - reduccion)).astype(np.int64)
+        pv_t = self.pv[b, t]
+        dano_real = np.where(fue_esquivado, 0, np.minimum(dano_reducido, pv_t))
+        self.pv[b, t] = np.where(fue_esquivado, pv_t, np.maximum(0, pv_t - dano_reducido))
+
+        self.energia[b, h] = np.minimum(self.energia_max[b, h], self.energia[b, h] + 15)
+
+        self.estadisticas["ataques_totales"][b] += 1
+        self.estadisticas["dano_total"][b] += dano_real
+        self.estadisticas["criticos"][b] += es_critico
+        self.estadisticas["esquivas"][b] += fue_esquivado
+
+    def _habilidad(self, b: np.ndarray, h: np.ndarray, t: np.ndarray, u: np.ndarray):
+        """AccionHabilidadEspecial: daño masivo que ignora la defensa"""
+        self.energia[b, h] -= 50
+        dano = (self.ataque[b, h] * 2.5).astype(np.int64) + self.rng.integers(20, 41, size=b.size)
+
+        fue_esquivado = u[:, 5] < self.esquiva[b, t]
+        pv_t = self.pv[b, t]
+        dano_real = np.where(fue_esquivado, 0, np.minimum(dano, pv_t))
+        self.pv[b, t] = np.where(fue_esquivado, pv_t, np.maximum(0, pv_t - dano))
+
+        self.estadisticas["ataques_totales"][b] += 1
+        self.estadisticas["dano_total"][b] += dano_real
+        self.estadisticas["esquivas"][b] += fue_esquivado
+        self.estadisticas["habilidades_usadas"][b] += 1
+
+    def _curar(self, b: np.ndarray, h: np.ndarray):
+        """AccionCurar"""
+        curacion = 15 + self.nivel[b, h] * 5 + self.rng.integers(5, 21, size=b.size)
+        pv_h = self.pv[b, h]
+        curacion_real = np.minimum(curacion, self.pv_max[b, h] - pv_h)
+        self.pv[b, h] = np.minimum(self.pv_max[b, h], pv_h + curacion)
+        self.energia[b, h] = np.minimum(self.energia_max[b, h], self.energia[b, h] + 10)
+
+        self.estadisticas["curaciones_totales"][b] += 1
+        self.estadisticas["salud_restaurada"][b] += curacion_real
+
+    def _pasar(self, b: np.ndarray, h: np.ndarray):
+        """AccionPasar: energía y 5% de vida máxima"""
+        self.energia[b, h] = np.minimum(self.energia_max[b, h], self.energia[b, h] + 25)
+        curacion = (self.pv_max[b, h] * 0.05).astype(np.int64)
+        self.pv[b, h] = np.minimum(self.pv_max[b, h], self.pv[b, h] + curacion)
+
+    # ------------------------------------------------------------------
+    # Resultados
+    # ------------------------------------------------------------------
+
+    def victorias(self) -> Counter:
+        """Victorias por nombre de héroe (las batallas sin ganador no cuentan)"""
+        conteo = np.bincount(self.ganador[self.ganador >= 0], minlength=self.num_heroes)
+        return Counter({nombre: int(conteo[i]) for i, nombre in enumerate(self.nombres)
+                        if conteo[i]})
+
+    def estadisticas_totales(self) -> Counter:
+        """Suma de las estadísticas de todas las batallas"""
+        return Counter({clave: int(valores.sum()) for clave, valores in self.estadisticas.items()})
+
+
+# ============================================================================
+# EQUIVALENCIA ESTADÍSTICA CON EL MOTOR ESCALAR
+# ============================================================================
+
+def verificar_equivalencia(num_batallas: int = 4000, semilla: int = 0,
+                           roster: Optional[List[HeroStats]] = None,
+                           umbral_z: float = 4.0, num_rondas: Optional[int] = None) -> dict:
+    """Compara el motor vectorizado con MotorCombate sobre el mismo roster.
+
+    Aplica una prueba z de dos proporciones a la tasa de victorias de cada
+    héroe y una prueba z de medias a la duración de las batallas. Retorna un
+    informe con los estadísticos y la clave "equivalente".
+    """
+    if roster is None:
+        roster = [nodo.stats for nodo in HeroFactory.crear_lista_inicial().iterar()]
+
+    escalar = ejecutar_lote(num_batallas, lambda: crear_lista(roster),
+                            rng=random.Random(semilla), num_rondas=num_rondas)
+
+    motor = MotorVectorizado(roster, num_batallas, semilla, num_rondas)
+    motor.simular()
+    victorias = motor.victorias()
+
+    informe = {"victorias": {}, "equivalente": True}
+    for stats in roster:
+        p1 = escalar.victorias[stats.nombre] / num_batallas
+        p2 = victorias[stats.nombre] / num_batallas
+        p = (p1 + p2) / 2
+        error = math.sqrt(max(p * (1 - p), 1e-12) * 2 / num_batallas)
+        z = (p1 - p2) / error
+        informe["victorias"][stats.nombre] = (p1, p2, z)
+        informe["equivalente"] &= abs(z) < umbral_z
+
+    # La duración se compara con la varianza observada en el motor vectorizado
+    media_escalar = escalar.turnos / num_batallas
+    media_vector = float(motor.turnos.mean())
+    error = math.sqrt(2 * float(motor.turnos.var()) / num_batallas) or 1e-12
+    z = (media_escalar - media_vector) / error
+    informe["turnos"] = (media_escalar, media_vector, z)
+    informe["equivalente"] &= abs(z) < umbral_z
+    return informe
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None):
+    """Función principal del motor vectorizado"""
+    parser = argparse.ArgumentParser(description="Motor de combate vectorizado (NumPy)")
+    parser.add_argument("--batallas", type=int, default=100000, help="batallas simultáneas")
+    parser.add_argument("--roster", help="archivo JSON con el roster")
+    parser.add_argument("--semilla", type=int, help="semilla del generador")
+    parser.add_argument("--rondas", type=int, help="límite de rondas por batalla")
+    parser.add_argument("--verificar", action="store_true",
+                        help="compara estadísticamente con MotorCombate")
+    args = parser.parse_args(argv)
+
+    roster = cargar_roster(args.roster) if args.roster else None
+
+    if args.verificar:
+        informe = verificar_equivalencia(args.batallas, args.semilla or 0, roster,
+                                         num_rondas=args.rondas)
+        for nombre, (p1, p2, z) in informe["victorias"].items():
+            print(f"  • {nombre}: escalar {p1:.1%} | vectorizado {p2:.1%} | z={z:+.2f}")
+        m1, m2, z = informe["turnos"]
+        print(f"  • Turnos medios: escalar {m1:.2f} | vectorizado {m2:.2f} | z={z:+.2f}")
+        print("✅ Equivalentes" if informe["equivalente"] else "❌ Diferencia significativa")
+        return
+
+    if roster is None:
+        roster = [nodo.stats for nodo in HeroFactory.crear_lista_inicial().iterar()]
+
+    inicio = time.perf_counter()
+    motor = MotorVectorizado(roster, args.batallas, args.semilla, args.rondas)
+    motor.simular()
+    segundos = time.perf_counter() - inicio
+
+    turnos = int(motor.turnos.sum())
+    print(f"🧮 Batallas: {args.batallas} | Turnos: {turnos}")
+    print(f"⏱️ {segundos:.3f} s | {args.batallas / segundos:,.1f} batallas/s | "
+          f"{turnos / segundos:,.1f} turnos/s")
+    print("🏆 Victorias:")
+    for nombre, victorias in motor.victorias().most_common():
+        print(f"  • {nombre}: {victorias} ({victorias / args.batallas:.1%})")
+
+
+if __name__ == "__main__":
+    main()
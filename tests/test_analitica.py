@@ -0,0 +1,46 @@
+"""
+🧪 Analítica exacta con muchos golpes
+
+_supervivencia se calcula de abajo arriba: miles de golpes no deben agotar
+la pila ni cambiar el resultado respecto a pedirlos de uno en uno, y la
+tabla deja de crecer cuando el estado ya no cambia.
+"""
+
+from dataclasses import replace
+
+from game_analitica import _TABLAS, probabilidad_muerte
+from game_core import HeroFactory
+
+
+def test_muchos_golpes_sin_recursion():
+    atacante = HeroFactory.crear_heroe("Thor")
+    # Casi siempre esquiva: hacen falta miles de golpes para matarlo
+    defensor = replace(HeroFactory.crear_heroe("Shadow"), esquiva=0.999)
+    p = probabilidad_muerte(atacante, defensor, 5000)
+    assert 0.5 < p < 1.0
+
+
+def test_tabla_incremental_coincide():
+    atacante = HeroFactory.crear_heroe("Shadow")
+    defensor = replace(HeroFactory.crear_heroe("Thor"), esquiva=0.5)
+    incremental = [probabilidad_muerte(atacante, defensor, golpes) for golpes in range(50)]
+    _TABLAS.clear()
+    assert probabilidad_muerte(atacante, defensor, 49) == incremental[-1]
+    assert incremental == sorted(incremental)
+
+
+def test_tabla_acotada_tras_la_muerte_segura():
+    _TABLAS.clear()
+    atacante, defensor = HeroFactory.crear_heroe("Thor"), HeroFactory.crear_heroe("Shadow")
+    assert probabilidad_muerte(atacante, defensor, 100000) > 1 - 1e-9
+    (tabla,) = _TABLAS.values()
+    assert len(tabla) < 100
+
+
+def test_sin_dano_no_crece():
+    _TABLAS.clear()
+    atacante = HeroFactory.crear_heroe("Thor")
+    defensor = replace(HeroFactory.crear_heroe("Shadow"), esquiva=1.0)
+    assert probabilidad_muerte(atacante, defensor, 100000) == 0.0
+    (tabla,) = _TABLAS.values()
+    assert len(tabla) <= 2
@@ -0,0 +1,38 @@
+"""
+🧪 Búsqueda de balance reproducible
+
+La misma semilla debe dar los mismos candidatos con cualquier número de
+trabajadores, y retomar la estrategia evolutiva con otra población es un
+error.
+"""
+
+import pytest
+
+from game_balance import Balanceador, EspacioBalance
+from game_core import HeroFactory
+
+
+def _espacio() -> EspacioBalance:
+    roster = [HeroFactory.crear_heroe(nombre) for nombre in HeroFactory.HEROES_PREDEF]
+    return EspacioBalance(roster, ["Thor", "Shadow"], ["ataque", "defensa"])
+
+
+@pytest.mark.parametrize("metodo", ["aleatoria", "es"])
+def test_misma_busqueda_con_distintos_trabajadores(metodo):
+    candidatos = []
+    for trabajadores in (1, 8):
+        balanceador = Balanceador(_espacio(), num_batallas=10, trabajadores=trabajadores)
+        if metodo == "aleatoria":
+            balanceador.aleatoria(20)
+        else:
+            balanceador.es(generaciones=2)
+        candidatos.append(balanceador.cache)
+    assert candidatos[0] == candidatos[1]
+
+
+def test_retomar_es_con_otra_poblacion(tmp_path):
+    checkpoint = str(tmp_path / "balance.json")
+    Balanceador(_espacio(), num_batallas=10, trabajadores=1, checkpoint=checkpoint).es(1, poblacion=6)
+    balanceador = Balanceador(_espacio(), num_batallas=10, trabajadores=1, checkpoint=checkpoint)
+    with pytest.raises(ValueError):
+        balanceador.es(2, poblacion=8)
@@ -0,0 +1,32 @@
+"""
+🧪 Duelos entre héroes con el mismo nombre
+
+El ganador se decide por bando: un "Thor" propio mucho más fuerte que el
+predefinido debe ganarle casi siempre, y el resultado no depende de qué
+lado se pase primero.
+"""
+
+from dataclasses import replace
+
+from game_core import HeroFactory
+from game_matchups import _duelos, calcular_matriz, cargar_cache
+
+
+def _thor_fuerte():
+    return replace(HeroFactory.crear_heroe("Thor"), pv=200, pv_max=200, ataque=40)
+
+
+def test_ganador_por_bando_con_nombres_repetidos():
+    fuerte, normal = _thor_fuerte(), HeroFactory.crear_heroe("Thor")
+    victorias_a, victorias_b, _ = _duelos(fuerte, normal, 40, "prueba", None, 10000)
+    assert victorias_a > 30
+    victorias_a, victorias_b, _ = _duelos(normal, fuerte, 40, "prueba", None, 10000)
+    assert victorias_b > 30
+
+
+def test_cache_guardada_por_lote(tmp_path):
+    ruta = str(tmp_path / "cache.json")
+    roster = [_thor_fuerte(), HeroFactory.crear_heroe("Thor")]
+    calcular_matriz(roster, ancho=0.0, lote=50, max_duelos=100, trabajadores=1, ruta_cache=ruta)
+    cache = cargar_cache(ruta)
+    assert [resultado.duelos for resultado in cache.values()] == [100]
@@ -0,0 +1,56 @@
+"""
+🧪 Héroes mejorados por encima de los límites de creación (Modo Prueba)
+
+clonar, restore, la IA MCTS y las repeticiones deben funcionar con rosters
+cuyos héroes ya no pasarían la validación de agregar_stats.
+"""
+
+import random
+
+import pytest
+
+from game_core import HeroFactory, ListaHeroes, MotorCombate
+from game_mcts import PoliticaMCTS
+from game_replay import Replay
+
+
+def _lista_mejorada() -> ListaHeroes:
+    """Roster inicial con el primer héroe mejorado 12 veces (nivel 17, 85 de ataque)"""
+    lista = HeroFactory.crear_lista_inicial()
+    for _ in range(12):
+        lista.mejorar_heroe("Artemis")
+    assert not ListaHeroes().agregar_stats(lista.buscar_heroe("Artemis").stats)
+    return lista
+
+
+def test_clonar_conserva_heroes_mejorados():
+    motor = MotorCombate(_lista_mejorada(), None, random.Random(1))
+    for _ in range(10):
+        motor.ejecutar_turno()
+
+    clon = motor.clonar()
+    assert [h.nombre for h in clon.lista_heroes.iterar()] == \
+           [h.nombre for h in motor.lista_heroes.iterar()]
+    assert clon.snapshot() == motor.snapshot()
+    for _ in range(30):
+        assert clon.ejecutar_turno().a_dict() == motor.ejecutar_turno().a_dict()
+
+
+def test_mcts_con_heroe_mejorado():
+    motor = MotorCombate(_lista_mejorada(), None, random.Random(2))
+    motor.asignar_politica(PoliticaMCTS(max_simulaciones=20, semilla=0), "Artemis")
+    resultado = motor.simular_hasta_fin(max_turnos=500)
+    assert resultado["motivo"] == "ultimo_en_pie"
+
+
+@pytest.mark.parametrize("turno", [0, 7, 40])
+def test_replay_con_heroe_mejorado(turno):
+    roster = [heroe.stats for heroe in _lista_mejorada().iterar()]
+    replay = Replay.grabar(roster, semilla=3, intervalo=16)
+    assert replay.verificar()
+
+    turno = min(turno, replay.num_turnos)
+    directo = MotorCombate(ListaHeroes.copia_de(roster), None, random.Random(3))
+    for _ in range(turno):
+        directo.ejecutar_turno()
+    assert replay.motor_en(turno).snapshot() == directo.snapshot()
@@ -0,0 +1,35 @@
+"""
+🧪 Contadores del despachador por suscripción
+
+Dos observers con el mismo __qualname__ (lambdas, o el mismo método en
+instancias distintas) deben conservar cada uno sus contadores.
+"""
+
+from game_observadores import DespachadorEventos
+
+
+class _Contador:
+    def __init__(self):
+        self.eventos = 0
+
+    def recibir(self, evento):
+        self.eventos += 1
+
+
+def test_latencias_por_suscripcion():
+    despachador = DespachadorEventos()
+    primero, segundo = _Contador(), _Contador()
+    despachador.agregar_observer(primero.recibir)
+    despachador.agregar_observer(segundo.recibir)
+    despachador.agregar_observer(lambda evento: None)
+    despachador.agregar_observer(lambda evento: 1 / 0)
+
+    for _ in range(3):
+        despachador({"tipo": "ataque"})
+    despachador.drenar()
+
+    latencias = despachador.latencias()
+    assert len(latencias) == 4
+    assert [latencia.eventos for _, latencia in latencias] == [3, 3, 3, 3]
+    assert [latencia.errores for _, latencia in latencias] == [0, 0, 0, 1]
+    assert despachador.latencia(segundo.recibir) is latencias[1][1]
@@ -0,0 +1,22 @@
+"""
+🧪 Pool de eventos mínimo
+
+Con pool_eventos=1 el evento de fin de ronda no debe reutilizar (y pisar)
+el evento del turno que cerró la ronda.
+"""
+
+import random
+
+from game_core import HeroFactory, MotorCombate
+
+
+def test_fin_ronda_no_pisa_el_evento_del_turno():
+    motor = MotorCombate(HeroFactory.crear_lista_inicial(), 5, random.Random(1), pool_eventos=1)
+    rondas = []
+    motor.agregar_observer(lambda evento: rondas.append(evento.ronda) if evento.tipo == "fin_ronda" else None)
+
+    while not motor.terminado:
+        resultado = motor.ejecutar_turno()
+        assert resultado.tipo != "fin_ronda"
+
+    assert rondas == list(range(1, motor.ronda_actual + 1))
@@ -0,0 +1,44 @@
+"""
+🧪 Registro binario: muchos nombres y archivos sin cerrar
+
+Los índices de héroe son u32, así que superar 65.535 nombres distintos no
+confunde a ningún héroe con SIN_HEROE; y un escritor que no llegó a cerrarse
+deja un archivo que el lector aún puede recorrer.
+"""
+
+import random
+
+from game_core import EventoCombate, HeroFactory, MotorCombate
+from game_registro import EscritorRegistro, LectorRegistro
+
+
+def test_mas_de_65535_nombres(tmp_path):
+    ruta = str(tmp_path / "nombres.bhr")
+    with EscritorRegistro(ruta) as escritor:
+        for i in range(70000):
+            escritor.registrar(EventoCombate("curacion", heroe=f"Thor #{i}", cantidad=1))
+
+    with LectorRegistro(ruta) as lector:
+        assert lector.registro(65535).actor == "Thor #65535"
+        assert lector.registro(69999).actor == "Thor #69999"
+
+
+def test_archivo_sin_cerrar(tmp_path):
+    ruta = str(tmp_path / "cortado.bhr")
+    escritor = EscritorRegistro(ruta, tamano_buffer=1)  # vuelca cada registro
+    for semilla in range(3):
+        motor = MotorCombate(HeroFactory.crear_lista_inicial(), 5, random.Random(semilla))
+        escritor.iniciar_batalla()
+        motor.agregar_observer(escritor)
+        motor.simular_hasta_fin()
+        escritor.finalizar_batalla(motor.resultado_final())
+    escritor._archivo.flush()  # el proceso muere aquí: sin tabla de nombres, índice ni pie
+
+    with LectorRegistro(ruta) as lector:
+        assert not lector.completo
+        assert lector.num_batallas == 3
+        assert lector.num_registros == escritor.num_registros
+        inicio, fin = lector.rango_batalla(1)
+        assert fin - inicio == escritor._cantidades[1]
+        assert lector.registro(fin - 1).tipo == "fin_batalla"
+    escritor.cerrar()
@@ -0,0 +1,55 @@
+"""
+🧪 Equivalencia estadística del motor vectorizado (NumPy) con MotorCombate
+
+Los dos motores no comparten la secuencia aleatoria, así que se comparan
+distribuciones: tasa de victorias de cada héroe (prueba z de dos
+proporciones) y turnos medios por batalla (prueba z de medias).
+"""
+
+from dataclasses import replace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from game_core import HeroFactory
+from game_vectorizado import verificar_equivalencia
+
+
+SEMILLA = 0
+BATALLAS = 4000   # por motor
+UMBRAL_Z = 4.0    # |z| máximo por estadístico (falsos positivos < 1 en 10.000 por prueba)
+
+
+def _roster():
+    return [nodo.stats for nodo in HeroFactory.crear_lista_inicial().iterar()]
+
+
+def _resumen(informe: dict) -> str:
+    lineas = [f"{nombre}: {p1:.3f} vs {p2:.3f} (z={z:+.2f})"
+              for nombre, (p1, p2, z) in informe["victorias"].items()]
+    m1, m2, z = informe["turnos"]
+    lineas.append(f"turnos: {m1:.2f} vs {m2:.2f} (z={z:+.2f})")
+    return "\n".join(lineas)
+
+
+@pytest.mark.parametrize("num_rondas", [None, 5])
+def test_distribuciones_equivalentes(num_rondas):
+    informe = verificar_equivalencia(BATALLAS, SEMILLA, _roster(), UMBRAL_Z, num_rondas)
+    assert informe["equivalente"], _resumen(informe)
+
+
+def test_detecta_divergencia(monkeypatch):
+    """Con reglas distintas en el motor vectorizado la prueba debe fallar"""
+    import game_vectorizado
+
+    original = game_vectorizado.MotorVectorizado
+
+    def motor_alterado(roster, *args, **kwargs):
+        roster = [replace(stats, ataque=stats.ataque + 15) if stats.nombre == "Thor" else stats
+                  for stats in roster]
+        return original(roster, *args, **kwargs)
+
+    monkeypatch.setattr(game_vectorizado, "MotorVectorizado", motor_alterado)
+    informe = verificar_equivalencia(BATALLAS, SEMILLA, _roster(), UMBRAL_Z)
+    assert not informe["equivalente"], _resumen(informe)
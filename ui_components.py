@@ -4,10 +4,74 @@ Componentes de interfaz reutilizables (Patrón Composite)
 """
 
 import pygame
+import time
+from collections import OrderedDict
 from typing import Tuple, Optional, Callable
 from abc import ABC, abstractmethod
 
 
+# ============================================================================
+# CACHÉ DE SUPERFICIES DE TEXTO
+# ============================================================================
+
+class TextCache:
+    """Caché LRU de textos renderizados, limitada por memoria.
+
+    La clave es (fuente, texto, color). Las superficies se comparten entre
+    todos los componentes, así que solo deben blitearse, nunca modificarse.
+    """
+    
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces: OrderedDict = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._surfaces)
+    
+    def render(self, font: pygame.font.Font, text: str,
+               color: Tuple[int, int, int]) -> pygame.Surface:
+        """Superficie del texto (renderizada solo la primera vez)"""
+        key = (font, text, color)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surf
+        
+        self.misses += 1
+        surf = font.render(text, True, color)
+        self._surfaces[key] = surf
+        self.bytes += surf.get_pitch() * surf.get_height()
+        
+        # Expulsar las menos usadas recientemente hasta respetar el límite
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, old = self._surfaces.popitem(last=False)
+            self.bytes -= old.get_pitch() * old.get_height()
+            self.evictions += 1
+        return surf
+    
+    def clear(self):
+        """Vacía la caché (p. ej. al regenerar las fuentes)"""
+        self._surfaces.clear()
+        self.bytes = 0
+    
+    def stats(self) -> dict:
+        """Aciertos, fallos, expulsiones y memoria ocupada"""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._surfaces),
+            "bytes": self.bytes,
+        }
+
+
 # ============================================================================
 # CONFIGURACIÓN DE COLORES Y FUENTES
 # ============================================================================
@@ -47,6 +111,9 @@ class Theme:
         # Escala actual (1.0 = 100%)
         self.scale = 1.0
         
+        # Textos renderizados compartidos por todos los componentes
+        self.text_cache = TextCache()
+        
         # Inicializar fuentes con escala base
         self._update_fonts()
     
@@ -88,14 +155,28 @@ class Theme:
     
     def set_scale(self, scale: float):
         """Actualiza la escala del tema y regenera las fuentes"""
-        self.scale = max(0.5, min(2.0, scale))  # Limitar entre 50% y 200%
+        scale = max(0.5, min(2.0, scale))  # Limitar entre 50% y 200%
+        if scale == self.scale:
+            return  # Mismas fuentes: conservar la caché de textos
+        self.scale = scale
         self._update_fonts()
+        self.text_cache.clear()  # Las superficies eran de las fuentes anteriores
+    
+    def render_text(self, font: pygame.font.Font, text: str,
+                    color: Tuple[int, int, int]) -> pygame.Surface:
+        """Renderiza texto a través de la caché compartida"""
+        return self.text_cache.render(font, text, color)
 
 
 # ============================================================================
 # COMPONENTES BASE
 # ============================================================================
 
+# Color de las zonas transparentes de las capas precalculadas (ningún
+# componente lo usa)
+CHROME_COLORKEY = (255, 0, 255)
+
+
 class Component(ABC):
     """Componente base (Composite Pattern) con soporte para escalado"""
     
@@ -114,11 +195,21 @@ class Component(ABC):
         # Escala actual
         self.scale_x = 1.0
         self.scale_y = 1.0
+        
+        # Regiones sucias: el componente se marca al cambiar su estado visual
+        # y solo entonces se repinta su área
+        self.dirty = True
+        self._drawn_rect: Optional[pygame.Rect] = None
+        
+        # Superficies precalculadas de fondo y borde, por capa: (clave, superficie)
+        self._chrome: dict = {}
     
     def set_scale(self, scale_x: float, scale_y: float):
         """Actualiza la escala del componente"""
         self.scale_x = scale_x
         self.scale_y = scale_y
+        self._chrome.clear()
+        self.mark_dirty()
         
         # Actualizar rect con nueva escala
         self.rect.x = int(self.base_x * scale_x)
@@ -136,6 +227,53 @@ class Component(ABC):
     
     def contains_point(self, pos: Tuple[int, int]) -> bool:
         return self.rect.collidepoint(pos) if self.visible and self.enabled else False
+    
+    def is_animating(self) -> bool:
+        """True si el componente cambia solo, sin entrada (necesita frames)"""
+        return False
+    
+    def chrome(self, layer: str, state: tuple, build: Callable[[pygame.Surface], None],
+               alpha: bool = False) -> pygame.Surface:
+        """Superficie de una capa estática (fondo, borde, velo).
+        
+        Se construye con build() sobre una superficie transparente del tamaño
+        del componente y solo se reconstruye si cambian el tamaño o `state`.
+        Las capas opacas usan colorkey con RLE (las esquinas redondeadas son
+        las únicas zonas transparentes), que se blitea mucho más rápido que
+        una superficie con alfa por píxel; `alpha` es para capas translúcidas.
+        """
+        key = (self.rect.size,) + state
+        cached = self._chrome.get(layer)
+        if cached is None or cached[0] != key:
+            if alpha:
+                surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            else:
+                surf = pygame.Surface(self.rect.size)
+                surf.fill(CHROME_COLORKEY)
+                surf.set_colorkey(CHROME_COLORKEY, pygame.RLEACCEL)
+            build(surf)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert_alpha() if alpha else surf.convert()
+            cached = self._chrome[layer] = (key, surf)
+        return cached[1]
+    
+    def mark_dirty(self):
+        """Marca el componente para repintarlo en el próximo frame"""
+        self.dirty = True
+    
+    def is_dirty(self) -> bool:
+        return self.dirty
+    
+    def dirty_area(self) -> pygame.Rect:
+        """Área a repintar: posición actual más la del último dibujo"""
+        if self._drawn_rect is None:
+            return self.rect.copy()
+        return self.rect.union(self._drawn_rect)
+    
+    def clean(self):
+        """Llamado tras repintar: recuerda el área dibujada"""
+        self.dirty = False
+        self._drawn_rect = self.rect.copy()
 
 
 class Button(Component):
@@ -156,6 +294,7 @@ class Button(Component):
         if not self.enabled:
             return
         
+        estado = (self.hovered, self.pressed)
         self.hovered = self.contains_point(mouse_pos)
         
         for event in events:
@@ -167,6 +306,14 @@ class Button(Component):
                 if self.pressed and self.hovered and self.callback:
                     self.callback()
                 self.pressed = False
+        
+        if (self.hovered, self.pressed) != estado:
+            self.mark_dirty()
+    
+    def set_text(self, text: str):
+        if text != self.text:
+            self.text = text
+            self.mark_dirty()
     
     def draw(self, surface: pygame.Surface):
         if not self.visible:
@@ -181,15 +328,16 @@ class Button(Component):
         elif self.hovered:
             color = tuple(min(255, c + 20) for c in color)
         
-        # Dibujar botón
-        pygame.draw.rect(surface, color, self.rect, border_radius=10)
+        # Fondo y borde (precalculados por color)
+        def build(chrome: pygame.Surface):
+            border_color = tuple(min(255, c + 40) for c in color)
+            pygame.draw.rect(chrome, color, chrome.get_rect(), border_radius=10)
+            pygame.draw.rect(chrome, border_color, chrome.get_rect(), width=2, border_radius=10)
         
-        # Borde
-        border_color = tuple(min(255, c + 40) for c in color)
-        pygame.draw.rect(surface, border_color, self.rect, width=2, border_radius=10)
+        surface.blit(self.chrome("bg", (color,), build), self.rect)
         
         # Texto
-        text_surf = self.theme.FONT_S.render(self.text, True, self.theme.TEXT)
+        text_surf = self.theme.render_text(self.theme.FONT_S, self.text, self.theme.TEXT)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -208,12 +356,19 @@ class Label(Component):
         self._update_size()
     
     def _update_size(self):
-        surf = self.font.render(self.text, True, self.color)
-        self.rect.size = surf.get_size()
+        self.rect.size = self.font.size(self.text)
+    
+    def set_scale(self, scale_x: float, scale_y: float):
+        """Escala la posición; el tamaño es siempre el del texto"""
+        super().set_scale(scale_x, scale_y)
+        self._update_size()
     
     def set_text(self, text: str):
+        if text == self.text:
+            return
         self.text = text
         self._update_size()
+        self.mark_dirty()
     
     def update(self, events: list, mouse_pos: Tuple[int, int]):
         pass
@@ -222,7 +377,7 @@ class Label(Component):
         if not self.visible:
             return
         
-        text_surf = self.font.render(self.text, True, self.color)
+        text_surf = self.theme.render_text(self.font, self.text, self.color)
         surface.blit(text_surf, self.rect)
 
 
@@ -240,8 +395,13 @@ class ProgressBar(Component):
     def set_value(self, value: int):
         self.target_value = max(0, min(value, self.max_value))
     
+    def is_animating(self) -> bool:
+        return self.current_value != self.target_value
+    
     def update(self, events: list, mouse_pos: Tuple[int, int]):
         # Animación suave
+        if self.is_animating():
+            self.mark_dirty()
         if self.current_value < self.target_value:
             self.current_value = min(self.target_value, self.current_value + 2)
         elif self.current_value > self.target_value:
@@ -256,7 +416,7 @@ class ProgressBar(Component):
         
         # Progreso
         if self.current_value > 0:
-            fill_width = int((self.current_value / self.max_value) * self.rect.width)
+            fill_width = min(self.rect.width, int((self.current_value / self.max_value) * self.rect.width))
             fill_rect = pygame.Rect(self.rect.x, self.rect.y, fill_width, self.rect.height)
             
             # Color según porcentaje
@@ -305,15 +465,31 @@ class Panel(Component):
         for child in self.children:
             child.update(events, mouse_pos)
     
+    def is_dirty(self) -> bool:
+        return self.dirty or any(child.is_dirty() for child in self.children)
+    
+    def is_animating(self) -> bool:
+        return any(child.is_animating() for child in self.children)
+    
+    def dirty_area(self) -> pygame.Rect:
+        """Incluye a los hijos (su texto puede salirse del rect)"""
+        return super().dirty_area().unionall([child.dirty_area() for child in self.children])
+    
+    def clean(self):
+        super().clean()
+        for child in self.children:
+            child.clean()
+    
     def draw(self, surface: pygame.Surface):
         if not self.visible:
             return
         
-        # Fondo
-        pygame.draw.rect(surface, self.bg_color, self.rect, border_radius=15)
+        # Fondo y borde (precalculados)
+        def build(chrome: pygame.Surface):
+            pygame.draw.rect(chrome, self.bg_color, chrome.get_rect(), border_radius=15)
+            pygame.draw.rect(chrome, self.border_color, chrome.get_rect(), width=3, border_radius=15)
         
-        # Borde
-        pygame.draw.rect(surface, self.border_color, self.rect, width=3, border_radius=15)
+        surface.blit(self.chrome("bg", (self.bg_color, self.border_color), build), self.rect)
         
         # Hijos
         for child in self.children:
@@ -349,10 +525,20 @@ class HeroCard(Component):
         
         self.energy_bar = ProgressBar(x + 10, y + height - 28, width - 20, 15)
         self.energy_label = Label(x + width - 60, y + height - 28, "", self.theme.FONT_XS, self.theme.TEXT_MUTED)
+        
+        self._parts: list[Component] = [
+            self.name_label, self.level_label, self.attack_label, self.defense_label,
+            self.health_bar, self.health_label, self.energy_bar, self.energy_label
+        ]
     
     def set_hero(self, nombre: str, nivel: int, ataque: int, pv: int, pv_max: int, 
                  defensa: int = 0, energia: int = 0, energia_max: int = 100):
         """Actualiza datos del héroe con nuevas stats"""
+        datos = (nombre, nivel, ataque, pv, pv_max, defensa, energia, energia_max)
+        if datos == (self.hero_name, self.hero_level, self.hero_attack, self.hero_pv,
+                     self.hero_pv_max, self.hero_defensa, self.hero_energia, self.hero_energia_max):
+            return
+        self.mark_dirty()
         self.hero_name = nombre
         self.hero_level = nivel
         self.hero_attack = ataque
@@ -378,7 +564,9 @@ class HeroCard(Component):
     
     def set_active(self, active: bool):
         """Marca como turno activo"""
-        self.is_active = active
+        if active != self.is_active:
+            self.is_active = active
+            self.mark_dirty()
     
     def set_scale(self, scale_x: float, scale_y: float):
         """Escala la tarjeta y sus componentes internos"""
@@ -398,6 +586,21 @@ class HeroCard(Component):
         self.health_bar.update(events, mouse_pos)
         self.energy_bar.update(events, mouse_pos)
     
+    def is_dirty(self) -> bool:
+        return self.dirty or any(part.is_dirty() for part in self._parts)
+    
+    def is_animating(self) -> bool:
+        return self.health_bar.is_animating() or self.energy_bar.is_animating()
+    
+    def dirty_area(self) -> pygame.Rect:
+        """Incluye a los hijos (su texto puede salirse del rect)"""
+        return super().dirty_area().unionall([part.dirty_area() for part in self._parts])
+    
+    def clean(self):
+        super().clean()
+        for part in self._parts:
+            part.clean()
+    
     def draw(self, surface: pygame.Surface):
         if not self.visible:
             return
@@ -413,12 +616,14 @@ class HeroCard(Component):
             bg_color = self.theme.BG_LIGHT
             border_color = self.theme.TEXT_MUTED
         
-        # Fondo
-        pygame.draw.rect(surface, bg_color, self.rect, border_radius=12)
-        
-        # Borde (más grueso si está activo)
+        # Fondo y borde, más grueso si está activo (precalculados por estado)
         border_width = 3 if self.is_active else 2
-        pygame.draw.rect(surface, border_color, self.rect, width=border_width, border_radius=12)
+        
+        def build(chrome: pygame.Surface):
+            pygame.draw.rect(chrome, bg_color, chrome.get_rect(), border_radius=12)
+            pygame.draw.rect(chrome, border_color, chrome.get_rect(), width=border_width, border_radius=12)
+        
+        surface.blit(self.chrome("bg", (bg_color, border_color, border_width), build), self.rect)
         
         # Componentes internos
         self.name_label.draw(surface)
@@ -448,11 +653,11 @@ class HeroCard(Component):
         
         # Overlay si está muerto
         if self.is_dead:
-            overlay = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-            pygame.draw.rect(overlay, (0, 0, 0, 150), overlay.get_rect(), border_radius=12)
+            overlay = self.chrome("dead", (), lambda chrome: pygame.draw.rect(
+                chrome, (0, 0, 0, 150), chrome.get_rect(), border_radius=12), alpha=True)
             surface.blit(overlay, self.rect.topleft)
             
-            dead_text = self.theme.FONT_M.render("💀 MUERTO", True, self.theme.DANGER)
+            dead_text = self.theme.render_text(self.theme.FONT_M, "💀 MUERTO", self.theme.DANGER)
             dead_rect = dead_text.get_rect(center=self.rect.center)
             surface.blit(dead_text, dead_rect)
 
@@ -460,6 +665,8 @@ class HeroCard(Component):
 class InputField(Component):
     """Campo de entrada de texto"""
     
+    BLINK_INTERVAL = 0.5  # segundos; el bucle en reposo despierta cada idle_timeout
+    
     def __init__(self, x: int, y: int, width: int, height: int, 
                  placeholder: str = "", input_type: str = "text"):
         super().__init__(x, y, width, height)
@@ -469,15 +676,18 @@ class InputField(Component):
         self.input_type = input_type  # "text" o "number"
         self.active = False
         self.cursor_visible = True
-        self.cursor_timer = 0
+        self._next_blink = 0.0  # instante del próximo cambio del cursor
         self.max_length = 15 if input_type == "text" else 3
     
     def update(self, events: list, mouse_pos: Tuple[int, int]):
-        # Cursor parpadeante
-        self.cursor_timer += 1
-        if self.cursor_timer > 30:
+        estado = (self.text, self.active)
+        
+        # Cursor parpadeante por tiempo, no por frames (solo se ve, y se repinta, si está activo)
+        now = time.perf_counter()
+        if self.active and now >= self._next_blink:
             self.cursor_visible = not self.cursor_visible
-            self.cursor_timer = 0
+            self._next_blink = now + self.BLINK_INTERVAL
+            self.mark_dirty()
         
         for event in events:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -494,12 +704,23 @@ class InputField(Component):
                             self.text += event.unicode
                     elif event.unicode.isalnum() or event.unicode == ' ':
                         self.text += event.unicode
+        
+        if (self.text, self.active) != estado:
+            # Al escribir o enfocar, el cursor se muestra y reinicia el parpadeo
+            self.cursor_visible = True
+            self._next_blink = now + self.BLINK_INTERVAL
+            self.mark_dirty()
     
     def get_text(self) -> str:
         return self.text
     
+    def is_animating(self) -> bool:
+        # Solo cuando toca cambiar el cursor; entre parpadeos el bucle puede dormir
+        return self.active and time.perf_counter() >= self._next_blink
+    
     def clear(self):
         self.text = ""
+        self.mark_dirty()
     
     def draw(self, surface: pygame.Surface):
         if not self.visible:
@@ -520,7 +741,7 @@ class InputField(Component):
         if self.active and self.cursor_visible:
             display_text += "|"
         
-        text_surf = self.theme.FONT_S.render(display_text, True, text_color)
+        text_surf = self.theme.render_text(self.theme.FONT_S, display_text, text_color)
         text_rect = text_surf.get_rect(midleft=(self.rect.x + 10, self.rect.centery))
         surface.blit(text_surf, text_rect)
 
@@ -542,12 +763,17 @@ class MessageBox(Component):
         self.message_type = msg_type
         self.duration = duration
         self.visible = True
+        self.mark_dirty()
+    
+    def is_animating(self) -> bool:
+        return self.visible and self.duration > 0  # Cuenta atrás por frames
     
     def update(self, events: list, mouse_pos: Tuple[int, int]):
         if self.visible and self.duration > 0:
             self.duration -= 1
             if self.duration <= 0:
                 self.visible = False
+                self.mark_dirty()
     
     def draw(self, surface: pygame.Surface):
         if not self.visible:
@@ -561,15 +787,65 @@ class MessageBox(Component):
         else:
             color = self.theme.PRIMARY
         
-        # Fondo semi-transparente
-        bg_surf = pygame.Surface((self.rect.width, self.rect.height), pygame.SRCALPHA)
-        pygame.draw.rect(bg_surf, (*self.theme.BG, 220), bg_surf.get_rect(), border_radius=10)
-        surface.blit(bg_surf, self.rect.topleft)
+        # Fondo semi-transparente y borde (precalculados por tipo)
+        def build(chrome: pygame.Surface):
+            pygame.draw.rect(chrome, (*self.theme.BG, 220), chrome.get_rect(), border_radius=10)
+            pygame.draw.rect(chrome, color, chrome.get_rect(), width=2, border_radius=10)
         
-        # Borde
-        pygame.draw.rect(surface, color, self.rect, width=2, border_radius=10)
+        surface.blit(self.chrome("bg", (color,), build, alpha=True), self.rect.topleft)
         
         # Texto
-        text_surf = self.theme.FONT_S.render(self.message, True, color)
+        text_surf = self.theme.render_text(self.theme.FONT_S, self.message, color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
+
+
+class PerformanceOverlay(Component):
+    """Indicador de FPS, tiempo de frame y uso de CPU del proceso"""
+    
+    def __init__(self, x: int = 8, y: int = 8, interval: float = 0.5):
+        super().__init__(x, y, 0, 0)
+        self.theme = Theme()
+        self.interval = interval
+        self.visible = False
+        self.text = ""
+        self.fps = 0.0
+        self.cpu = 0.0
+        self._frames = 0
+        self._busy = 0.0
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+    
+    def frame(self, animating: bool, busy: float):
+        """Registra un frame (busy: segundos de trabajo, sin esperas)"""
+        self._frames += 1
+        self._busy += busy
+        now = time.perf_counter()
+        elapsed = now - self._start_wall
+        if elapsed < self.interval:
+            return
+        
+        cpu = time.process_time()
+        self.fps = self._frames / elapsed
+        self.cpu = (cpu - self._start_cpu) / elapsed * 100
+        frame_ms = self._busy / self._frames * 1000
+        mode = "animando" if animating else "en reposo"
+        self.text = f"FPS {self.fps:.1f} | {frame_ms:.2f} ms/frame | CPU {self.cpu:.0f}% | {mode}"
+        self._frames = 0
+        self._busy = 0.0
+        self._start_wall = now
+        self._start_cpu = cpu
+        if self.visible:
+            self.mark_dirty()
+    
+    def update(self, events: list, mouse_pos: Tuple[int, int]):
+        pass
+    
+    def draw(self, surface: pygame.Surface):
+        if not self.visible or not self.text:
+            return
+        
+        text_surf = self.theme.render_text(self.theme.FONT_XS, self.text, self.theme.SUCCESS)
+        self.rect.size = (text_surf.get_width() + 12, text_surf.get_height() + 6)
+        pygame.draw.rect(surface, self.theme.BG, self.rect)
+        surface.blit(text_surf, (self.rect.x + 6, self.rect.y + 3))